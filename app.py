@@ -2,13 +2,14 @@
 from flask import Flask, render_template, request, jsonify
 import os, copy, requests, timeit
 import pandas as pd
-import yfinance as yf
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
-from data.fetch import get_stock_data
-from data.preprocess import preprocess_stock_data, align_dfs
+from data.fetch import get_many_stock_data, get_stock_data
+from data.providers import get_provider
+from data.preprocess import preprocess_stock_data, align_dfs, ensure_datetime_dates
 from indicators.registry import apply_indicator, get_indicator_keys, get_indicator_spec
-from plotting.plot_prices import plot_close_prices
+from indicators.backtest import STRATEGIES, backtest_grid
+from plotting.plot_prices import plot_backtest, plot_close_prices
 from utils.upload_handler import upload_handling
 from utils.helpers import filter_dataframe
 
@@ -29,6 +30,9 @@ uploaded_cache = {
 ticker_cache = {}  # ticker symbol: dataframe
 streak_cache = {}
 
+# Store cached frames as float32/int32 with int64 epoch dates (opt-in, halves cache memory)
+COMPACT_CACHE = os.environ.get("COMPACT_CACHE", "0") == "1"
+
 # Indicator parameter tracking
 indicator_params = {"viewing": None, "timeframe": None}
 
@@ -92,7 +96,7 @@ def index():
                         error=error_message,
                     )
 
-                df = preprocess_stock_data(df)
+                df = preprocess_stock_data(df, compact=COMPACT_CACHE)
                 uploaded_cache[file_field] = df
                 uploaded_cache["labels"][file_field] = label
 
@@ -120,56 +124,37 @@ def index():
             else:
                 continue
 
-            df_filtered = filter_dataframe(df, source="file", option=time_range)
+            df_filtered = filter_dataframe(ensure_datetime_dates(df), source="file", option=time_range)
             dfs.append(df_filtered)
             labels.append(label)
 
-        # Handle Tickers (AAPL, MSFT, etc.)
+        # Handle Tickers (AAPL, MSFT, etc.), histories and summaries fetched concurrently
+        fetched = get_many_stock_data([ticker1, ticker2], cache=ticker_cache)
         for ticker in [ticker1, ticker2]:
             if ticker:
-                try:
-                    if ticker in ticker_cache.keys():
-                        print(f'hdebug: retrieving ticker {ticker} from ticker_cache')
-                        df, label = ticker_cache[ticker], ticker
-                    else:
-                        print(f'hdebug: query ticker {ticker} from yfinance api')
-                        df, label = get_stock_data(ticker=ticker)
-                        df = preprocess_stock_data(df)
-                        ticker_cache[ticker] = df
-
-                    try:
-                        tk = yf.Ticker(ticker)
-                        info = tk.info
-                        short_name = info.get("shortName", label)
-                        current_price = info.get("currentPrice")
-                        previous_close = info.get("previousClose")
-                        logo_url = info.get("logo_url")
-
-                        change, pct_change = None, None
-                        if current_price and previous_close:
-                            change = round(current_price - previous_close, 2)
-                            pct_change = round((change / previous_close) * 100, 2)
-
-                        ticker_summaries.append({
-                            "name": short_name,
-                            "symbol": ticker.upper(),
-                            "price": current_price,
-                            "change": change,
-                            "pct": pct_change,
-                            "logo": logo_url,
-                        })
-                    except Exception as e:
-                        print(f"[WARN] Could not fetch summary for {ticker}: {e}")
-
-                except Exception as e:
-                    error_message = f"Error fetching {ticker}: {e}"
+                result = fetched[ticker]
+                if result["error"]:
+                    error_message = f"Error fetching {ticker}: {result['error']}"
                     return render_template(
                         "index.html",
                         shown_indicator=indicator_key,
                         error=error_message,
                     )
 
-                df["Date"] = pd.to_datetime(df["Date"], errors="coerce", utc=True)
+                if ticker in ticker_cache:
+                    print(f'hdebug: retrieving ticker {ticker} from ticker_cache')
+                    df = ticker_cache[ticker]
+                else:
+                    df = preprocess_stock_data(result["df"], compact=COMPACT_CACHE)
+                    ticker_cache[ticker] = df
+
+                if result["summary"]:
+                    ticker_summaries.append(result["summary"])
+                else:
+                    print(f"[WARN] Could not fetch summary for {ticker}: {result['summary_error']}")
+
+                # converted in a new frame, the cached one keeps its storage format
+                df = ensure_datetime_dates(df)
                 df = df.sort_values("Date").reset_index(drop=True)
                 df_filtered = filter_dataframe(df, source="ticker", option=time_range)
                 dfs.append(df_filtered)
@@ -185,8 +170,9 @@ def index():
 
         # Update parameters with user's inputs
         for key in request.form.keys():
-            if key.startswith(indicator_key):
-                param = key.split('_', 1)[1]
+            if key.startswith(f"{indicator_key}_"):
+                # keys may contain underscores themselves (e.g. best_trade_window)
+                param = key[len(indicator_key) + 1:]
                 try:
                     val = float(request.form.get(key))
                     if param == "threshold":
@@ -200,6 +186,11 @@ def index():
                         if abs(val - round(val)) > 1e-9:
                             raise ValueError("Tolerance must be an integer.")
                         val = int(round(val))
+                    elif param == "transactions":
+                        # 0 = unlimited trades
+                        if val < 0 or abs(val - round(val)) > 1e-9:
+                            raise ValueError("Transactions must be an integer >= 0.")
+                        val = int(round(val))
                     else:
                         # default behavior for positive parameters
                         if val <= 0:
@@ -218,19 +209,20 @@ def index():
                     )
 
         # Apply indicators
-        applied = []
+        applied, max_profits, streak_infos = [], [], []
         for df, label in zip(dfs, labels):
             if df is None or df.empty:
                 continue
             if indicator_key not in [None, "close"]:
                 try:
+                    max_profit = streak_info = None
                     if indicator_key != 'dailyr':
                         df_with_ind = apply_indicator(
-                            df, indicator_key, params=indicator_params.get(indicator_key, {})
+                            df, indicator_key, params=indicator_params.get(indicator_key, {}), copy=False
                         )
                     else:
-                        df_with_ind, streak_info = apply_indicator(
-                            df, indicator_key, params=indicator_params.get(indicator_key, {})
+                        df_with_ind, streak_info, max_profit = apply_indicator(
+                            df, indicator_key, params=indicator_params.get(indicator_key, {}), copy=False
                         )
                         streak_cache.update(streak_info)
                 except Exception as e:
@@ -245,8 +237,11 @@ def index():
                         summaries=ticker_summaries,
                     )
             else:
-                df_with_ind = df.copy()
+                df_with_ind = df.copy(deep=False)
+                max_profit = streak_info = None
             applied.append(df_with_ind)
+            max_profits.append(max_profit)
+            streak_infos.append(streak_info)
 
         aligned_dfs = align_dfs(applied)
         print(indicator_params)
@@ -256,6 +251,8 @@ def index():
                 aligned_dfs, labels,
                 indicator_key=indicator_key,
                 indicator_params=indicator_params.get(indicator_key, {}),
+                max_profits=max_profits,
+                streak_infos=streak_infos,
             )
         except Exception as e:
             error_message = f"Plotting error: {e}"
@@ -286,16 +283,7 @@ def index():
 # Auto Refresh Feature
 def _last_two_closes(ticker: str):
     try:
-        tk = yf.Ticker(ticker)
-        hist = tk.history(period="5d", interval="1d").dropna()
-        if len(hist) >= 2:
-            return float(hist["Close"].iloc[-1]), float(hist["Close"].iloc[-2])
-        elif len(hist) == 1:
-            val = float(hist["Close"].iloc[-1])
-            return val, val
-        else:
-            info = tk.info
-            return info.get("currentPrice"), info.get("previousClose")
+        return get_provider().quote(ticker)
     except Exception:
         return None, None
 
@@ -313,6 +301,72 @@ def auto_refresh():
     return jsonify({"symbol": ticker, "price": last, "change": change, "pct": pct})
 
 
+# Backtesting
+def _parse_param(value: str):
+    """Query values are numbers (int when whole) or, e.g. for 'average', plain strings."""
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() else number
+
+
+@app.route("/backtest")
+def backtest():
+    """
+    Backtest a strategy on a ticker, e.g.
+    /backtest?ticker=AAPL&strategy=ma_crossover&fast=5,10,20&slow=50,100&fee_bps=5
+
+    Comma-separated values are expanded into a parameter grid; the `top` best
+    parameter sets (by total return, default 5) are returned and plotted.
+    """
+    ticker = (request.args.get("ticker") or "").upper()
+    if not ticker:
+        return jsonify({"error": "No ticker"}), 400
+    strategy = request.args.get("strategy", "ma_crossover")
+    if strategy not in STRATEGIES:
+        return jsonify({"error": f"Unknown strategy: {strategy}"}), 400
+
+    try:
+        grid = {
+            name: [_parse_param(v) for v in request.args[name].split(",")]
+            for name in STRATEGIES[strategy]["default_params"] if name in request.args
+        }
+        fee_bps = float(request.args.get("fee_bps", 0))
+        top = int(request.args.get("top", 5))
+
+        if ticker in ticker_cache:
+            df = ticker_cache[ticker]
+        else:
+            df, _ = get_stock_data(ticker=ticker)
+            df = preprocess_stock_data(df, compact=COMPACT_CACHE)
+            ticker_cache[ticker] = df
+        df = ensure_datetime_dates(df).sort_values("Date").reset_index(drop=True)
+        df = filter_dataframe(df, source="ticker", option=request.args.get("time_range", "1Y"))
+
+        results = backtest_grid(df, strategy, grid, fee_bps=fee_bps)
+        if not results:
+            return jsonify({"error": "No valid parameter combination"}), 400
+        results = sorted(results, key=lambda r: r["summary"]["total_return_pct"], reverse=True)[:top]
+        plot_div = plot_backtest(df, ticker, results)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    def trade_json(trade):
+        dates = {k: pd.Timestamp(trade[k]).isoformat() for k in ("entry_date", "exit_date")}
+        return {**trade, **dates}
+
+    return jsonify({
+        "ticker": ticker,
+        "strategy": strategy,
+        "results": [
+            {"params": r["params"], "summary": r["summary"], "trades": [trade_json(t) for t in r["trades"]]}
+            for r in results
+        ],
+        "plot": plot_div,
+    })
+
+
 # News API
 @app.route("/get_news")
 def news_feed():
@@ -0,0 +1,70 @@
+"""
+Peak-memory benchmark of one indicator request, default vs copy-free mode.
+
+Builds a large Date/Close/Volume frame (like a big upload) and measures, with
+tracemalloc, the peak of the allocations made while `apply_indicator` runs in
+its default mode (frame copied before the calculation) and with ``copy=False``
+(read-only close view, outputs attached without copying the frame).
+
+Usage:
+    python -m benchmarks.memory_pipeline [rows]
+"""
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from indicators.registry import apply_indicator
+
+REQUESTS = [
+    ("sma", {"window": 20}),
+    ("ema", {"interval": 20}),
+    ("rsi", {"interval": 14}),
+    ("macd", None),
+    ("dailyr", {"tolerance": 1, "threshold": 0.5}),
+]
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Date": pd.date_range("1990-01-01", periods=rows, freq="min", tz="UTC"),
+        "Open": 100 + rng.standard_normal(rows).cumsum(),
+        "High": 101 + rng.standard_normal(rows).cumsum(),
+        "Low": 99 + rng.standard_normal(rows).cumsum(),
+        "Close": 100 + rng.standard_normal(rows).cumsum(),
+        "Volume": rng.integers(0, 1_000_000, rows),
+    })
+
+
+def peak_bytes(df, key, params, copy) -> int:
+    """Peak traced allocation (bytes) of one apply_indicator call."""
+    tracemalloc.start()
+    try:
+        res = apply_indicator(df, key, params, use_cache=False, copy=copy)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del res
+    return peak
+
+
+def run(rows: int = 1_000_000) -> list:
+    df = make_frame(rows)
+    results = []
+    for key, params in REQUESTS:
+        default = peak_bytes(df, key, params, copy=True)
+        copy_free = peak_bytes(df, key, params, copy=False)
+        results.append({"indicator": key, "default_mb": default / 2**20, "copy_free_mb": copy_free / 2**20})
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    frame_mb = make_frame(rows).memory_usage(deep=True).sum() / 2**20
+    print(f"{rows:,} rows, base frame {frame_mb:.1f} MB")
+    print(f"{'indicator':<10}{'default MB':>12}{'copy-free MB':>14}{'saved':>8}")
+    for r in run(rows):
+        saved = 1 - r["copy_free_mb"] / r["default_mb"]
+        print(f"{r['indicator']:<10}{r['default_mb']:>12.1f}{r['copy_free_mb']:>14.1f}{saved:>8.0%}")
@@ -0,0 +1,184 @@
+"""
+Micro-benchmark suite for the indicator kernels and the data layer.
+
+Every registry indicator (through `apply_indicator`, cache off) plus
+`calculate_updown`, `align_dfs` and `preprocess_stock_data` runs on seeded
+synthetic prices (see `benchmarks.synthetic`) at each requested size. The best
+wall time of a few repeats and the tracemalloc peak of one extra traced run are
+recorded per case, compared with a JSON baseline, and the run fails when a case
+got slower (or hungrier) than the baseline by more than the threshold.
+
+Usage:
+    python -m benchmarks.suite [--sizes 1000 100000 10000000] [--repeat 3]
+                               [--baseline benchmarks/baseline.json] [--threshold 0.25] [--update]
+
+Without a baseline file (or with --update) the results are written as the new baseline.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_prices
+from data.preprocess import align_dfs, preprocess_stock_data
+from indicators.dailyr import daily_returns
+from indicators.registry import INDICATORS, apply_indicator
+from indicators.updown import calculate_updown
+
+SIZES = [1_000, 100_000, 10_000_000]
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+# timings below this are mostly interpreter noise, they never count as regressions
+MIN_SECONDS = 1e-3
+MIN_PEAK_MB = 1.0
+
+
+def make_cases(rows: int, seed: int = 0) -> dict:
+    """
+    Build the benchmark cases for one size.
+
+    The synthetic frames are generated (and preprocessed) here, outside the timed calls.
+
+    Returns
+    -------
+    dict
+        Case name (e.g. ``"sma"``, ``"align_dfs"``) -> zero-argument callable.
+    """
+    raw = synthetic_prices(rows, seed=seed)
+    other = synthetic_prices(rows, seed=seed + 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        clean = preprocess_stock_data(raw)
+    returns = pd.Series(daily_returns(clean["Close"].to_numpy()), index=pd.Index(clean["Date"]))
+
+    cases = {
+        key: (lambda key=key: apply_indicator(clean, key, use_cache=False))
+        for key in INDICATORS
+    }
+    cases["calculate_updown"] = lambda: calculate_updown(returns, tolerance=1, threshold=0.5)
+    cases["align_dfs"] = lambda: align_dfs([raw, other])
+    cases["preprocess_stock_data"] = lambda: preprocess_stock_data(raw)
+    return cases
+
+
+def measure(func, repeat: int = 3) -> dict:
+    """Best wall time over `repeat` calls and the traced allocation peak of one more call."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"seconds": best, "peak_mb": peak / 2**20}
+
+
+def run(sizes=SIZES, repeat: int = 3, seed: int = 0) -> dict:
+    """
+    Run every case at every size.
+
+    Returns
+    -------
+    dict
+        ``"<case>@<rows>"`` -> ``{"seconds": ..., "peak_mb": ...}``.
+    """
+    results = {}
+    for rows in sizes:
+        for name, func in make_cases(rows, seed).items():
+            results[f"{name}@{rows}"] = measure(func, repeat)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.25) -> list:
+    """
+    List the cases that regressed against `baseline`.
+
+    A case regresses when its time or peak memory exceeds the baseline value by more
+    than `threshold` (a fraction, 0.25 = 25% worse). Values under `MIN_SECONDS` /
+    `MIN_PEAK_MB` and cases missing from the baseline are not compared.
+
+    Returns
+    -------
+    list of str
+        One message per regressed metric, empty when nothing regressed.
+    """
+    regressions = []
+    floors = {"seconds": MIN_SECONDS, "peak_mb": MIN_PEAK_MB}
+    for case, metrics in results.items():
+        reference = baseline.get(case)
+        if reference is None:
+            continue
+        for metric, floor in floors.items():
+            old, new = reference.get(metric), metrics[metric]
+            if old is None or max(old, new) < floor:
+                continue
+            if new > max(old, floor) * (1 + threshold):
+                regressions.append(f"{case}: {metric} {old:.4g} -> {new:.4g} (+{new / max(old, floor) - 1:.0%})")
+    return regressions
+
+
+def load_baseline(path) -> dict:
+    """Results stored by `save_baseline`, or an empty dict if `path` does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["results"]
+
+
+def save_baseline(path, results: dict):
+    """Write `results` with the interpreter / library versions they were measured with."""
+    payload = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    Path(path).write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--update", action="store_true", help="overwrite the baseline with this run")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat)
+    print(f"{'case':<32}{'seconds':>12}{'peak MB':>12}")
+    for case, metrics in results.items():
+        print(f"{case:<32}{metrics['seconds']:>12.4f}{metrics['peak_mb']:>12.1f}")
+
+    baseline = load_baseline(args.baseline)
+    if args.update or not baseline:
+        save_baseline(args.baseline, {**baseline, **results})
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for message in regressions:
+        print(f"[REGRESSION] {message}")
+    if not regressions:
+        print(f"No regressions past {args.threshold:.0%} against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
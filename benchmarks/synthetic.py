@@ -0,0 +1,84 @@
+"""
+Seeded synthetic OHLCV data for benchmarks.
+
+Closes follow a geometric Brownian motion with occasional overnight price gaps,
+the calendar skips random business days (missing sessions), and a small share
+of closes are NaN, so preprocessing and alignment see realistic holes.
+"""
+import numpy as np
+import pandas as pd
+
+# periods per year of the supported calendar frequencies (minutes: 6.5 trading hours)
+PERIODS_PER_YEAR = {"B": 252, "min": 252 * 390}
+
+
+def synthetic_prices(rows: int, seed: int = 0, start_price: float = 100.0, drift: float = 0.05,
+                     volatility: float = 0.2, gap_prob: float = 0.01, gap_scale: float = 0.05,
+                     skip_prob: float = 0.02, nan_prob: float = 0.001, freq: str | None = None) -> pd.DataFrame:
+    """
+    Generate a reproducible OHLCV frame.
+
+    Parameters
+    ----------
+    rows : int
+        Number of rows.
+    seed : int
+        Seed of the random generator; the same seed always gives the same frame.
+    start_price : float
+        First close.
+    drift, volatility : float
+        Annualised GBM drift and volatility.
+    gap_prob, gap_scale : float
+        Probability of a price gap per trading day and the standard deviation of its log jump.
+    skip_prob : float
+        Probability that a calendar period is missing before a row.
+    nan_prob : float
+        Probability that a close is NaN.
+    freq : str, optional
+        Calendar frequency of the dates, 'B' (business days) or 'min' (minute bars).
+        Defaults to business days up to 50,000 rows and minute bars beyond, which
+        keeps 1e7 rows inside the datetime64[ns] range.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns Date (UTC), Open, High, Low, Close, Volume.
+    """
+    if rows < 1:
+        raise ValueError("rows must be at least 1")
+    if freq is None:
+        freq = "B" if rows <= 50_000 else "min"
+    rng = np.random.default_rng(seed)
+    dt = 1 / PERIODS_PER_YEAR[freq]
+    log_returns = (drift - 0.5 * volatility ** 2) * dt + volatility * np.sqrt(dt) * rng.standard_normal(rows)
+    gaps = rng.random(rows) < gap_prob * 252 * dt
+    log_returns[gaps] += rng.normal(0, gap_scale, gaps.sum())
+    log_returns[0] = 0.0
+    close = start_price * np.exp(np.cumsum(log_returns))
+
+    # intraday range around the open/close pair
+    open_ = np.empty(rows)
+    open_[0] = start_price
+    open_[1:] = close[:-1] * np.exp(np.where(gaps[1:], log_returns[1:] * 0.5, 0.0))
+    spread = np.abs(rng.normal(0, volatility * np.sqrt(dt) * 0.5, rows))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+
+    # missing sessions: each row advances 1 period plus the skipped ones
+    steps = rng.geometric(1 - skip_prob, rows)
+    offsets = np.cumsum(steps) - steps[0]
+    start = pd.Timestamp("1990-01-01", tz="UTC")
+    if freq == "min":
+        dates = start + pd.to_timedelta(offsets, unit="min")
+    else:
+        dates = pd.date_range(start, periods=int(offsets[-1]) + 1, freq=freq)[offsets]
+
+    close[rng.random(rows) < nan_prob] = np.nan
+    return pd.DataFrame({
+        "Date": dates,
+        "Open": open_,
+        "High": high,
+        "Low": low,
+        "Close": close,
+        "Volume": rng.integers(1_000, 10_000_000, rows),
+    })
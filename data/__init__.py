@@ -1,6 +1,6 @@
 # data package
-from .fetch import get_stock_data
+from .fetch import get_many_stock_data, get_stock_data
 from .preprocess import align_dfs
 
 
-__all__ = ['get_stock_data', 'align_dfs']
\ No newline at end of file
+__all__ = ['get_stock_data', 'get_many_stock_data', 'align_dfs']
\ No newline at end of file
@@ -1,24 +1,125 @@
 # data/fetch.py
 import pandas as pd
 import os
-import yfinance as yf
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from pathlib import Path
+
+from .providers import get_provider
+from .store import DEFAULT_ROOT, OHLCVStore
+
+_store = None
+# default_store is called from the fetch threads of get_many_stock_data
+_store_lock = threading.Lock()
+
+# seconds every network call of a get_many_stock_data batch may take
+FETCH_TIMEOUT = float(os.environ.get("FETCH_TIMEOUT", 15))
+
+
+def default_store() -> OHLCVStore:
+    """
+    The on-disk store backing `get_stock_data` (see `data.store`), fed by the active
+    provider (see `data.providers`) under a directory of its own.
+    """
+    global _store
+    provider = get_provider()
+    with _store_lock:
+        if _store is None or _store.fetch is not provider:
+            _store = OHLCVStore(Path(DEFAULT_ROOT) / provider.name, fetch=provider)
+        return _store
+
 
 def get_stock_data(ticker=None, filepath=None):
     """
-    Load stock data either from a CSV file or from Yahoo Finance.
+    Load stock data either from a CSV file or from the market-data provider.
     Always returns (df, label).
     - df: pandas DataFrame with at least ['Date', 'Close'] columns
     - label: string label for the dataset (e.g., ticker symbol or filename)
+
+    Ticker histories come from the on-disk store: read from disk while fresh, and
+    otherwise topped up with only the bars after the last stored date.
     """
     if ticker:
-        data = yf.Ticker(ticker).history(period = '3y')
+        data = default_store().get(ticker)
         if data.empty:
             raise ValueError(f"No data found for ticker '{ticker}'.")
-        data.reset_index(inplace=True)
-        # df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        # df = df.sort_values('Date')
         label = ticker.upper()
         return data, label
 
     else:
-        raise ValueError("Either ticker or filepath must be provided.")
\ No newline at end of file
+        raise ValueError("Either ticker or filepath must be provided.")
+
+
+def get_ticker_summary(ticker) -> dict:
+    """
+    Headline quote of `ticker` for the page header, from the active provider.
+
+    Returns
+    -------
+    dict
+        name, symbol, price, change and pct (change since the previous close, None
+        when a price is missing) and logo.
+    """
+    return get_provider().summary(ticker)
+
+
+def get_many_stock_data(tickers, summaries=True, cache=None, timeout=FETCH_TIMEOUT, max_workers=8) -> dict:
+    """
+    Fetch the histories (and summaries) of several tickers concurrently.
+
+    Every history (`get_stock_data`) and summary (`get_ticker_summary`) call runs in a
+    bounded thread pool, so the batch takes about as long as its slowest call. Each
+    call gets `timeout` seconds from the start of the batch; calls still running then
+    are reported as timed out and left to finish in the background.
+
+    Parameters
+    ----------
+    tickers : list of str
+        Symbols to fetch, empty entries and repeats are skipped.
+    summaries : bool
+        Also fetch each ticker's summary.
+    cache : dict, optional
+        ``{ticker: DataFrame}`` histories the caller already holds; they are returned
+        as they are instead of being fetched.
+
+    Returns
+    -------
+    dict
+        ``{ticker: result}`` in the order of `tickers`, each result holding ``df``,
+        ``label``, ``summary`` and the per-call ``error`` / ``summary_error`` messages
+        (None on success). A failed call leaves its ``df`` / ``summary`` as None.
+    """
+    cache = cache or {}
+    tickers = list(dict.fromkeys(t for t in tickers if t))
+    results = {
+        ticker: {"df": cache.get(ticker), "label": ticker.upper(), "summary": None,
+                 "error": None, "summary_error": None}
+        for ticker in tickers
+    }
+    calls = [(ticker, "df", get_stock_data) for ticker in tickers if ticker not in cache]
+    if summaries:
+        calls += [(ticker, "summary", get_ticker_summary) for ticker in tickers]
+    if not calls:
+        return results
+
+    # provider and store are set up here, not by several pool threads at once
+    default_store()
+    deadline = time.monotonic() + timeout
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(calls)), thread_name_prefix="fetch")
+    try:
+        futures = [(ticker, field, executor.submit(func, ticker)) for ticker, field, func in calls]
+        for ticker, field, future in futures:
+            error_field = "error" if field == "df" else "summary_error"
+            try:
+                value = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                results[ticker][field] = value[0] if field == "df" else value
+            except FutureTimeout:
+                future.cancel()
+                results[ticker][error_field] = f"TimeoutError: no response within {timeout}s"
+            except Exception as e:
+                results[ticker][error_field] = f"{type(e).__name__}: {e}"
+    finally:
+        # a call stuck in the network cannot be interrupted, it must not hold up the page
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
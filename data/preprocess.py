@@ -46,7 +46,81 @@ def align_dfs(dfs, on='Date'):
 
     return aligned_dfs
 
-def preprocess_stock_data(df: pd.DataFrame) -> pd.DataFrame:
+def close_matrix(dfs, labels, on='Date', column='Close'):
+    """
+    Build an aligned ``dates × tickers`` matrix of one price column.
+
+    The DataFrames are aligned with `align_dfs` and their `column` values are placed
+    side by side, one column per label, indexed by the union of all dates.
+
+    Returns
+    -------
+    pd.DataFrame
+        Index: the aligned dates, columns: `labels`.
+    """
+    if len(dfs) != len(labels):
+        raise ValueError("Expected one label per DataFrame.")
+    aligned = align_dfs(dfs, on=on)
+    if not aligned:
+        return pd.DataFrame()
+    index = pd.DatetimeIndex(aligned[0][on], name=on)
+    return pd.DataFrame(
+        np.column_stack([df[column].to_numpy(dtype=np.float64) for df in aligned]),
+        index=index, columns=list(labels),
+    )
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a price DataFrame to compact storage.
+
+    - float64 columns (Close, Open, ..., indicator columns) -> float32
+    - integer columns (e.g. Volume) -> int32 when every value fits, else unchanged
+    - 'Date' -> int64 nanoseconds since the Unix epoch (UTC)
+
+    float32 keeps about 7 significant digits, see the "compact_tolerance" entries in
+    `indicators.registry.INDICATORS` for what that means per indicator. Use
+    `ensure_datetime_dates` to get datetime dates back.
+
+    Returns
+    -------
+    pd.DataFrame
+        A new DataFrame, roughly half the size of the float64 one.
+    """
+    df = df.copy(deep=False)
+    int32 = np.iinfo(np.int32)
+    for col in df.columns:
+        values = df[col]
+        if col == 'Date':
+            df[col] = pd.to_datetime(values, errors='coerce', utc=True).astype('int64')
+            continue
+        if col == 'Volume' and pd.api.types.is_float_dtype(values.dtype) and (values % 1 == 0).all():
+            # volumes come back as floats after fillna, they are still whole numbers
+            values = values.astype(np.int64)
+        if pd.api.types.is_float_dtype(values.dtype):
+            df[col] = values.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            fits = values.empty or (values.min() >= int32.min and values.max() <= int32.max)
+            df[col] = values.astype(np.int32) if fits else values
+    return df
+
+def ensure_datetime_dates(df: pd.DataFrame, on='Date') -> pd.DataFrame:
+    """
+    Return `df` with a tz-aware (UTC) datetime 'Date' column.
+
+    Compact frames store dates as int64 epoch nanoseconds; those and string dates are
+    converted in a new frame sharing the other columns. Frames whose dates are already
+    datetime64 with a timezone are returned as they are.
+    """
+    if on not in df.columns:
+        return df
+    dates = df[on]
+    if isinstance(dates.dtype, pd.DatetimeTZDtype):
+        return df
+    df = df.copy(deep=False)
+    df[on] = pd.to_datetime(dates, errors='coerce', utc=True)
+    return df
+
+def preprocess_stock_data(df: pd.DataFrame, compact: bool = False) -> pd.DataFrame:
     """
     Perform data preprocessing on a single stock DataFrame.
     Steps:
@@ -54,6 +128,8 @@ def preprocess_stock_data(df: pd.DataFrame) -> pd.DataFrame:
     2. Handle missing / invalid values
     3. Remove extreme outliers
     4. Add derived columns for analysis (e.g. Daily_Return, Close_Smoothed)
+    5. Optionally (`compact=True`) store prices as float32, volumes as int32 and dates
+       as int64 epoch nanoseconds, see `compact_frame`
     """
     df = df.copy()
 
@@ -79,4 +155,7 @@ def preprocess_stock_data(df: pd.DataFrame) -> pd.DataFrame:
     # Safety net if got remaining NaNs (probably not)
     df = df.dropna(subset=['Close']).reset_index(drop=True)
 
+    if compact:
+        df = compact_frame(df)
+
     return df
\ No newline at end of file
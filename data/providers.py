@@ -0,0 +1,245 @@
+# data/providers.py
+"""
+Market-data providers behind every ticker lookup of the app.
+
+A provider answers three questions about a symbol:
+
+- ``history(symbol, start=None)``: daily bars with a ``'Date'`` column, the full
+  history when `start` is None and otherwise the bars from `start` on (the
+  ``fetch`` callable of `data.store.OHLCVStore`, which is why providers are also
+  callable);
+- ``quote(symbol)``: the last and the previous close;
+- ``summary(symbol)``: the page header (name, symbol, price, change, pct, logo).
+
+`get_stock_data` (through the on-disk store), `get_ticker_summary` and the
+auto-refresh quote all go through `get_provider()`, so the whole request path can
+run without the network:
+
+- ``"yahoo"`` (default): Yahoo Finance through yfinance;
+- ``"fixture"``: deterministic offline data, read from ``<SYMBOL>.csv`` files when
+  present and otherwise synthesized from a random walk seeded by the symbol;
+- `DelayedProvider` wraps any provider and sleeps before every call, to reproduce
+  upstream latency.
+
+The provider is picked from ``MARKET_DATA_PROVIDER`` (``MARKET_DATA_FIXTURES``
+naming the fixture directory) and wrapped in a `DelayedProvider` when
+``MARKET_DATA_LATENCY`` (seconds) is set; `set_provider` switches it at run time.
+Histories are stored per provider (``data/store/<name>/``), so fixture bars never
+mix with real ones. Note the store serves histories from disk for
+``OHLCV_MAX_AGE`` seconds; set it to 0 to send every history request upstream.
+
+Typical usage example:
+----------------------
+    from data.providers import set_provider
+
+    set_provider("fixture", latency=0.25, jitter=0.1)   # offline, ~0.3 s per call
+"""
+import os
+import random
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .store import check_symbol
+
+
+class MarketDataProvider:
+    """
+    Base class of the providers: subclasses implement `history` and may override
+    `quote` (default: the last two closes of the full history) and `summary`
+    (default: built from the quote).
+    """
+
+    name = "base"
+
+    def __call__(self, symbol, start=None) -> pd.DataFrame:
+        return self.history(symbol, start=start)
+
+    def history(self, symbol, start=None) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def quote(self, symbol):
+        """``(last, previous)`` close of `symbol`, previous = last when there is one bar only."""
+        closes = self.history(symbol)["Close"].dropna()
+        if closes.empty:
+            raise ValueError(f"No data found for ticker '{symbol}'.")
+        return float(closes.iloc[-1]), float(closes.iloc[-2] if len(closes) > 1 else closes.iloc[-1])
+
+    def summary(self, symbol) -> dict:
+        """Page header of `symbol`, see `_summary`."""
+        last, previous = self.quote(symbol)
+        return _summary(symbol, symbol.upper(), last, previous)
+
+
+def _summary(symbol, name, price, previous, logo=None) -> dict:
+    change, pct_change = None, None
+    if price and previous:
+        change = round(price - previous, 2)
+        pct_change = round((change / previous) * 100, 2)
+    return {
+        "name": name,
+        "symbol": symbol.upper(),
+        "price": price,
+        "change": change,
+        "pct": pct_change,
+        "logo": logo,
+    }
+
+
+class YahooProvider(MarketDataProvider):
+    """Yahoo Finance through yfinance; full histories cover the last 3 years."""
+
+    name = "yahoo"
+
+    def history(self, symbol, start=None) -> pd.DataFrame:
+        tk = yf.Ticker(symbol)
+        data = tk.history(period='3y') if start is None else tk.history(start=pd.Timestamp(start).strftime('%Y-%m-%d'))
+        return data.reset_index()
+
+    def quote(self, symbol):
+        tk = yf.Ticker(symbol)
+        hist = tk.history(period="5d", interval="1d").dropna()
+        if len(hist) >= 2:
+            return float(hist["Close"].iloc[-1]), float(hist["Close"].iloc[-2])
+        elif len(hist) == 1:
+            val = float(hist["Close"].iloc[-1])
+            return val, val
+        info = tk.info
+        return info.get("currentPrice"), info.get("previousClose")
+
+    def summary(self, symbol) -> dict:
+        info = yf.Ticker(symbol).info
+        return _summary(symbol, info.get("shortName", symbol.upper()), info.get("currentPrice"),
+                        info.get("previousClose"), info.get("logo_url"))
+
+
+class FixtureProvider(MarketDataProvider):
+    """
+    Deterministic offline provider.
+
+    Parameters
+    ----------
+    root : str or Path, optional
+        Directory of ``<SYMBOL>.csv`` files (a ``'Date'`` column plus OHLCV columns);
+        symbols without a file are synthesized.
+    end : str, optional
+        Date of the last synthesized bar, fixed so every run sees the same data.
+    periods : int, optional
+        Number of synthesized business-day bars (default about 3 years).
+    tz : str, optional
+        Timezone of the synthesized dates, the exchange timezone Yahoo returns.
+
+    Synthesized bars follow a geometric random walk seeded by a CRC of the symbol,
+    so a symbol always gets the same history, in every process.
+    """
+
+    name = "fixture"
+
+    def __init__(self, root=None, end="2024-12-31", periods=756, tz="America/New_York"):
+        self.root = Path(root) if root else None
+        self.end = end
+        self.periods = periods
+        self.tz = tz
+
+    def _bars(self, symbol) -> pd.DataFrame:
+        # the symbol becomes a file name, only plain tickers are accepted
+        symbol = check_symbol(symbol)
+        path = self.root / f"{symbol}.csv" if self.root else None
+        if path is not None and path.exists():
+            df = pd.read_csv(path)
+            df["Date"] = pd.to_datetime(df["Date"])
+            return df.sort_values("Date").reset_index(drop=True)
+
+        seed = zlib.crc32(symbol.upper().encode())
+        rng = np.random.default_rng(seed)
+        dates = pd.bdate_range(end=self.end, periods=self.periods, tz=self.tz)
+        close = (20 + seed % 480) * np.exp(np.cumsum(rng.normal(3e-4, 0.015, self.periods)))
+        open_ = np.concatenate(([close[0]], close[:-1])) * (1 + rng.normal(0, 0.003, self.periods))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, self.periods)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, self.periods)))
+        volume = rng.integers(1_000_000, 10_000_000, self.periods)
+        return pd.DataFrame({"Date": dates, "Open": open_, "High": high, "Low": low,
+                             "Close": close, "Volume": volume})
+
+    def history(self, symbol, start=None) -> pd.DataFrame:
+        bars = self._bars(symbol)
+        if start is not None:
+            bars = bars[bars["Date"] >= start].reset_index(drop=True)
+        return bars
+
+
+class DelayedProvider(MarketDataProvider):
+    """
+    Wraps `provider`, sleeping ``latency + uniform(0, jitter)`` seconds before every call.
+
+    The delays come from a generator seeded with `seed`, so a benchmark replays the
+    same sequence of latencies. The name is the wrapped provider's, as the data is.
+    """
+
+    def __init__(self, provider, latency=0.1, jitter=0.0, seed=0):
+        self.provider = provider
+        self.latency = latency
+        self.jitter = jitter
+        self.name = provider.name
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _sleep(self):
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+        time.sleep(delay)
+
+    def history(self, symbol, start=None) -> pd.DataFrame:
+        self._sleep()
+        return self.provider.history(symbol, start=start)
+
+    def quote(self, symbol):
+        self._sleep()
+        return self.provider.quote(symbol)
+
+    def summary(self, symbol) -> dict:
+        self._sleep()
+        return self.provider.summary(symbol)
+
+
+PROVIDERS = {
+    "yahoo": YahooProvider,
+    "fixture": lambda: FixtureProvider(os.environ.get("MARKET_DATA_FIXTURES")),
+}
+
+_active = None
+# get_provider is called from the fetch threads of data.fetch.get_many_stock_data
+_lock = threading.RLock()
+
+
+def set_provider(provider, latency=0.0, jitter=0.0) -> MarketDataProvider:
+    """
+    Route every market-data lookup through `provider` and return it.
+
+    `provider` is a `MarketDataProvider` or a `PROVIDERS` name; a positive `latency`
+    (seconds, plus up to `jitter`) wraps it in a `DelayedProvider`.
+    """
+    global _active
+    if isinstance(provider, str):
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unknown market-data provider: {provider}. Expected one of {', '.join(PROVIDERS)}.")
+        provider = PROVIDERS[provider]()
+    if latency > 0 or jitter > 0:
+        provider = DelayedProvider(provider, latency, jitter)
+    with _lock:
+        _active = provider
+    return provider
+
+
+def get_provider() -> MarketDataProvider:
+    """The active provider, set up from the environment on first use (once, even from several threads)."""
+    with _lock:
+        if _active is None:
+            return set_provider(os.environ.get("MARKET_DATA_PROVIDER", "yahoo").strip().lower(),
+                                latency=float(os.environ.get("MARKET_DATA_LATENCY", 0)))
+        return _active
@@ -0,0 +1,256 @@
+# data/store.py
+"""
+Persistent on-disk OHLCV store, one columnar file per symbol.
+
+Every symbol gets a data file plus a small JSON metadata file (rows, first/last
+bar date, columns, timezone, last refresh time). Bars are kept as Parquet when
+pyarrow is installed and as an uncompressed NumPy ``.npz`` archive (one array per
+column) otherwise; both load without touching the network.
+
+`OHLCVStore.get` serves a symbol from disk while its last refresh is younger than
+`max_age`; otherwise `refresh` asks the provider only for the bars from the last
+stored date on and appends them (the last stored bar is replaced, as it may have
+been an intraday snapshot). The provider is any callable
+``fetch(symbol, start=None) -> DataFrame`` with a ``'Date'`` column (``start``
+None meaning a full history), so tests can run against a stand-in.
+
+Symbols are checked against `SYMBOL_PATTERN` before they become file names, and
+saves and refreshes of one symbol are serialized, so the concurrent fetches of
+`data.fetch.get_many_stock_data` never interleave their files.
+
+Typical usage example:
+----------------------
+    from data.providers import YahooProvider
+    from data.store import OHLCVStore
+
+    store = OHLCVStore("data/store/yahoo", fetch=YahooProvider())
+    df = store.get("AAPL")          # disk if fresh, else an incremental refresh
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (pandas' Parquet engine)
+    DEFAULT_FORMAT = "parquet"
+except ImportError:
+    DEFAULT_FORMAT = "npz"
+
+DEFAULT_ROOT = Path(os.environ.get("OHLCV_STORE_DIR", Path(__file__).with_name("store")))
+# seconds a stored history is served without asking the provider for new bars
+DEFAULT_MAX_AGE = float(os.environ.get("OHLCV_MAX_AGE", 3600))
+
+FORMATS = {"parquet": ".parquet", "npz": ".npz"}
+
+# symbols end up in file names, so only ticker characters are accepted (no path separators)
+SYMBOL_PATTERN = re.compile(r"^[A-Z0-9.^=-]+$")
+
+
+def check_symbol(symbol: str) -> str:
+    """Upper-cased `symbol`, or ValueError when it is not a plain ticker such as ``BRK-B`` or ``^GSPC``."""
+    symbol = str(symbol).upper()
+    if not SYMBOL_PATTERN.match(symbol) or symbol.strip(".") == "":
+        raise ValueError(f"Invalid ticker symbol: {symbol!r}")
+    return symbol
+
+
+def _temp_path(path: Path) -> Path:
+    """Unique file next to `path`, so concurrent writers of the same symbol never share one."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    os.close(fd)
+    return Path(tmp)
+
+
+def _write_frame(path: Path, df: pd.DataFrame, fmt: str):
+    """Write `df` next to `path` and move it into place, so readers never see a partial file."""
+    tmp = _temp_path(path)
+    try:
+        if fmt == "parquet":
+            df.to_parquet(tmp, index=False)
+        else:
+            columns = {}
+            for name in df.columns:
+                values = df[name]
+                if name == "Date":
+                    values = values.dt.tz_convert("UTC") if values.dt.tz is not None else values
+                    values = values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+                columns[name] = np.asarray(values)
+            # np.savez appends ".npz" to names without it
+            with open(tmp, "wb") as file:
+                np.savez(file, **columns)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _read_frame(path: Path, fmt: str, tz=None) -> pd.DataFrame:
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    with np.load(path, allow_pickle=False) as archive:
+        df = pd.DataFrame({name: archive[name] for name in archive.files})
+    if "Date" in df.columns:
+        dates = pd.to_datetime(df["Date"].to_numpy(dtype=np.int64), unit="ns", utc=True)
+        df["Date"] = dates.tz_convert(tz) if tz else dates.tz_localize(None)
+    return df
+
+
+class OHLCVStore:
+    """
+    Directory of per-symbol bar histories with incremental refresh.
+
+    Parameters
+    ----------
+    root : str or Path, optional
+        Directory holding ``<SYMBOL>.<ext>`` and ``<SYMBOL>.json`` files (created on demand).
+    fetch : callable, optional
+        ``fetch(symbol, start=None) -> DataFrame``; required for `refresh`.
+    max_age : float, optional
+        Seconds since the last refresh during which `get` reads from disk only.
+    fmt : {"parquet", "npz"}, optional
+        File format for newly written symbols (Parquet when pyarrow is installed).
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, fetch=None, max_age=DEFAULT_MAX_AGE, fmt=DEFAULT_FORMAT):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown store format: {fmt}. Expected one of {', '.join(FORMATS)}.")
+        self.root = Path(root)
+        self.fetch = fetch
+        self.max_age = max_age
+        self.fmt = fmt
+        # one lock per symbol: a save writes two files and a refresh reads, merges and saves
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, symbol: str) -> threading.RLock:
+        with self._locks_guard:
+            return self._locks.setdefault(check_symbol(symbol), threading.RLock())
+
+    def _path(self, symbol: str, suffix: str) -> Path:
+        return self.root / f"{check_symbol(symbol)}{suffix}"
+
+    def _meta_path(self, symbol: str) -> Path:
+        return self._path(symbol, ".json")
+
+    def metadata(self, symbol: str):
+        """Stored metadata of `symbol`, or None if it was never saved."""
+        path = self._meta_path(symbol)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def symbols(self) -> list:
+        """Every stored symbol."""
+        return sorted(path.stem for path in self.root.glob("*.json"))
+
+    def load(self, symbol: str):
+        """The stored bars of `symbol` (oldest first), or None if there are none."""
+        meta = self.metadata(symbol)
+        if meta is None:
+            return None
+        path = self._path(symbol, FORMATS[meta["format"]])
+        if not path.exists():
+            return None
+        return _read_frame(path, meta["format"], meta.get("tz"))
+
+    def save(self, symbol: str, df: pd.DataFrame, source: str = None) -> dict:
+        """Replace the stored bars of `symbol` with `df` and return the new metadata."""
+        with self._lock(symbol):
+            if "Date" not in df.columns:
+                raise ValueError("Bars must contain a 'Date' column.")
+            symbol = check_symbol(symbol)
+            self.root.mkdir(parents=True, exist_ok=True)
+            old = self.metadata(symbol)
+            fmt = old["format"] if old else self.fmt
+
+            df = df.sort_values("Date").reset_index(drop=True)
+            _write_frame(self._path(symbol, FORMATS[fmt]), df, fmt)
+            dates = df["Date"]
+            meta = {
+                "symbol": symbol,
+                "format": fmt,
+                "rows": int(len(df)),
+                "columns": list(df.columns),
+                "tz": str(dates.dt.tz) if dates.dt.tz is not None else None,
+                "first_date": dates.iloc[0].isoformat() if len(df) else None,
+                "last_date": dates.iloc[-1].isoformat() if len(df) else None,
+                "updated_at": time.time(),
+                "source": source or (old or {}).get("source"),
+            }
+            self._write_metadata(symbol, meta)
+            return meta
+
+    def _write_metadata(self, symbol: str, meta: dict):
+        path = self._meta_path(symbol)
+        tmp = _temp_path(path)
+        try:
+            tmp.write_text(json.dumps(meta, indent=2))
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def refresh(self, symbol: str) -> pd.DataFrame:
+        """
+        Bring `symbol` up to date and return its full history.
+
+        A stored symbol only requests the bars from its last stored date on; those
+        replace any stored bar on the same or a later date and are appended. A new
+        symbol gets a full history.
+        """
+        with self._lock(symbol):
+            if self.fetch is None:
+                raise ValueError("No provider configured for refreshing the store.")
+            stored = self.load(symbol)
+            source = getattr(self.fetch, "name", getattr(self.fetch, "__name__", None))
+            if stored is None or stored.empty:
+                fresh = self.fetch(symbol, start=None)
+                if fresh is None or fresh.empty:
+                    raise ValueError(f"No data found for ticker '{symbol}'.")
+                self.save(symbol, fresh, source)
+                return self.load(symbol)
+
+            last = stored["Date"].iloc[-1]
+            new = self.fetch(symbol, start=last)
+            if new is not None and not new.empty:
+                new = new[new["Date"] >= last].sort_values("Date")
+            if new is None or new.empty:
+                # nothing new yet, only the refresh time moves
+                meta = self.metadata(symbol)
+                meta["updated_at"] = time.time()
+                self._write_metadata(symbol, meta)
+                return stored
+
+            kept = stored[stored["Date"] < new["Date"].iloc[0]]
+            columns = [name for name in stored.columns if name in new.columns]
+            merged = pd.concat([kept, new[columns]], ignore_index=True)
+            self.save(symbol, merged, source)
+            print(f"[INFO] {symbol.upper()}: appended {len(merged) - len(kept)} bars after {last.date()}")
+            return self.load(symbol)
+
+    def get(self, symbol: str, max_age=None) -> pd.DataFrame:
+        """
+        History of `symbol`, from disk when refreshed within `max_age` seconds.
+
+        A failing provider is tolerated when bars are stored: they are returned as
+        they are (with a warning) instead of raising.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        meta = self.metadata(symbol)
+        if meta is not None and time.time() - meta["updated_at"] <= max_age:
+            stored = self.load(symbol)
+            if stored is not None:
+                return stored
+        try:
+            return self.refresh(symbol)
+        except Exception as e:
+            stored = self.load(symbol)
+            if stored is None:
+                raise
+            print(f"[WARN] Refreshing {symbol.upper()} failed ({e}), using the stored bars.")
+            return stored
@@ -1,8 +1,12 @@
-from .sma import calculate_sma
-from .ema import calculate_ema
-from .rsi import calculate_rsi
-from .macd import calculate_macd
-from .dailyr import calculate_dailyr
-from .updown import calculate_updown
+from .sma import calculate_sma, sma_kernel
+from .ema import calculate_ema, ema_kernel
+from .rsi import calculate_rsi, rsi_kernel
+from .macd import calculate_macd, macd_kernel
+from .dailyr import calculate_dailyr, calculate_best_trade, best_trade_kernel
+from .updown import calculate_updown, longest_streaks
+from .bollinger import calculate_bollinger, bollinger_kernel
+from .volatility import calculate_volatility, volatility_kernel
+from .zscore import calculate_zscore, zscore_kernel
+from .rolling import rolling_moments, rolling_std, rolling_min, rolling_max, rolling_max_gain
 
-__all__ = ['calculate_sma', 'calculate_ema', 'calculate_rsi', 'calculate_macd', 'calculate_dailyr', 'calculate_updown']
\ No newline at end of file
+__all__ = ['calculate_sma', 'calculate_ema', 'calculate_rsi', 'calculate_macd', 'calculate_dailyr', 'calculate_updown', 'sma_kernel', 'ema_kernel', 'rsi_kernel', 'macd_kernel', 'longest_streaks', 'calculate_bollinger', 'calculate_volatility', 'calculate_zscore', 'bollinger_kernel', 'volatility_kernel', 'zscore_kernel', 'rolling_moments', 'rolling_std', 'rolling_min', 'rolling_max', 'calculate_best_trade', 'best_trade_kernel', 'rolling_max_gain']
\ No newline at end of file
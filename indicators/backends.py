@@ -0,0 +1,120 @@
+# indicators/backends.py
+"""
+Kernel backends for the inherently sequential recursions.
+
+Two pieces of indicator logic carry state from one point to the next: the
+first-order filter behind EMA and Wilder smoothing (`filters.exponential_smooth`)
+and the tolerance state machine of the up/down streaks (`updown.streak_breaks`).
+The default ``"numpy"`` backend runs them as they always ran (scipy's compiled
+``lfilter`` and NumPy cumulative scans). The ``"numba"`` backend runs the plain
+loops below compiled with Numba, which avoids the temporary arrays of the scans.
+
+The backend is picked from the ``INDICATOR_BACKEND`` environment variable
+(``numpy``, ``numba`` or ``auto`` = numba when installed) at import time and can be
+switched with `set_backend`. Without Numba the loops stay plain Python functions,
+which keeps them importable (and testable against the NumPy path) everywhere.
+
+Compiled kernels are cached on disk (``cache=True``, next to this module or under
+``NUMBA_CACHE_DIR``), so a new worker process loads them instead of compiling.
+
+Typical usage example:
+----------------------
+    from indicators.backends import set_backend
+
+    set_backend("numba")   # compiles (or loads) the kernels once
+"""
+import os
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ("numpy", "numba")
+
+
+def _jit(func):
+    """Compile `func` with Numba (cached on disk) when it is installed, else return it unchanged."""
+    if numba is None:
+        return func
+    return numba.njit(cache=True, nogil=True)(func)
+
+
+@_jit
+def smooth_rows(rows, alpha, seeds, out):
+    """ y[t] = alpha * x[t] + (1 - alpha) * y[t - 1] along every row of `rows`, with y[-1] = seeds[row] """
+    decay = 1.0 - alpha
+    for row in range(rows.shape[0]):
+        smoothed = seeds[row]
+        for t in range(rows.shape[1]):
+            smoothed = alpha * rows[row, t] + decay * smoothed
+            out[row, t] = smoothed
+
+
+@_jit
+def streak_break_rows(values, allowed, threshold, breaks, small_rank):
+    """ Day-by-day streak rules of `updown.streak_breaks`, row 0 = up and row 1 = down
+
+    A same-direction or large opposite move starts a new run of small opposite moves,
+    flat opposite (and NaN) moves leave it untouched, and every (allowed + 1)-th small
+    move of a run breaks the streak, as does every large one.
+    """
+    for row in range(2):
+        sign = 1.0 if row == 0 else -1.0
+        rank = 0
+        for t in range(values.shape[0]):
+            move = values[t] * sign
+            if move > 0:
+                rank = 0
+            elif move < 0 and abs(move) >= 1e-9:
+                if -move > threshold:
+                    rank = 0
+                    breaks[row, t] = True
+                else:
+                    rank += 1
+                    breaks[row, t] = rank % (allowed + 1) == 0
+            small_rank[row, t] = rank
+
+
+def _resolve(name):
+    name = (name or "auto").strip().lower()
+    if name == "auto":
+        return "numba" if numba is not None else "numpy"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend: {name}. Expected one of {', '.join(BACKENDS)} or auto.")
+    if name == "numba" and numba is None:
+        print("[WARN] Numba is not installed, falling back to the numpy kernel backend.")
+        return "numpy"
+    return name
+
+
+_active = _resolve(os.environ.get("INDICATOR_BACKEND", "auto"))
+
+
+def get_backend() -> str:
+    """Name of the active kernel backend (``"numpy"`` or ``"numba"``)."""
+    return _active
+
+
+def set_backend(name: str) -> str:
+    """
+    Switch the kernel backend and return the backend actually used.
+
+    ``"numba"`` falls back to ``"numpy"`` (with a warning) when Numba is missing,
+    ``"auto"`` picks numba whenever it is available. Selecting numba compiles the
+    kernels right away (or loads them from the disk cache), see `warm_up`.
+    """
+    global _active
+    _active = _resolve(name)
+    if _active == "numba":
+        warm_up()
+    return _active
+
+
+def warm_up():
+    """Run every loop kernel once on tiny inputs so compilation is not paid on the first real call."""
+    rows = np.zeros((1, 2))
+    smooth_rows(rows, 0.5, np.zeros(1), np.empty_like(rows))
+    streak_break_rows(np.zeros(2), 1, 0.5, np.zeros((2, 2), dtype=np.bool_), np.zeros((2, 2), dtype=np.int64))
@@ -0,0 +1,332 @@
+# indicators/backtest.py
+"""
+Vectorised backtests of trading rules built on the registry indicators.
+
+A rule turns indicator values into a long/flat position per bar (1 = hold the
+stock, 0 = in cash). Every rule evaluates a whole list of parameter sets at
+once: the indicator rows come from the batch kernels (all SMA windows in one
+`sma_kernel` call, every EMA leg filtered once through `SharedInputs`) and the
+positions, equity curves and drawdowns are ``(n_strategies, n_rows)`` blocks.
+
+Positions are decided on the close of a bar and held over the next bar, so a
+signal never uses the return it trades on. An optional fee (basis points of the
+traded value) is charged on every position change.
+
+Typical usage example:
+----------------------
+    from indicators.backtest import backtest_grid
+
+    results = backtest_grid(df, "ma_crossover", {"fast": [5, 10, 20], "slow": [50, 100]})
+    best = max(results, key=lambda r: r["summary"]["total_return_pct"])
+"""
+import itertools
+
+import numpy as np
+
+from .buffers import datetime_dates
+from .macd import macd_kernel
+from .registry import SharedInputs, _validate_params
+from .rsi import rsi_kernel
+from .sma import sma_kernel
+
+
+def crossover_positions(fast, slow) -> np.ndarray:
+    """
+    Long while `fast` is above `slow` (e.g. SMA_10 vs SMA_50, or Close vs SMA_20).
+
+    Inputs broadcast against each other; bars where either is NaN are flat.
+    """
+    with np.errstate(invalid="ignore"):
+        return (np.asarray(fast, dtype=np.float64) > np.asarray(slow, dtype=np.float64)).astype(np.float64)
+
+
+def threshold_positions(values, lower, upper) -> np.ndarray:
+    """
+    Enter when `values` drops below `lower` and exit once it rises above `upper` (e.g. RSI 30/70).
+
+    Between the two events the previous position is kept: the entry/exit events are
+    carried forward along the last axis, so no per-bar loop is needed. `lower` and
+    `upper` may be arrays broadcasting against `values` (one threshold per row).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        entries = values < lower
+        exits = values > upper
+    events = entries | exits
+    # index of the latest event up to each bar, -1 before the first one
+    last_event = np.where(events, np.arange(values.shape[-1]), -1)
+    np.maximum.accumulate(last_event, axis=-1, out=last_event)
+    held = np.take_along_axis(entries, np.maximum(last_event, 0), axis=-1) & (last_event >= 0)
+    return held.astype(np.float64)
+
+
+def sign_positions(values) -> np.ndarray:
+    """Long while `values` is positive (e.g. MACD_hist), flat otherwise and on NaN."""
+    with np.errstate(invalid="ignore"):
+        return (np.asarray(values, dtype=np.float64) > 0).astype(np.float64)
+
+
+def _ma_crossover(shared, params):
+    """ One row per param set: fast moving average above the slow one """
+    sma = [p for p in params if p["average"] == "sma"]
+    windows = list(dict.fromkeys(int(w) for p in sma for w in (p["fast"], p["slow"])))
+    sma_rows = dict(zip(windows, sma_kernel(shared.close, windows))) if windows else {}
+    emas = shared.emas([(int(w), 2.0) for p in params if p["average"] == "ema" for w in (p["fast"], p["slow"])])
+
+    def line(p, name):
+        window = int(p[name])
+        return sma_rows[window] if p["average"] == "sma" else emas[(window, 2.0)]
+
+    return np.stack([crossover_positions(line(p, "fast"), line(p, "slow")) for p in params])
+
+
+def _rsi_threshold(shared, params):
+    """ One row per param set: buy oversold (RSI < lower), sell overbought (RSI > upper) """
+    intervals = list(dict.fromkeys(int(p["interval"]) for p in params))
+    rows = dict(zip(intervals, rsi_kernel(shared.close, intervals, differences=shared.differences())))
+    block = np.stack([rows[int(p["interval"])] for p in params])
+    lower = np.array([[p["lower"]] for p in params], dtype=np.float64)
+    upper = np.array([[p["upper"]] for p in params], dtype=np.float64)
+    return threshold_positions(block, lower, upper)
+
+
+def _macd_hist(shared, params):
+    """ One row per param set: long while the MACD histogram is positive """
+    periods = [(int(p["fast_period"]), int(p["slow_period"]), int(p["signal_period"])) for p in params]
+    emas = shared.emas([(period, 2.0) for f, s, _ in periods for period in (f, s)])
+    hist = np.stack([
+        macd_kernel(shared.close, f, s, signal, emas=(emas[(f, 2.0)], emas[(s, 2.0)]))[4]
+        for f, s, signal in periods
+    ])
+    return sign_positions(hist)
+
+
+def _check_crossover(params):
+    if params["average"] not in ("sma", "ema"):
+        raise ValueError(f"Invalid parameter 'average'={params['average']!r}. Must be 'sma' or 'ema'.")
+    if not 0 < params["fast"] < params["slow"]:
+        raise ValueError(f"Invalid parameter 'fast'={params['fast']}. Must be > 0 and less than 'slow'.")
+
+
+def _check_rsi(params):
+    _validate_params("rsi", {"interval": params["interval"]})
+    if not 0 <= params["lower"] < params["upper"] <= 100:
+        raise ValueError(
+            f"Invalid thresholds lower={params['lower']}, upper={params['upper']}. Must satisfy 0 <= lower < upper <= 100."
+        )
+
+
+# Strategy registry: key -> spec
+#   "positions": (shared, [merged params, ...]) -> (n_params, n_rows) block of 0/1 positions
+#   "validate":  merged params -> None, raises ValueError on invalid params
+#   "plot_kind": layout of the results, like the indicator registry's (descriptive only,
+#                plot_backtest draws every strategy with the equity/drawdown layout)
+STRATEGIES = {
+    "ma_crossover": {
+        "default_params": {"average": "sma", "fast": 10, "slow": 50},
+        "positions": _ma_crossover,
+        "validate": _check_crossover,
+        "plot_kind": "separate_equity",  # equity curves and drawdowns under the price chart
+    },
+    "rsi_threshold": {
+        "default_params": {"interval": 14, "lower": 30, "upper": 70},
+        "positions": _rsi_threshold,
+        "validate": _check_rsi,
+        "plot_kind": "separate_equity",
+    },
+    "macd_hist": {
+        "default_params": {"fast_period": 12, "slow_period": 26, "signal_period": 9},
+        "positions": _macd_hist,
+        "validate": lambda p: _validate_params("macd", p),
+        "plot_kind": "separate_equity",
+    },
+}
+
+
+def simulate(close, positions, fee_bps: float = 0.0) -> dict:
+    """
+    Run a block of position rows over one close series.
+
+    Parameters
+    ----------
+    close : array-like
+        1-D close prices of length n.
+    positions : array-like
+        ``(n_strategies, n)`` (or 1-D) positions decided at each close, 1 = long, 0 = flat.
+    fee_bps : float
+        Cost of each position change in basis points of the traded value.
+
+    Returns
+    -------
+    dict
+        ``"positions"``, ``"returns"`` (per-bar strategy returns), ``"equity"`` (growth of 1
+        unit) and ``"drawdown"`` (fraction below the running equity peak, <= 0), all
+        ``(n_strategies, n)`` float arrays.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    positions = np.atleast_2d(np.asarray(positions, dtype=np.float64))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bar_returns = close[1:] / close[:-1] - 1
+    bar_returns[~np.isfinite(bar_returns)] = 0.0
+
+    turnover = np.abs(np.diff(positions, axis=-1, prepend=0.0))
+    growth = np.ones_like(positions)
+    growth[:, 1:] += positions[:, :-1] * bar_returns
+    # the fee comes off the value at the close the position changes on
+    returns = growth * (1 - turnover * (fee_bps / 1e4)) - 1
+
+    equity = np.cumprod(1 + returns, axis=-1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1
+    return {"positions": positions, "returns": returns, "equity": equity, "drawdown": drawdown}
+
+
+def extract_trades(close, positions, equity, dates=None) -> list:
+    """
+    List the round trips of one position row.
+
+    A trade opens on the bar the position goes 0 -> 1 and closes on the bar it goes
+    back to 0; a position still open on the last bar is closed there (``"open": True``).
+    ``return_pct`` is read from the equity curve, so it includes fees.
+
+    Returns
+    -------
+    list of dict
+        entry_index / exit_index, entry_date / exit_date, entry_price / exit_price,
+        return_pct, bars (bars held) and open.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+    n = close.size
+    dates = np.arange(n) if dates is None else np.asarray(dates)
+
+    changes = np.diff(positions, prepend=0.0, append=0.0)
+    entries = np.flatnonzero(changes > 0)
+    exits = np.flatnonzero(changes < 0)
+    still_open = exits == n
+    exits = np.minimum(exits, n - 1)
+
+    before = np.where(entries > 0, equity[np.maximum(entries - 1, 0)], 1.0)
+    gains = (equity[exits] / before - 1) * 100
+    return [
+        {
+            "entry_index": int(entry),
+            "exit_index": int(exit_),
+            "entry_date": dates[entry],
+            "exit_date": dates[exit_],
+            "entry_price": float(close[entry]),
+            "exit_price": float(close[exit_]),
+            "return_pct": float(gain),
+            "bars": int(exit_ - entry),
+            "open": bool(is_open),
+        }
+        for entry, exit_, gain, is_open in zip(entries, exits, gains, still_open)
+    ]
+
+
+def summarize(sim: dict, trades: list, row: int) -> dict:
+    """Headline numbers of one strategy row of `simulate` output."""
+    wins = sum(trade["return_pct"] > 0 for trade in trades)
+    return {
+        "total_return_pct": float((sim["equity"][row, -1] - 1) * 100),
+        "max_drawdown_pct": float(sim["drawdown"][row].min() * 100),
+        "trades": len(trades),
+        "win_rate_pct": float(wins / len(trades) * 100) if trades else 0.0,
+        "exposure_pct": float(sim["positions"][row].mean() * 100),
+    }
+
+
+def run_backtests(df, requests, fee_bps: float = 0.0) -> list:
+    """
+    Backtest several strategies / parameter sets on one price frame.
+
+    Requests of the same strategy are built together, so e.g. twenty SMA crossovers
+    cost one `sma_kernel` call, and all of them go through one `simulate` call.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Price data with a `'Close'` column (and `'Date'` for trade dates).
+    requests : list of (str, dict or None)
+        Strategy keys (see `STRATEGIES`) with their parameter overrides, e.g.
+        ``[("ma_crossover", {"fast": 20, "slow": 50}), ("rsi_threshold", None)]``.
+    fee_bps : float
+        Cost per position change in basis points.
+
+    Returns
+    -------
+    list of dict
+        One dict per request, in order, with ``strategy``, ``params`` (merged),
+        ``summary`` (see `summarize`), ``trades`` (see `extract_trades`), and the
+        ``positions`` / ``equity`` / ``drawdown`` rows as arrays. A buy-and-hold
+        comparison is included in every summary as ``buy_hold_pct``.
+
+    Raises
+    ------
+    ValueError
+        If a strategy key is unknown or a parameter is invalid.
+    """
+    resolved = []
+    for key, params in requests:
+        spec = STRATEGIES.get(key)
+        if spec is None:
+            raise ValueError(f"Unknown strategy: {key}")
+        merged_params = {**spec["default_params"], **(params or {})}
+        spec["validate"](merged_params)
+        resolved.append((key, merged_params))
+    if not resolved:
+        return []
+
+    # compact frames keep dates as int64 epoch nanoseconds
+    dates = datetime_dates(df["Date"]).to_numpy() if "Date" in df.columns else None
+    shared = SharedInputs(df["Close"].to_numpy(dtype=np.float64), dates)
+
+    # === Build each strategy's positions in one batch ===
+    positions = np.empty((len(resolved), shared.close.size))
+    groups = {}
+    for pos, (key, merged_params) in enumerate(resolved):
+        groups.setdefault(key, []).append(pos)
+    for key, rows in groups.items():
+        positions[rows] = STRATEGIES[key]["positions"](shared, [resolved[pos][1] for pos in rows])
+
+    sim = simulate(shared.close, positions, fee_bps)
+    valid = shared.close[~np.isnan(shared.close)]
+    buy_hold = float((valid[-1] / valid[0] - 1) * 100) if valid.size > 1 else 0.0
+
+    results = []
+    for row, (key, merged_params) in enumerate(resolved):
+        trades = extract_trades(shared.close, sim["positions"][row], sim["equity"][row], dates)
+        results.append({
+            "strategy": key,
+            "params": merged_params,
+            "summary": {**summarize(sim, trades, row), "buy_hold_pct": buy_hold},
+            "trades": trades,
+            "positions": sim["positions"][row],
+            "equity": sim["equity"][row],
+            "drawdown": sim["drawdown"][row],
+        })
+    print(f"[INFO] {len(results)} backtests run: {', '.join(groups)}.")
+    return results
+
+
+def backtest_grid(df, key: str, grid: dict, fee_bps: float = 0.0) -> list:
+    """
+    Backtest one strategy over the cartesian product of a parameter grid.
+
+    Parameters not in `grid` take the strategy defaults; invalid combinations
+    (e.g. ``fast >= slow``) are skipped. See `run_backtests` for the result format.
+    """
+    spec = STRATEGIES.get(key)
+    if spec is None:
+        raise ValueError(f"Unknown strategy: {key}")
+
+    names = list(grid)
+    requests = []
+    for values in itertools.product(*(list(grid[name]) for name in names)):
+        merged_params = {**spec["default_params"], **dict(zip(names, values))}
+        try:
+            spec["validate"](merged_params)
+        except ValueError:
+            continue
+        requests.append((key, merged_params))
+    return run_backtests(df, requests, fee_bps)
@@ -0,0 +1,67 @@
+import pandas as pd
+import numpy as np
+
+from .buffers import output_block
+from .rolling import rolling_moments
+
+# row order of the block returned by bollinger_kernel
+BOLLINGER_ROWS = ("mid", "upper", "lower")
+
+def bollinger_kernel(values, window = 20, num_std = 2.0, moments = None, out = None):
+    """ Computes the middle, upper and lower Bollinger Bands into one (3, n) float block
+
+    The middle band is the rolling mean of the closes and the outer bands sit `num_std`
+    population standard deviations above and below it, all from one rolling_moments pass.
+
+    Args:
+        values (array-like): 1-D close prices
+        window (int): rolling window size, defaults to 20
+        num_std (float): band width in standard deviations, defaults to 2.0
+        moments (tuple[np.ndarray, np.ndarray]): already computed (mean, var) rows (ddof=0)
+            to reuse instead of recomputing them
+        out (np.ndarray): preallocated float64 (3, len(values)) buffer to write into
+
+    Returns:
+        block (np.ndarray): float array of shape (3, len(values)) (see BOLLINGER_ROWS),
+            NaN for the first window - 1 entries
+    """
+    values = np.asarray(values, dtype=np.float64)
+    block = output_block(out, (len(BOLLINGER_ROWS), values.size))
+    mid, upper, lower = block
+
+    mean, var = rolling_moments(values, window) if moments is None else moments
+    mid[:] = mean
+    width = num_std * np.sqrt(var)
+    np.add(mean, width, out=upper)
+    np.subtract(mean, width, out=lower)
+    return block
+
+def calculate_bollinger(df, window = 20, num_std = 2.0):
+    """ Surrounds the rolling average of closing prices with bands that widen as prices get more volatile
+
+    Args:
+        df (pd.DataFrame): stock data containing a 'Close' column
+        window (int): the amount of data points per band value, defaults to 20
+        num_std (float): distance of the outer bands from the middle in standard deviations, defaults to 2.0
+
+    Returns:
+        df (pd.DataFrame): input frame with added BB_mid_<window>, BB_upper_<window> and BB_lower_<window> columns
+    """
+    data = df["Close"]
+
+    # validating invalid inputs
+    if window < 1:
+        raise ValueError("Window size must be at least 1")
+    if num_std <= 0:
+        raise ValueError("Band width must be positive")
+    if data.size < window:
+        raise IndexError(f'Insufficient data, only {data.size} points selected for window size of {window}')
+
+    # handles float inputs
+    window = int(window)
+
+    mid, upper, lower = bollinger_kernel(data.to_numpy(dtype=np.float64), window, num_std)
+    df[f'BB_mid_{window}'] = mid
+    df[f'BB_upper_{window}'] = upper
+    df[f'BB_lower_{window}'] = lower
+    return df
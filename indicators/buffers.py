@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+def close_view(df):
+    """ Read-only float64 view of df["Close"], sharing memory with the frame when it is already float64
+
+    Args:
+        df (pd.DataFrame): stock data containing a 'Close' column
+
+    Returns:
+        close (np.ndarray): non-writeable 1-D array, kernels can read but never modify the frame through it
+    """
+    close = df["Close"].to_numpy(dtype=np.float64, copy=False).view()
+    close.flags.writeable = False
+    return close
+
+def output_block(out, shape):
+    """ Returns `out` reset to NaN (after checking its shape), or a new NaN block when out is None
+
+    Args:
+        out (np.ndarray or None): caller-provided float64 buffer to write results into
+        shape (tuple[int]): shape the kernel produces
+
+    Returns:
+        block (np.ndarray): NaN-filled float64 array of `shape`
+    """
+    if out is None:
+        return np.full(shape, np.nan)
+    if out.shape != tuple(shape) or out.dtype != np.float64:
+        raise ValueError(f"Output buffer must be float64 with shape {tuple(shape)}, got {out.dtype} {out.shape}")
+    out.fill(np.nan)
+    return out
+
+def attach_columns(df, columns):
+    """ New frame with the columns of df plus `columns`, without copying either
+
+    The base columns are shared with df and the new columns wrap the given arrays, so
+    writing into the result's existing columns in place also changes df. Columns that
+    already exist in df are replaced in the result (df itself is never modified).
+
+    Args:
+        df (pd.DataFrame): base frame
+        columns (dict[str, np.ndarray]): column name -> 1-D array of len(df)
+
+    Returns:
+        frame (pd.DataFrame): frame with df's index and columns followed by the new ones
+    """
+    data = {col: columns.get(col, values) for col, values in df.items()}
+    data.update((col, values) for col, values in columns.items() if col not in data)
+    return pd.DataFrame(data, index=df.index, copy=False)
+
+def datetime_dates(dates):
+    """ Dates as datetime values, converting int64 epoch nanoseconds (compact frames) to UTC datetimes
+
+    Args:
+        dates (pd.Series or array-like): 'Date' column of a frame
+
+    Returns:
+        dates (pd.Series or array-like): unchanged unless integer, then tz-aware (UTC) datetimes
+    """
+    if pd.api.types.is_integer_dtype(getattr(dates, "dtype", None)):
+        return pd.to_datetime(dates, utc=True)
+    return dates
@@ -0,0 +1,130 @@
+# indicators/cache.py
+"""
+Memoized indicator results.
+
+`apply_indicator` consults a process-wide `ResultCache` before computing. Entries
+are keyed by a fingerprint of the input *content* (not the DataFrame object), the
+indicator key and the merged parameters, so the same ticker/upload requested from
+another tab, timeframe switch or user is served without recomputation.
+
+The cache is bounded by the bytes of the stored output arrays and evicts the
+least recently used entries first.
+
+Typical usage example:
+----------------------
+    from indicators.registry import RESULT_CACHE
+
+    RESULT_CACHE.stats()   # {'hits': 3, 'misses': 1, 'evictions': 0, 'entries': 1, 'bytes': 8000, ...}
+    RESULT_CACHE.clear()
+"""
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# columns an indicator may read; dailyr also reports dates for trades/streaks
+FINGERPRINT_COLUMNS = ("Date", "Close")
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def fingerprint(df) -> str:
+    """
+    Hash the content of the columns indicators read from `df`.
+
+    Two frames with equal `'Date'` / `'Close'` values (and dtypes) share a
+    fingerprint regardless of object identity, index or other columns.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for col in FINGERPRINT_COLUMNS:
+        if col not in df.columns:
+            continue
+        series = df[col]
+        digest.update(f"{col}:{series.dtype}:{len(series)};".encode())
+        digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def make_key(df, key: str, merged_params: dict) -> tuple:
+    """ Cache key: (content fingerprint, indicator key, sorted merged params) """
+    return fingerprint(df), key, tuple(sorted(merged_params.items()))
+
+
+class ResultCache:
+    """
+    Thread-safe, byte-bounded LRU store of indicator outputs.
+
+    Each entry holds the indicator output columns as NumPy arrays plus any extra
+    return values (dailyr's streak info and max profit). Only array bytes count
+    towards `max_bytes`; a single entry larger than the bound is not stored.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, cache_key):
+        """ Returns (columns, extras) for `cache_key`, or None on a miss """
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            columns, extras, _ = entry
+        # extras are small dicts; hand out copies so callers cannot alter the cached entry
+        return columns, copy.deepcopy(extras)
+
+    def put(self, cache_key, columns: dict, extras=None):
+        """ Stores output columns (name -> array) and extras, evicting LRU entries as needed """
+        columns = {name: np.array(values, copy=True) for name, values in columns.items()}
+        for values in columns.values():
+            values.setflags(write=False)
+        size = sum(values.nbytes for values in columns.values())
+        if size > self.max_bytes:
+            return
+        extras = copy.deepcopy(extras)
+
+        with self._lock:
+            old = self._entries.pop(cache_key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[cache_key] = (columns, extras, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        """ Drops all entries and resets the counters """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """ Returns hit/miss/eviction counters and current usage """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,67 +1,291 @@
 import pandas as pd
 import numpy as np
+from .buffers import datetime_dates, output_block
+from .rolling import rolling_max_gain
 from .updown import calculate_updown
 
-def calculate_dailyr(df: pd.DataFrame, tolerance: int, threshold: float) -> pd.DataFrame:
+def forward_fill(values) -> np.ndarray:
+    """ `values` with every NaN replaced by the last valid value before it (leading NaNs stay) """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    if valid.all():
+        return values
+    last_valid = np.maximum.accumulate(np.where(valid, np.arange(values.size), 0))
+    return values[last_valid]
+
+
+def daily_returns(close, out=None) -> np.ndarray:
+    """
+    Percent change between consecutive closes, the same values as the original
+    ``Series.pct_change() * 100``: missing closes are forward-filled first (a gap reads
+    as a 0 % return, the move shows up on the next valid close), the first row and the
+    rows before the first valid close are NaN, as are divisions by a zero close.
+    Written into `out` (float64, same length as `close`) when given.
+    """
+    close = forward_fill(close)
+    returns = output_block(out, (close.size,))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = (close[1:] / close[:-1] - 1) * 100
+    returns[np.isinf(returns)] = np.nan
+    return returns
+
+
+def _running_argmax(values):
+    """ Running maximum of `values` and the (earliest) position it was reached at """
+    best = np.maximum.accumulate(values)
+    record = np.ones(values.size, dtype=bool)
+    record[1:] = values[1:] > best[:-1]
+    return best, np.maximum.accumulate(np.where(record, np.arange(values.size), 0))
+
+
+def _rising_runs(prices):
+    """ Start (valley) and end (peak) positions of every run of strictly rising prices """
+    edges = np.diff((prices[1:] > prices[:-1]).astype(np.int8), prepend=0, append=0)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _best_k_trades(prices, k):
+    """
+    Buy/sell positions of the most profitable set of at most `k` non-overlapping trades.
+
+    Layer j of the dynamic program holds, for every day, the best profit of at most j
+    trades closed by that day:
+
+        buy_j[t]  = max over s <= t of (sell_{j-1}[s - 1] - price[s])
+        sell_j[t] = max(sell_{j-1}[t], max over s <= t of (buy_j[s] + price[s]))
+
+    Both inner maxima are running maxima, so each layer is a couple of
+    ``np.maximum.accumulate`` calls and the whole search is O(n * k) array work with k
+    Python iterations. The argmax positions of every layer are kept to walk the optimal
+    trades back from the last day. Profit is concave in k, so the layers stop as soon
+    as one more trade no longer helps.
+    """
+    n = prices.size
+    sell_prev = np.zeros(n)
+    layers = []
+    for _ in range(k):
+        # buying at s uses the profit of the trades closed before s
+        buy_best, buy_at = _running_argmax(np.concatenate(([0.0], sell_prev[:-1])) - prices)
+        sell_best, sell_at = _running_argmax(buy_best + prices)
+        keep = sell_prev >= sell_best
+        sell = np.where(keep, sell_prev, sell_best)
+        if sell[-1] <= sell_prev[-1]:
+            break
+        layers.append((buy_at, sell_at, keep))
+        sell_prev = sell
+
+    pairs, t = [], n - 1
+    for buy_at, sell_at, keep in reversed(layers):
+        if t < 0:
+            break
+        if keep[t]:
+            continue
+        sell_index = sell_at[t]
+        buy_index = buy_at[sell_index]
+        if sell_index > buy_index:
+            pairs.append((buy_index, sell_index))
+        t = buy_index - 1
+    return pairs[::-1]
+
+
+def _trade_list(prices, dates, pairs) -> list:
+    """ Trade dicts for (buy, sell) position pairs in date order, with running totals """
+    trades, cumulative_diff, growth = [], 0.0, 1.0
+    for buy_index, sell_index in pairs:
+        buy_price, sell_price = float(prices[buy_index]), float(prices[sell_index])
+        price_diff = sell_price - buy_price
+        cumulative_diff += price_diff
+        growth *= sell_price / buy_price if buy_price > 0 else 1.0
+        trades.append({
+            "buy_index": int(buy_index),
+            "sell_index": int(sell_index),
+            "buy_date": dates[buy_index],
+            "sell_date": dates[sell_index],
+            "buy_price": buy_price,
+            "sell_price": sell_price,
+            "price_diff": price_diff,
+            "profit_pct": (price_diff / buy_price * 100) if buy_price > 0 else 0,
+            "cumulative_diff": cumulative_diff,
+            "cumulative_pct": (growth - 1) * 100,
+        })
+    return trades
+
+
+def max_profit_trades(prices, transactions=1, dates=None) -> list:
+    """
+    Find the most profitable set of at most `transactions` buy/sell trades (0 = unlimited).
+
+    Trades do not overlap: each one sells strictly before the next buy. Only valleys and
+    peaks of the price path can be optimal buy/sell points, so the search runs on the
+    alternating valley/peak sequence of the non-NaN prices. When `transactions` covers
+    every rising run (or is 0) the answer is simply every valley -> peak run, found in
+    O(n); otherwise `_best_k_trades` solves the O(n * k) dynamic program.
+
+    Returns
+    -------
+    list of dict
+        One dict per trade in date order with the keys of `calculate_max_profit`
+        (buy/sell index, date and price, price_diff, profit_pct) plus
+        - cumulative_diff : Summed price_diff of this and every earlier trade ($ per share)
+        - cumulative_pct  : Compounded return of this and every earlier trade (%)
     """
-    Calculate daily percentage returns and the maximum achievable profit window.
+    prices = np.asarray(prices, dtype=np.float64)
+    dates = np.arange(len(prices)) if dates is None else np.asarray(dates)
+    transactions = int(transactions)
+    if transactions < 0:
+        raise ValueError("Number of transactions must be >= 0 (0 = unlimited).")
+
+    valid = np.flatnonzero(~np.isnan(prices))
+    valleys, peaks = _rising_runs(prices[valid])
+    if transactions == 0 or transactions >= valleys.size:
+        pairs = zip(valleys, peaks)
+    else:
+        # valleys and peaks alternate, so the program only sees 2 points per rising run
+        points = np.column_stack((valleys, peaks)).ravel()
+        pairs = [(points[b], points[s]) for b, s in _best_k_trades(prices[valid][points], transactions)]
+    return _trade_list(prices, dates, [(valid[b], valid[s]) for b, s in pairs])
+
+
+def calculate_max_profit(prices, dates=None, transactions=1) -> dict:
+    """
+    Find the best single buy/sell pair (buy before sell) in O(n) without a Python loop.
+
+    The running minimum gives the cheapest buy seen so far at every point, so the
+    best sell is the argmax of ``price - running_min`` and the buy is the first
+    occurrence of the minimum before it. Ties resolve to the earliest dates.
+
+    With `transactions` other than 1 the best set of up to that many trades (0 = unlimited)
+    is searched as well, see `max_profit_trades`.
+
+    Returns
+    -------
+    dict
+        - buy_index / sell_index : Positions of the trade in `prices` (None if no data)
+        - buy_date / sell_date   : Matching entries of `dates` (NaT if no data)
+        - buy_price / sell_price : Prices at the buy and sell points
+        - price_diff             : Absolute profit in dollars ($)
+        - profit_pct             : Profit percentage relative to buy price (%)
+        - trades                 : Optimal trades for `transactions` (see `max_profit_trades`)
+        - total_diff             : Summed profit of the trades ($ per share)
+        - total_pct              : Compounded return of the trades (%)
+
+        With no profitable pair the buy and sell point are both the first entry.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    dates = np.arange(len(prices)) if dates is None else np.asarray(dates)
+
+    if len(prices) < 2:
+        raise ValueError("Not enough data to compute max profit.")
+
+    # NaN prices are skipped, as they never beat the running minimum nor produce a profit
+    running_min = np.fmin.accumulate(prices)
+    profits = np.nan_to_num(prices - running_min, nan=0.0)
+
+    sell_index = int(np.argmax(profits))
+    price_diff = float(profits[sell_index])
+    if price_diff > 0:
+        buy_index = int(np.nanargmin(prices[:sell_index]))
+    else:
+        buy_index = sell_index = 0
+        price_diff = 0.0
+
+    if transactions == 1:
+        trades = _trade_list(prices, dates, [(buy_index, sell_index)] if price_diff > 0 else [])
+    else:
+        trades = max_profit_trades(prices, transactions, dates)
+
+    buy_price = float(prices[buy_index])
+    sell_price = float(prices[sell_index])
+    return {
+        "buy_index": buy_index,
+        "sell_index": sell_index,
+        "buy_date": dates[buy_index],
+        "sell_date": dates[sell_index],
+        "buy_price": buy_price,
+        "sell_price": sell_price,
+        "price_diff": price_diff,
+        "profit_pct": (price_diff / buy_price * 100) if buy_price > 0 else 0,
+        "trades": trades,
+        "total_diff": trades[-1]["cumulative_diff"] if trades else 0.0,
+        "total_pct": trades[-1]["cumulative_pct"] if trades else 0.0,
+    }
+
+
+def best_trade_kernel(values, window=20, out=None) -> np.ndarray:
+    """
+    Best single-trade profit (%) achievable inside every trailing `window`-point window.
+
+    This is `calculate_max_profit`'s ``profit_pct`` restricted to each window, found for
+    all windows at once in O(n) by `rolling.rolling_max_gain`. Windows where prices only
+    fall give 0, the first window - 1 points and windows containing a NaN give NaN.
+    Written into `out` (float64, same length as `values`) when given.
+    """
+    window = int(window)
+    if window < 2:
+        raise ValueError("Window size must be at least 2")
+    profits = output_block(out, (len(values),))
+    profits[:] = (rolling_max_gain(values, window) - 1) * 100
+    return profits
+
+
+def calculate_best_trade(df: pd.DataFrame, window: int = 20):
+    """
+    Calculate the best achievable buy/sell profit inside every trailing window.
+
+    Adds the following columns:
+    ----------------------------
+    - BestTrade_<window> : Best trade profit within the last `window` rows in percent (%)
+    """
+    if "Close" not in df.columns:
+        raise ValueError("DataFrame must contain a 'Close' column.")
+    if window < 2:
+        raise ValueError("Window size must be at least 2")
+    if len(df) < window:
+        raise IndexError(f"Insufficient data, only {len(df)} points selected for window size of {window}")
+
+    window = int(window)
+    df[f"BestTrade_{window}"] = best_trade_kernel(df["Close"].to_numpy(dtype=np.float64), window)
+    return df
+
+
+def calculate_dailyr(df: pd.DataFrame, tolerance: int, threshold: float, transactions: int = 1):
+    """
+    Calculate daily percentage returns and the maximum achievable profit window(s).
+
+    `transactions` caps the number of trades in ``max_profit["trades"]`` (0 = unlimited).
 
     Adds the following columns:
     ----------------------------
     - DailyR          : Daily return in percent (%)
-    - Buy_Date        : Optimal buy date for max profit
-    - Sell_Date       : Optimal sell date for max profit
-    - Buy_Price       : Buy price at Buy_Date
-    - Sell_Price      : Sell price at Sell_Date
-    - Price_Diff      : Absolute profit in dollars ($)
-    - Max_Profit_Pct  : Profit percentage relative to buy price (%)
+
+    Returns
+    -------
+    tuple
+        (df, streak_info, max_profit) where `streak_info` is the output of
+        `calculate_updown` and `max_profit` the dict from `calculate_max_profit`.
     """
 
     if "Close" not in df.columns:
         raise ValueError("DataFrame must contain a 'Close' column.")
 
-    df = df.copy()
-    df["DailyR"] = df["Close"].pct_change() * 100
-    df["DailyR"] = df["DailyR"].replace([np.inf, -np.inf], np.nan)
+    df["DailyR"] = daily_returns(df["Close"].values)
 
-    pct_changes_with_dates = df.set_index('Date')['DailyR']
+    # compact frames keep dates as int64 epoch nanoseconds
+    dates = datetime_dates(df["Date"])
+    pct_changes_with_dates = pd.Series(df["DailyR"].to_numpy(), index=pd.Index(dates))
     streak_info = calculate_updown(pct_changes_with_dates, tolerance=tolerance, threshold=threshold)
 
-    # --- Max Profit (single trade) ---
+    # --- Max Profit (best single trade and best `transactions` trades) ---
     try:
-        prices = df["Close"].values
-        dates = df["Date"].values
-
-        if len(prices) < 2:
-            raise ValueError("Not enough data to compute max profit.")
-
-        min_price = prices[0]
-        min_date = dates[0]
-        max_profit = 0
-        buy_date = sell_date = min_date
-        buy_price = sell_price = min_price
-
-        for i in range(1, len(prices)):
-            profit = prices[i] - min_price
-            if profit > max_profit:
-                max_profit = profit
-                buy_date = min_date
-                sell_date = dates[i]
-                buy_price = min_price
-                sell_price = prices[i]
-            if prices[i] < min_price:
-                min_price = prices[i]
-                min_date = dates[i]
-
-        max_profit_pct = (max_profit / buy_price * 100) if buy_price > 0 else 0
-        info_variables = [buy_date, sell_date, buy_price, sell_price, max_profit, max_profit_pct]
-        df['Info'] = info_variables + [np.nan] * (len(df) - len(info_variables))
-
+        max_profit = calculate_max_profit(df["Close"].values, dates, transactions)
     except Exception as e:
         print('Dailyr exception:', e)
-        info_variables = [pd.NaT, pd.NaT, None, None, 0, 0]
-        df['Info'] = info_variables + [np.nan] * (len(df) - len(info_variables))
-
+        max_profit = {
+            "buy_index": None, "sell_index": None,
+            "buy_date": pd.NaT, "sell_date": pd.NaT,
+            "buy_price": None, "sell_price": None,
+            "price_diff": 0, "profit_pct": 0,
+            "trades": [], "total_diff": 0.0, "total_pct": 0.0,
+        }
 
-    df.to_csv('check2.csv')
-    return df, streak_info
\ No newline at end of file
+    return df, streak_info, max_profit
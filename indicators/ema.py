@@ -1,6 +1,77 @@
 import pandas as pd
 import numpy as np
 
+from .buffers import output_block
+from .filters import exponential_smooth
+
+def first_valid_index(values):
+    """ Returns the position of the first non-NaN entry of a 1-D array (len(values) if none) """
+    valid = np.flatnonzero(~np.isnan(values))
+    return int(valid[0]) if valid.size else values.size
+
+def nan_mean(values, axis=-1):
+    """ Mean that skips NaNs like pandas' Series.mean(), NaN where every value is NaN """
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    counts = np.count_nonzero(~missing, axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(missing, 0.0, values).sum(axis=axis) / counts
+
+def ema_into(values, start, interval, smoothing, out):
+    """ Writes one SMA-seeded EMA into a preallocated NaN row
+
+    Args:
+        values (np.ndarray): 1-D float inputs
+        start (int): where the seed window starts, the seed is the NaN-skipping mean of
+            values[start:start + interval]
+        interval (int): EMA interval
+        smoothing (float): smoothing factor
+        out (np.ndarray): NaN-filled row of the same length as values, left untouched when
+            there are fewer than `interval` valid inputs
+    """
+    seed_end = start + interval
+    if seed_end > values.size:
+        return
+    # weight -> % of ema represented by the most recent entry
+    weight = smoothing / (interval + 1)
+    seed = nan_mean(values[start:seed_end])
+    out[seed_end - 1] = seed
+    out[seed_end:] = exponential_smooth(values[seed_end:], weight, seed)
+
+def ema_kernel(values, intervals, smoothings = 2.0, out = None):
+    """ Computes exponential moving averages for several interval/smoothing pairs in one call
+
+    Each EMA is seeded at row interval - 1 with the mean of the first `interval` points,
+    skipping NaNs (as pandas' mean did in the original loop), and then follows the
+    recursive filter, so a NaN after the seed carries through the rest of the row. A seed
+    window holding only NaNs gives an all-NaN row.
+
+    Args:
+        values (array-like): 1-D close prices
+        intervals (int or list[int]): one or more EMA intervals
+        smoothings (float or list[float]): smoothing factor per interval, defaults to 2.0
+        out (np.ndarray): preallocated float64 (len(intervals), len(values)) buffer to write into
+
+    Returns:
+        block (np.ndarray): float array of shape (len(intervals), len(values)), row i holds the
+            EMA for intervals[i] with NaN before its seed (rows that cannot be seeded are all NaN)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    intervals = [int(i) for i in np.atleast_1d(intervals)]
+    smoothings = np.broadcast_to(np.asarray(smoothings, dtype=np.float64), (len(intervals),))
+    if any(i < 1 for i in intervals):
+        raise ValueError("Interval size must be at least 1")
+    if np.any(smoothings <= 0):
+        raise ValueError("Smoothing factor must be positive")
+
+    n = values.size
+    block = output_block(out, (len(intervals), n))
+
+    for row, (interval, smoothing) in enumerate(zip(intervals, smoothings)):
+        ema_into(values, 0, interval, smoothing, block[row])
+
+    return block
+
 def calculate_ema(df, interval = 10, smoothing = 2.0, for_macd = False):
     """ Calculates a weighted moving average of closing prices that gives more importance to recent prices
 
@@ -11,17 +82,17 @@ def calculate_ema(df, interval = 10, smoothing = 2.0, for_macd = False):
         interval (int): amount of preceding data points to use in calculating EMA, defaults to 10
         smoothing (float): strength of weightage for recent data points, defaults to 2.0
         ticker_dict (dict: str[df]): dictionary, with key-value pairs of ticker to dataframe containing stock history, defaults to ticker_dict
-    
+
     Returns:
-        rolling_ema (list[np.float]): list of floats representing weighted average of close prices
+        rolling_ema (np.ndarray): floats representing weighted average of close prices (when for_macd)
         or
-        rolling_ema (list[np.nan, np.float]): list of floats representing weighted average of close prices
+        df (pd.DataFrame): input frame with an added EMA_<interval> column
     """
     # MACD function passes in data only, no df
     if for_macd:
         data = df
     else:
-        data = df["Close"].copy()
+        data = df["Close"]
 
     # validating invalid inputs
     if smoothing <= 0:
@@ -30,27 +101,15 @@ def calculate_ema(df, interval = 10, smoothing = 2.0, for_macd = False):
         raise ValueError("Interval size must be at least 1")
     if data.size < interval:
         raise IndexError(f'Insufficient data, only {data.size} points selected for interval size of {interval}')
-    
+
     # handles float inputs
     interval = int(interval)
 
-    # weight -> % of ema represented by the most recent entry
-    # weighting more recent entries is greater for shorter intervals
-    weight = smoothing / (interval + 1)     
-
-    # using sma as an initial state, afterwards we can implement EMA
-    sma = data.iloc[:interval].mean()    
-    # check if need to use interval or interval-1
-    rolling_ema = [np.nan] * (interval-1) + [sma]
-
-    # calculate following EMA values
-    for i in range(interval, data.size):
-        ema = data.iloc[i] * weight + rolling_ema[-1] * (1 - weight)
-        rolling_ema.append(ema)
+    rolling_ema = ema_kernel(np.asarray(data, dtype=np.float64), interval, smoothing)[0]
 
     # MACD function has no need for whole df
     if for_macd:
         return rolling_ema
 
     df[f'EMA_{interval}'] = rolling_ema
-    return df
\ No newline at end of file
+    return df
@@ -0,0 +1,315 @@
+# indicators/expr.py
+"""
+Lazy indicator expressions over the registry.
+
+Expressions only describe a computation; nothing runs until `collect`. A plan
+built from any number of expressions
+
+1. de-duplicates common subexpressions (structurally equal nodes become one,
+   so ``rsi(14)`` used by ten conditions is a single node),
+2. computes every distinct indicator once through the registry's shared DAG
+   (`SharedInputs.evaluate`), so e.g. all SMA windows share one batch kernel call
+   and an EMA doubles as a MACD leg,
+3. runs the elementwise steps as NumPy ufuncs writing into the buffer of an
+   input that is not needed any more, so a chain like ``(a - b) / b * 100``
+   allocates a single intermediate array.
+
+Indicators are computed from the frame's ``'Close'`` column. Positional
+arguments follow the order of the indicator's default parameters, and
+multi-column indicators pick their output with `output` (default: first column).
+
+Typical usage example:
+----------------------
+    from indicators.expr import close, collect, rsi
+
+    golden = close().sma(20).cross(close().ema(50))
+    screen = collect(df, {"golden": golden, "overbought": rsi(14) > 70,
+                          "stretched": (close() / close().sma(20) - 1) * 100})
+"""
+import numpy as np
+import pandas as pd
+
+from .registry import INDICATORS, SharedInputs, _validate_params, get_indicator_spec, merge_params
+
+# elementwise operators: node op -> (ufunc, number of array arguments)
+UFUNCS = {
+    "add": (np.add, 2), "sub": (np.subtract, 2), "mul": (np.multiply, 2), "div": (np.true_divide, 2),
+    "neg": (np.negative, 1), "abs": (np.absolute, 1),
+    "gt": (np.greater, 2), "ge": (np.greater_equal, 2), "lt": (np.less, 2), "le": (np.less_equal, 2),
+    "eq": (np.equal, 2), "ne": (np.not_equal, 2),
+    "and": (np.logical_and, 2), "or": (np.logical_or, 2), "not": (np.logical_not, 1),
+}
+
+
+def _wrap(value):
+    return value if isinstance(value, Expr) else Expr("literal", attrs=(("value", value),))
+
+
+class Expr:
+    """
+    Node of a lazy expression.
+
+    `op` is ``"column"``, ``"indicator"``, ``"literal"``, ``"shift"`` or one of the
+    elementwise `UFUNCS`; `args` are input expressions and `attrs` a tuple of
+    ``(name, value)`` settings. `key` identifies the node structurally.
+    """
+
+    __slots__ = ("op", "args", "attrs", "key")
+
+    def __init__(self, op, args=(), attrs=()):
+        self.op = op
+        self.args = tuple(args)
+        self.attrs = tuple(attrs)
+        self.key = (op, tuple(arg.key for arg in self.args), self.attrs)
+
+    def __repr__(self):
+        attrs = dict(self.attrs)
+        if self.op == "column":
+            return f"col({attrs['name']!r})"
+        if self.op == "literal":
+            return repr(attrs["value"])
+        if self.op == "indicator":
+            return attrs["column"]
+        args = ", ".join(map(repr, self.args))
+        extra = "".join(f", {name}={value!r}" for name, value in self.attrs)
+        return f"{self.op}({args}{extra})"
+
+    def __bool__(self):
+        raise TypeError("Expressions have no truth value, combine conditions with & | ~ instead of and/or/not")
+
+    def _binary(self, op, other, reverse=False):
+        args = (_wrap(other), self) if reverse else (self, _wrap(other))
+        return Expr(op, args)
+
+    __add__ = lambda self, other: self._binary("add", other)
+    __radd__ = lambda self, other: self._binary("add", other, reverse=True)
+    __sub__ = lambda self, other: self._binary("sub", other)
+    __rsub__ = lambda self, other: self._binary("sub", other, reverse=True)
+    __mul__ = lambda self, other: self._binary("mul", other)
+    __rmul__ = lambda self, other: self._binary("mul", other, reverse=True)
+    __truediv__ = lambda self, other: self._binary("div", other)
+    __rtruediv__ = lambda self, other: self._binary("div", other, reverse=True)
+    __gt__ = lambda self, other: self._binary("gt", other)
+    __ge__ = lambda self, other: self._binary("ge", other)
+    __lt__ = lambda self, other: self._binary("lt", other)
+    __le__ = lambda self, other: self._binary("le", other)
+    __eq__ = lambda self, other: self._binary("eq", other)
+    __ne__ = lambda self, other: self._binary("ne", other)
+    __and__ = lambda self, other: self._binary("and", other)
+    __rand__ = lambda self, other: self._binary("and", other, reverse=True)
+    __or__ = lambda self, other: self._binary("or", other)
+    __ror__ = lambda self, other: self._binary("or", other, reverse=True)
+    __neg__ = lambda self: Expr("neg", (self,))
+    __abs__ = lambda self: Expr("abs", (self,))
+    __invert__ = lambda self: Expr("not", (self,))
+    __hash__ = None
+
+    def shift(self, periods=1):
+        """Values `periods` rows earlier (NaN, or False for conditions, where there are none)."""
+        return Expr("shift", (self,), (("periods", int(periods)),))
+
+    def cross(self, other):
+        """True on the rows where this series moves from at or below `other` to above it."""
+        other = _wrap(other)
+        return (self > other) & (self.shift() <= other.shift())
+
+    def cross_below(self, other):
+        """True on the rows where this series moves from at or above `other` to below it."""
+        other = _wrap(other)
+        return (self < other) & (self.shift() >= other.shift())
+
+    def __getattr__(self, name):
+        # close().sma(20), close().rsi(14), ... for every registry indicator
+        if name in INDICATORS:
+            if self.key != close().key:
+                raise ValueError(f"Indicators are computed from the close, not from {self!r}")
+            return lambda *args, **params: indicator(name, *args, **params)
+        raise AttributeError(name)
+
+    def collect(self, df) -> pd.Series:
+        """Evaluate this expression on `df`."""
+        return Plan({"result": self}).collect(df)["result"]
+
+
+def col(name: str) -> Expr:
+    """A column of the frame, e.g. ``col("Volume")``."""
+    return Expr("column", attrs=(("name", name),))
+
+
+def close() -> Expr:
+    """The ``'Close'`` column."""
+    return col("Close")
+
+
+def indicator(key: str, *args, output=None, **params) -> Expr:
+    """
+    A registry indicator output, e.g. ``indicator("macd", 12, 26, 9, output="MACD_hist")``.
+
+    Parameters are validated (and completed with the defaults) right away, so equal
+    requests written differently (``sma(20)`` / ``sma(window=20)`` / ``sma(20.0)``) are
+    the same node.
+    """
+    spec = get_indicator_spec(key)
+    if spec is None:
+        raise ValueError(f"Unknown indicator: {key}")
+    names = list(spec["default_params"])
+    if len(args) > len(names):
+        raise TypeError(f"{key} takes at most {len(names)} positional parameters ({', '.join(names)})")
+    merged = merge_params(key, {**dict(zip(names, args)), **params})
+    _validate_params(key, merged)
+
+    columns = spec["columns"](merged)
+    column = columns[0] if output is None else output
+    if column not in columns:
+        raise ValueError(f"Unknown output {column!r} for {key}, expected one of {', '.join(columns)}")
+    return Expr("indicator", attrs=(("name", key), ("params", tuple(sorted(merged.items()))), ("column", column)))
+
+
+def __getattr__(name):
+    # sma(20), rsi(14), macd(output="MACD_hist"), ... for every registry indicator
+    if name in INDICATORS:
+        return lambda *args, **params: indicator(name, *args, **params)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class Plan:
+    """
+    Evaluation plan for a set of named expressions, reusable across frames.
+
+    `nodes` lists the distinct nodes in evaluation order (inputs first).
+    """
+
+    def __init__(self, exprs):
+        if not isinstance(exprs, dict):
+            exprs = {f"expr_{i}": expr for i, expr in enumerate(exprs)}
+        self.outputs = {name: _wrap(expr).key for name, expr in exprs.items()}
+
+        # common subexpressions collapse onto one node through the structural key
+        self.nodes = {}
+        for expr in exprs.values():
+            self._add(_wrap(expr))
+
+        # remaining readers per node, outputs count as a reader that never finishes
+        self.uses = dict.fromkeys(self.nodes, 0)
+        for node in self.nodes.values():
+            for arg in node.args:
+                self.uses[arg.key] += 1
+        for key in self.outputs.values():
+            self.uses[key] += 1
+
+    def _add(self, expr):
+        if expr.key in self.nodes:
+            return
+        for arg in expr.args:
+            self._add(arg)
+        self.nodes[expr.key] = expr
+
+    @property
+    def requests(self) -> list:
+        """Distinct ``(key, params)`` indicator requests of the plan."""
+        requests = {}
+        for node in self.nodes.values():
+            if node.op == "indicator":
+                attrs = dict(node.attrs)
+                requests[(attrs["name"], attrs["params"])] = (attrs["name"], dict(attrs["params"]))
+        return list(requests.values())
+
+    def explain(self) -> str:
+        """One line per step, in evaluation order."""
+        return "\n".join(f"{i}: {node!r}" for i, node in enumerate(self.nodes.values()))
+
+    def collect(self, df) -> pd.DataFrame:
+        """Evaluate every expression on `df`, returning one column per expression."""
+        dates = df["Date"] if "Date" in df.columns else df.index.to_series()
+        shared = SharedInputs(df["Close"].to_numpy(dtype=np.float64), dates)
+        requests = self.requests
+        computed = {}
+        for (key, params), value in zip(requests, shared.evaluate(requests)):
+            if isinstance(value, Exception):
+                raise ValueError(f"{key} failed: {value}") from value
+            computed[(key, tuple(sorted(params.items())))] = value[0]
+
+        values, owned = {}, set()
+        remaining = dict(self.uses)
+        for key, node in self.nodes.items():
+            attrs = dict(node.attrs)
+            if node.op == "column":
+                values[key] = df[attrs["name"]].to_numpy()
+            elif node.op == "literal":
+                values[key] = attrs["value"]
+            elif node.op == "indicator":
+                values[key] = computed[(attrs["name"], attrs["params"])][attrs["column"]]
+            elif node.op == "shift":
+                values[key] = _shift(values[node.args[0].key], attrs["periods"])
+                owned.add(key)
+            else:
+                ufunc, _ = UFUNCS[node.op]
+                inputs = [values[arg.key] for arg in node.args]
+                out = self._reusable(node, inputs, owned, remaining)
+                values[key] = ufunc(*inputs) if out is None else ufunc(*inputs, out=out)
+                owned.add(key)
+
+            for arg in node.args:
+                remaining[arg.key] -= 1
+                if not remaining[arg.key]:
+                    values.pop(arg.key)
+
+        return pd.DataFrame({name: values[key] for name, key in self.outputs.items()}, index=df.index)
+
+    def _reusable(self, node, inputs, owned, remaining):
+        """
+        Buffer of an input this step is the last reader of, to write the step's result into.
+
+        Only intermediates created by the plan qualify (never frame columns or indicator
+        outputs), and only when the result has the same shape and dtype.
+        """
+        with np.errstate(all="ignore"):
+            result_type = np.result_type(*[np.asarray(v).dtype if np.ndim(v) else v for v in inputs])
+        if node.op in ("gt", "ge", "lt", "le", "eq", "ne", "and", "or", "not"):
+            result_type = np.dtype(bool)
+        elif node.op == "div":
+            result_type = np.result_type(result_type, np.float64)
+        for arg, value in zip(node.args, inputs):
+            if (arg.key in owned and remaining[arg.key] == 1 and isinstance(value, np.ndarray)
+                    and value.dtype == result_type
+                    and value.shape == np.broadcast_shapes(*[np.shape(v) for v in inputs])):
+                return value
+        return None
+
+
+def _shift(values, periods):
+    values = np.asarray(values)
+    fill = False if values.dtype == bool else np.nan
+    out = np.full(values.shape, fill, dtype=values.dtype if values.dtype == bool else np.float64)
+    if abs(periods) >= values.size:
+        # shifted past the end, nothing of the input is left
+        return out
+    if periods >= 0:
+        out[periods:] = values[:values.size - periods]
+    else:
+        out[:periods] = values[-periods:]
+    return out
+
+
+def collect(df, exprs) -> pd.DataFrame:
+    """
+    Evaluate several expressions on `df` in one plan.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Price history with a ``'Close'`` column (plus any column used through `col`).
+    exprs : dict or list of Expr
+        Named expressions (a list gets the names ``expr_0``, ``expr_1``, ...).
+
+    Returns
+    -------
+    pandas.DataFrame
+        One column per expression, indexed like `df`.
+
+    Raises
+    ------
+    ValueError
+        If an indicator cannot be computed (e.g. too few rows).
+    """
+    return Plan(exprs).collect(df)
@@ -0,0 +1,34 @@
+import numpy as np
+from scipy.signal import lfilter
+
+from . import backends
+
+def exponential_smooth(values, alpha, seed):
+    """ Runs the first-order recursive filter shared by EMA and Wilder smoothing
+
+    Computes ``y[t] = alpha * x[t] + (1 - alpha) * y[t - 1]`` with ``y[-1] = seed`` as a
+    compiled linear filter (scipy's ``lfilter``), so no Python work is done per element.
+    With the ``"numba"`` kernel backend the recursion runs as a compiled loop instead
+    (see `backends.smooth_rows`).
+
+    Args:
+        values (np.ndarray): inputs to smooth, filtered along the last axis
+        alpha (float): weight of the newest input, between 0 and 1
+        seed (float or np.ndarray): state before the first input, one per row for 2-D inputs
+
+    Returns:
+        smoothed (np.ndarray): float array with the same shape as values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if backends.get_backend() == "numba":
+        rows = np.ascontiguousarray(values.reshape(-1, values.shape[-1]))
+        seeds = np.broadcast_to(np.asarray(seed, dtype=np.float64), values.shape[:-1]).reshape(-1)
+        smoothed = np.empty_like(rows)
+        backends.smooth_rows(rows, float(alpha), np.ascontiguousarray(seeds), smoothed)
+        return smoothed.reshape(values.shape)
+
+    decay = 1.0 - alpha
+    # lfilter takes the initial state as the contribution of y[-1] to y[0]
+    state = decay * np.asarray(seed, dtype=np.float64)[..., np.newaxis]
+    smoothed, _ = lfilter([alpha], [1.0, -decay], values, axis=-1, zi=state)
+    return smoothed
@@ -1,24 +1,65 @@
 import pandas as pd
 import numpy as np
 
-from .ema import calculate_ema
+from .buffers import output_block
+from .ema import ema_into, first_valid_index
+
+# row order of the block returned by macd_kernel
+MACD_ROWS = ("ema_fast", "ema_slow", "macd", "signal", "hist")
+
+def macd_kernel(values, fast_period = 12, slow_period = 26, signal_period = 9, emas = None, out = None):
+    """ Computes every MACD stage into one preallocated (5, n) float block
+
+    The fast EMA, slow EMA, MACD line, signal line and histogram are written straight into
+    the rows of a single contiguous array (see MACD_ROWS), so no lists or Series are
+    created along the way.
+
+    The EMAs are seeded like `ema_kernel` (NaN-skipping mean of the first `interval`
+    closes), the signal line with the mean of the first `signal_period` MACD values
+    counted from the first valid one.
+
+    Args:
+        values (array-like): 1-D close prices
+        fast_period (int): fast EMA interval, defaults to 12
+        slow_period (int): slow EMA interval, defaults to 26
+        signal_period (int): EMA interval applied to the MACD line, defaults to 9
+        emas (tuple[np.ndarray, np.ndarray]): already computed (fast, slow) EMA rows to copy in
+            instead of recomputing them, e.g. from ema_kernel
+        out (np.ndarray): preallocated float64 (5, len(values)) buffer to write into
+
+    Returns:
+        block (np.ndarray): float array of shape (5, len(values)), NaN before each stage is seeded
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    block = output_block(out, (len(MACD_ROWS), values.size))
+    ema_fast, ema_slow, macd_line, signal_line, histogram = block
+
+    if emas is None:
+        ema_into(values, 0, fast_period, 2.0, ema_fast)
+        ema_into(values, 0, slow_period, 2.0, ema_slow)
+    else:
+        ema_fast[:], ema_slow[:] = emas
+    np.subtract(ema_fast, ema_slow, out=macd_line)
+
+    # signal is seeded from the first valid MACD value, i.e. once both EMAs exist
+    ema_into(macd_line, first_valid_index(macd_line), signal_period, 2.0, signal_line)
+    np.subtract(macd_line, signal_line, out=histogram)
+    return block
 
 def calculate_macd(df, fast_period = 12, slow_period = 26, signal_period = 9):
     """ A technical indicator used for identifying points for buying and selling
 
     Args:
-        data ()
-        fast_period (int) = 
-        slow_period (int) = 
-        signal_period (int) = 
-    
+        df (pd.DataFrame): stock data containing a 'Close' column
+        fast_period (int): fast EMA interval, defaults to 12
+        slow_period (int): slow EMA interval, defaults to 26
+        signal_period (int): EMA interval applied to the MACD line, defaults to 9
+
     Returns:
-        rolling_ema (list[np.float]): list of floats representing weighted average of close prices
-        or
-        rolling_ema (list[np.nan, np.float]): list of floats representing weighted average of close prices
+        df (pd.DataFrame): input frame with added MACD, MACD_signal and MACD_hist columns
     """
 
-    data = df["Close"].copy()
+    data = df["Close"]
 
     if fast_period >= slow_period:
         raise ValueError("Fast period must be less than slow period")
@@ -32,25 +73,14 @@ def calculate_macd(df, fast_period = 12, slow_period = 26, signal_period = 9):
     slow_period = int(slow_period)
     signal_period = int(signal_period)
 
-    # Calculate EMAs for fast and slow periods
-    ema_fast = calculate_ema(data, interval = fast_period, for_macd = True)
-    ema_slow = calculate_ema(data, interval = slow_period, for_macd = True)
-    
-    macd_line = pd.Series(ema_fast) - pd.Series(ema_slow)   # convert to pd.Series for operating across the list
+    block = macd_kernel(data.to_numpy(dtype=np.float64), fast_period, slow_period, signal_period)
+    _, _, macd_line, signal_line, histogram = block
 
     # finding where MACD line starts (ignoring NaN values)
-    first_non_nan = macd_line.first_valid_index()
-    if first_non_nan is None:
+    if np.isnan(macd_line).all():
         raise ValueError("MACD line error")
 
-    # Calculate signal_line
-    signal_line_vals = calculate_ema(macd_line[first_non_nan:], signal_period, for_macd = True)
-    signal_line = [np.nan] * first_non_nan + signal_line_vals
-    histogram = macd_line - signal_line
-
-    # print('My macd:', macd_line, 'My Signal:', signal_line, 'My histogram:', histogram)
-
     df['MACD'] = macd_line
     df['MACD_signal'] = signal_line
     df['MACD_hist'] = histogram
-    return df
\ No newline at end of file
+    return df
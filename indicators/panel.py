@@ -0,0 +1,230 @@
+# indicators/panel.py
+"""
+Axis-aware indicator kernels for aligned multi-ticker close matrices.
+
+A panel is a 2-D array of closes with one axis for dates and one for tickers,
+as built by `data.preprocess.close_matrix` from the output of `align_dfs`.
+Every kernel takes an `axis` argument naming the date axis (0 for the usual
+``dates × tickers`` layout) and computes all tickers at once: the recurrences
+run on whole rows of tickers instead of one Python call per symbol.
+
+The results match the single-series kernels (`sma_kernel`, `ema_kernel`,
+`rsi_kernel`, `macd_kernel`, `daily_returns`, `bollinger_kernel`,
+`volatility_kernel`, `zscore_kernel`) column by column.
+
+Typical usage example:
+----------------------
+    from indicators.panel import sma_panel
+
+    sma_20 = sma_panel(close.to_numpy(), 20)   # same shape as close
+"""
+import numpy as np
+
+from .filters import exponential_smooth
+from .rolling import rolling_max_gain, rolling_moments
+from .rsi import rsi_from_averages, split_gains_losses, wilder_averages
+
+
+def _to_rows(values, axis):
+    """ Moves the date axis last so each ticker is one contiguous row """
+    return np.ascontiguousarray(np.moveaxis(np.asarray(values, dtype=np.float64), axis, -1))
+
+
+def _from_rows(rows, axis):
+    return np.moveaxis(rows, -1, axis)
+
+
+def first_valid_indices(rows):
+    """ Position of the first non-NaN entry in every row (row length if none) """
+    valid = ~np.isnan(rows)
+    return np.where(valid.any(axis=-1), valid.argmax(axis=-1), rows.shape[-1])
+
+
+def _ema_rows(rows, starts, interval, smoothing, out):
+    """ SMA-seeded EMA for every row, seeding row r at starts[r]
+
+    Rows sharing a start are seeded and filtered together in one 2-D call. Rows with
+    fewer than `interval` valid points after their start keep the NaNs in `out`.
+    """
+    n = rows.shape[-1]
+    weight = smoothing / (interval + 1)
+    for start in np.unique(starts):
+        seed_end = int(start) + interval
+        if seed_end > n:
+            continue
+        group = np.flatnonzero(starts == start)
+        seeds = rows[group, start:seed_end].mean(axis=-1)
+        out[group, seed_end - 1] = seeds
+        out[group, seed_end:] = exponential_smooth(rows[group, seed_end:], weight, seeds)
+
+
+def _by_start(rows, kernel):
+    """ Applies `kernel` to the valid tail of each group of rows sharing a first valid date
+
+    Tickers listed later than others start with NaNs; each group is computed from its
+    own first valid date, as the single-series kernels would on the trimmed series.
+    """
+    out = np.full_like(rows, np.nan)
+    starts = first_valid_indices(rows)
+    for start in np.unique(starts):
+        if start == rows.shape[-1]:
+            continue
+        group = np.flatnonzero(starts == start)
+        out[group, start:] = kernel(rows[group, start:])
+    return out
+
+
+def _moments_by_start(rows, starts, window, ddof=0):
+    """ Rolling (mean, var) of every row, computed from each row's own first valid date
+
+    Grouping by start keeps the re-anchoring of `rolling_moments` at the same positions
+    as on the trimmed single series, so panel and per-ticker results agree exactly.
+    """
+    mean, var = np.full_like(rows, np.nan), np.full_like(rows, np.nan)
+    for start in np.unique(starts):
+        if start == rows.shape[-1]:
+            continue
+        group = np.flatnonzero(starts == start)
+        mean[group, start:], var[group, start:] = rolling_moments(rows[group, start:], window, ddof)
+    return mean, var
+
+
+def _sma_rows(rows, window):
+    out = np.full_like(rows, np.nan)
+    if window <= rows.shape[-1]:
+        # first window sum, followed by (new point - dropped point) for every later step
+        sums = out[:, window - 1:]
+        sums[:, 0] = rows[:, :window].sum(axis=-1)
+        np.subtract(rows[:, window:], rows[:, :-window], out=sums[:, 1:])
+        np.cumsum(sums, axis=-1, out=sums)
+        sums /= window
+    return out
+
+
+def _rsi_rows(rows, interval):
+    out = np.full_like(rows, np.nan)
+    if interval < rows.shape[-1]:
+        gains, losses = split_gains_losses(np.diff(rows, axis=-1))
+        avg_gain, avg_loss = wilder_averages(gains, losses, interval)
+        out[:, interval:] = rsi_from_averages(avg_gain, avg_loss)
+    return out
+
+
+def sma_panel(values, window, axis=0):
+    """ Simple moving average of every ticker, NaN for the first window - 1 valid dates """
+    window = int(window)
+    if window < 1:
+        raise ValueError("Window size must be at least 1")
+    shaped = _to_rows(values, axis)
+    out = _by_start(shaped.reshape(-1, shaped.shape[-1]), lambda rows: _sma_rows(rows, window))
+    return _from_rows(out.reshape(shaped.shape), axis)
+
+
+def ema_panel(values, interval, smoothing=2.0, axis=0):
+    """ SMA-seeded EMA of every ticker, each seeded at its own first valid date """
+    interval = int(interval)
+    if interval < 1:
+        raise ValueError("Interval size must be at least 1")
+    if smoothing <= 0:
+        raise ValueError("Smoothing factor must be positive")
+    shaped = _to_rows(values, axis)
+    rows = shaped.reshape(-1, shaped.shape[-1])
+    out = np.full_like(rows, np.nan)
+    _ema_rows(rows, first_valid_indices(rows), interval, smoothing, out)
+    return _from_rows(out.reshape(shaped.shape), axis)
+
+
+def rsi_panel(values, interval, axis=0):
+    """ Wilder RSI of every ticker, NaN for the first `interval` valid dates """
+    interval = int(interval)
+    if interval < 1:
+        raise ValueError("Window size must be at least 1")
+    shaped = _to_rows(values, axis)
+    out = _by_start(shaped.reshape(-1, shaped.shape[-1]), lambda rows: _rsi_rows(rows, interval))
+    return _from_rows(out.reshape(shaped.shape), axis)
+
+
+def macd_panel(values, fast_period=12, slow_period=26, signal_period=9, axis=0):
+    """ MACD line, signal line and histogram of every ticker
+
+    Returns:
+        (macd_line, signal_line, histogram) (tuple[np.ndarray]): each shaped like `values`
+    """
+    shaped = _to_rows(values, axis)
+    rows = shaped.reshape(-1, shaped.shape[-1])
+    ema_fast, ema_slow, signal_line = (np.full_like(rows, np.nan) for _ in range(3))
+
+    starts = first_valid_indices(rows)
+    _ema_rows(rows, starts, fast_period, 2.0, ema_fast)
+    _ema_rows(rows, starts, slow_period, 2.0, ema_slow)
+    macd_line = ema_fast - ema_slow
+    # signal is seeded from the first valid MACD value, i.e. once both EMAs exist
+    _ema_rows(macd_line, starts + max(fast_period, slow_period) - 1, signal_period, 2.0, signal_line)
+    histogram = macd_line - signal_line
+    return tuple(_from_rows(block.reshape(shaped.shape), axis) for block in (macd_line, signal_line, histogram))
+
+
+def daily_returns_panel(values, axis=0):
+    """ Percent change between consecutive dates of every ticker, NaN for the first date
+
+    Missing closes are forward-filled within each ticker first, as in `daily_returns`.
+    """
+    shaped = _to_rows(values, axis)
+    valid = ~np.isnan(shaped)
+    if not valid.all():
+        last_valid = np.maximum.accumulate(np.where(valid, np.arange(shaped.shape[-1]), 0), axis=-1)
+        shaped = np.take_along_axis(shaped, last_valid, axis=-1)
+    out = np.full_like(shaped, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[..., 1:] = (shaped[..., 1:] / shaped[..., :-1] - 1) * 100
+    out[np.isinf(out)] = np.nan
+    return _from_rows(out, axis)
+
+
+def bollinger_panel(values, window=20, num_std=2.0, axis=0):
+    """ Middle, upper and lower Bollinger Bands of every ticker
+
+    Returns:
+        (mid, upper, lower) (tuple[np.ndarray]): each shaped like `values`
+    """
+    window = int(window)
+    shaped = _to_rows(values, axis)
+    rows = shaped.reshape(-1, shaped.shape[-1])
+    mean, var = _moments_by_start(rows, first_valid_indices(rows), window)
+    width = num_std * np.sqrt(var)
+    return tuple(_from_rows(block.reshape(shaped.shape), axis) for block in (mean, mean + width, mean - width))
+
+
+def zscore_panel(values, window=20, axis=0):
+    """ Rolling z-score of every ticker's close against its own rolling mean and deviation """
+    window = int(window)
+    shaped = _to_rows(values, axis)
+    rows = shaped.reshape(-1, shaped.shape[-1])
+    mean, var = _moments_by_start(rows, first_valid_indices(rows), window)
+    std = np.sqrt(var)
+    out = np.full_like(rows, np.nan)
+    np.divide(rows - mean, std, out=out, where=std > 0)
+    return _from_rows(out.reshape(shaped.shape), axis)
+
+
+def volatility_panel(values, window=20, periods_per_year=252, axis=0):
+    """ Annualised rolling volatility (percent) of every ticker's daily returns """
+    window = int(window)
+    if window < 2:
+        raise ValueError("Window size must be at least 2")
+    shaped = _to_rows(values, axis)
+    rows = shaped.reshape(-1, shaped.shape[-1])
+    returns = daily_returns_panel(rows, axis=-1)
+    # windows start at each ticker's first close, whose return is NaN, as on the single series
+    _, var = _moments_by_start(returns, first_valid_indices(rows), window, ddof=1)
+    return _from_rows((np.sqrt(var) * np.sqrt(periods_per_year)).reshape(shaped.shape), axis)
+
+
+def best_trade_panel(values, window=20, axis=0):
+    """ Best trade profit (percent) inside every trailing window of every ticker """
+    window = int(window)
+    if window < 2:
+        raise ValueError("Window size must be at least 2")
+    shaped = _to_rows(values, axis)
+    # the best ratio is exact whatever the block alignment, so leading NaNs need no regrouping
+    return _from_rows((rolling_max_gain(shaped, window) - 1) * 100, axis)
@@ -0,0 +1,292 @@
+# indicators/parallel.py
+"""
+Parallel `apply_indicator` over many (ticker, indicator, params) jobs.
+
+The close prices (and dates) of every job are packed into one shared-memory
+block; workers receive only the block name and their offsets, rebuild a small
+``Date``/``Close`` frame, run `apply_indicator` and send back just the new
+output columns. Results come back in job order regardless of which worker
+finished first.
+
+When a pool cannot be used (one worker requested, a single job, or the
+platform refusing processes / shared memory) the jobs run serially in the
+calling process with the same result format. Neither path uses the result
+cache of `apply_indicator`.
+
+Typical usage example:
+----------------------
+    from indicators.parallel import run_indicator_jobs
+
+    jobs = [(ticker, df, "rsi", {"interval": 14}) for ticker, df in frames.items()]
+    for result in run_indicator_jobs(jobs, max_workers=8, timeout=30):
+        if result["error"]:
+            print(result["label"], result["error"])
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .backends import get_backend, set_backend
+from .registry import apply_indicator
+
+_tracker_lock = threading.Lock()
+
+# seconds between checks for jobs that started running (their timeout counts from then)
+_POLL_INTERVAL = 0.05
+
+
+def _attach(name):
+    """ Opens an existing shared-memory block without handing it to this process' tracker """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return _attach_untracked(name)
+
+
+def _attach_untracked(name):
+    """ Attaches to a block on Python < 3.13, which has no SharedMemory(track=False)
+
+    The creating process owns (and unlinks) the block; registering it again from a
+    worker would have the tracker unlink or double-count it. Registration cannot be
+    skipped there, so resource_tracker.register is swapped out for the duration of the
+    attach. That patches the module for the whole process, which is only acceptable
+    because this runs in pool workers, which execute one job at a time; the lock keeps
+    concurrent attaches from restoring each other's swap.
+    """
+    from multiprocessing import resource_tracker
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _terminate_workers(executor):
+    """ Kills the worker processes of `executor`
+
+    A job stuck in a worker cannot be cancelled and `shutdown` has no option to kill
+    workers, so their processes are reached through the executor's private
+    ``_processes`` mapping (present in every CPython version with ProcessPoolExecutor);
+    should it ever go away this does nothing and the workers exit on their own.
+    """
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        process.terminate()
+
+
+def _pack(frames):
+    """
+    Copies every frame's closes and dates into one shared-memory block.
+
+    Layout: all closes (float64) followed by all dates (int64 ns since epoch, UTC).
+    Returns the block and, per frame, (offset, length, timezone or None, has_dates).
+    """
+    lengths = [len(df) for df in frames]
+    total = sum(lengths)
+    shm = shared_memory.SharedMemory(create=True, size=max(total * 16, 1))
+    closes = np.ndarray(total, dtype=np.float64, buffer=shm.buf)
+    dates = np.ndarray(total, dtype=np.int64, buffer=shm.buf, offset=total * 8)
+
+    layout, offset = [], 0
+    for df, n in zip(frames, lengths):
+        closes[offset:offset + n] = df["Close"].to_numpy(dtype=np.float64)
+        tz, has_dates = None, "Date" in df.columns
+        if has_dates:
+            stamps = pd.to_datetime(df["Date"])
+            tz = str(stamps.dt.tz) if stamps.dt.tz is not None else None
+            if tz is not None:
+                stamps = stamps.dt.tz_convert("UTC").dt.tz_localize(None)
+            dates[offset:offset + n] = stamps.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        layout.append((offset, n, tz, has_dates))
+        offset += n
+    del closes, dates  # release the exports so the block can be closed
+    return shm, layout
+
+
+def _rebuild(buf, total, offset, n, tz, has_dates):
+    """ Rebuilds the Date/Close frame of one job from the shared block (copies out of it) """
+    closes = np.ndarray(total, dtype=np.float64, buffer=buf)
+    df = pd.DataFrame({"Close": closes[offset:offset + n].copy()})
+    if has_dates:
+        stamps = np.ndarray(total, dtype=np.int64, buffer=buf, offset=total * 8)[offset:offset + n]
+        dates = pd.to_datetime(stamps.copy().view("datetime64[ns]"))
+        if tz is not None:
+            dates = dates.tz_localize("UTC").tz_convert(tz)
+        df.insert(0, "Date", dates)
+    del closes
+    return df
+
+
+def _run_shared_job(shm_name, total, slot, key, params):
+    """ Worker entry point: returns (new output columns, extras) for one job """
+    shm = _attach(shm_name)
+    try:
+        df = _rebuild(shm.buf, total, *slot)
+    finally:
+        shm.close()
+    return _split_result(apply_indicator(df, key, params, use_cache=False), df.columns)
+
+
+def _split_result(res, input_columns):
+    """ Separates the added columns from the extra return values (dailyr) """
+    frame, extras = (res[0], res[1:]) if isinstance(res, tuple) else (res, None)
+    columns = {col: frame[col].to_numpy() for col in frame.columns if col not in input_columns}
+    return columns, extras
+
+
+def _result(job, columns=None, extras=None, error=None):
+    label, df, key, params = job
+    out = None
+    if error is None:
+        out = df.copy()
+        for col, values in columns.items():
+            out[col] = values
+    return {"label": label, "key": key, "params": params, "df": out, "extras": extras, "error": error}
+
+
+def _run_serial(jobs):
+    """ Runs the jobs in this process, like the workers without the result cache """
+    results = []
+    for job in jobs:
+        _, df, key, params = job
+        try:
+            # same as the workers: a pool run cannot read or fill this process' cache,
+            # so neither does the fallback, whichever path ran gives the same results
+            columns, extras = _split_result(apply_indicator(df, key, params, use_cache=False), df.columns)
+            results.append(_result(job, columns, extras))
+        except Exception as e:
+            results.append(_result(job, error=f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _outcome(job, future):
+    """ Result dict of a finished future, a broken pool is raised for the serial fallback """
+    try:
+        columns, extras = future.result()
+    except BrokenProcessPool:
+        raise
+    except Exception as e:
+        return _result(job, error=f"{type(e).__name__}: {e}")
+    return _result(job, columns, extras)
+
+
+def _collect(jobs, futures, timeout, max_workers):
+    """ Waits for every job, giving each one `timeout` seconds from the moment it starts running
+
+    A job counts as started once the pool hands it to its workers' call queue, which
+    holds at most one job more than there are workers. Returns the results in job
+    order and whether any job timed out (its worker is then still busy with it).
+    """
+    results = [None] * len(jobs)
+    pending = dict(enumerate(futures))
+    started, expired = {}, []
+    while pending:
+        now = time.monotonic()
+        for i, future in list(pending.items()):
+            if future.done():
+                results[i] = _outcome(jobs[i], future)
+                del pending[i]
+                continue
+            if future.running():
+                started.setdefault(i, now)
+            if timeout is not None and i in started and now - started[i] >= timeout:
+                future.cancel()
+                expired.append(future)
+                results[i] = _result(jobs[i], error=f"TimeoutError: job exceeded {timeout}s")
+                del pending[i]
+
+        if pending and sum(not future.done() for future in expired) >= max_workers:
+            # every worker is stuck on a timed-out job, the remaining ones can never start
+            for i in pending:
+                results[i] = _result(jobs[i], error=f"TimeoutError: no free worker, earlier jobs exceeded {timeout}s")
+            pending = {}
+
+        if pending:
+            wait_for = None
+            if timeout is not None:
+                deadlines = [started[i] + timeout for i in pending if i in started]
+                wait_for = min([_POLL_INTERVAL, *(deadline - now for deadline in deadlines)])
+            wait(list(pending.values()), timeout=max(wait_for, 0.0) if wait_for is not None else None,
+                 return_when=FIRST_COMPLETED)
+    return results, bool(expired)
+
+
+def run_indicator_jobs(jobs, max_workers=None, timeout=None):
+    """
+    Run many `apply_indicator` calls across a process pool.
+
+    Parameters
+    ----------
+    jobs : list of (label, pandas.DataFrame, str, dict or None)
+        One entry per (ticker, indicator, params) combination. Frames need a
+        `'Close'` column; `'Date'` is forwarded when present (dailyr dates).
+    max_workers : int, optional
+        Pool size, defaults to the number of CPUs (or the ``INDICATOR_WORKERS``
+        environment variable). With 1 the jobs run serially in this process.
+    timeout : float, optional
+        Seconds each job may run, counted from when the pool starts it (time spent
+        queued behind other jobs does not count). A job that does not finish in
+        time is reported with a timeout error, as are the jobs that can no longer
+        start because every worker is stuck; the workers are stopped once all
+        results are collected. Not enforced in the serial fallback.
+
+    Returns
+    -------
+    list of dict
+        One dict per job, in the order of `jobs`, with keys ``label``, ``key``,
+        ``params``, ``df`` (input frame plus indicator columns, None on error),
+        ``extras`` (``(streak_info, max_profit)`` for dailyr, else None) and
+        ``error`` (None on success, otherwise a message).
+    """
+    jobs = [tuple(job) for job in jobs]
+    if not jobs:
+        return []
+    if max_workers is None:
+        max_workers = int(os.environ.get("INDICATOR_WORKERS", 0)) or os.cpu_count() or 1
+    max_workers = min(int(max_workers), len(jobs))
+    if max_workers <= 1:
+        return _run_serial(jobs)
+
+    for _, df, _, _ in jobs:
+        if df is None or "Close" not in df.columns:
+            # malformed frames are reported by apply_indicator itself
+            return _run_serial(jobs)
+
+    try:
+        shm, layout = _pack([df for _, df, _, _ in jobs])
+    except OSError as e:
+        print(f"[WARN] Shared memory unavailable ({e}), running indicator jobs serially.")
+        return _run_serial(jobs)
+
+    total = sum(n for _, n, _, _ in layout)
+    results, timed_out = [], False
+    executor = None
+    try:
+        # workers use the caller's kernel backend, loading compiled kernels from the disk cache
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=set_backend, initargs=(get_backend(),))
+        futures = [
+            executor.submit(_run_shared_job, shm.name, total, slot, key, params)
+            for (_, _, key, params), slot in zip(jobs, layout)
+        ]
+        results, timed_out = _collect(jobs, futures, timeout, max_workers)
+    except (BrokenProcessPool, OSError) as e:
+        print(f"[WARN] Process pool failed ({e}), running indicator jobs serially.")
+        results = _run_serial(jobs)
+    finally:
+        if executor is not None:
+            if timed_out:
+                # stuck workers cannot be interrupted, stop them so shutdown does not block
+                _terminate_workers(executor)
+            executor.shutdown(wait=not timed_out, cancel_futures=True)
+        shm.close()
+        shm.unlink()
+
+    print(f"[INFO] {len(jobs)} indicator jobs completed on {max_workers} workers.")
+    return results
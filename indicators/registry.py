@@ -1,19 +1,38 @@
 # indicators/registry.py
-from .sma import calculate_sma
-from .ema import calculate_ema
-from .rsi import calculate_rsi
-from .macd import calculate_macd
-from .dailyr import calculate_dailyr
+import numpy as np
+
+from .sma import calculate_sma, sma_kernel
+from .ema import calculate_ema, ema_kernel
+from .rsi import calculate_rsi, rsi_kernel
+from .macd import calculate_macd, macd_kernel
+from .dailyr import best_trade_kernel, calculate_best_trade, calculate_dailyr, calculate_max_profit, daily_returns
 from .updown import calculate_updown
+from .bollinger import bollinger_kernel, calculate_bollinger
+from .volatility import calculate_volatility, volatility_kernel
+from .zscore import calculate_zscore, zscore_kernel
+from .rolling import rolling_moments
+from .backends import get_backend, set_backend  # kernel backend selection, see indicators.backends
+from .buffers import attach_columns, close_view, datetime_dates
+from .cache import ResultCache, make_key
+from .panel import (
+    best_trade_panel, bollinger_panel, daily_returns_panel, ema_panel, macd_panel, rsi_panel, sma_panel,
+    volatility_panel, zscore_panel,
+)
+from .streaming import (
+    StreamingBestTrade, StreamingBollinger, StreamingDailyR, StreamingEMA, StreamingMACD, StreamingRSI, StreamingSMA,
+    StreamingVolatility, StreamingZScore,
+)
 
 # Registry: key -> metadata
 """
 Indicator registry and dispatcher for applying technical analysis indicators.
 
 This module defines a centralized mapping of indicator keys (e.g., `"sma"`, `"ema"`,
-`"rsi"`, `"macd"`, `"dailyr"`) to their calculation functions, default parameters,
+`"rsi"`, `"macd"`, `"dailyr"`, `"bollinger"`, `"volatility"`, `"zscore"`, `"best_trade"`) to their calculation functions, default parameters,
 and plotting metadata. It provides helper functions to retrieve indicator
 specifications and safely apply indicators to a pandas DataFrame.
+The kernel backend of the sequential recursions (EMA/Wilder smoothing, up/down
+streaks) is chosen with `set_backend` or the ``INDICATOR_BACKEND`` variable.
 
 Typical usage example:
 ----------------------
@@ -28,32 +47,123 @@ INDICATORS = {
         "default_params": {"window": 5},
         # columns function receives merged params and returns list of expected columns
         "columns": lambda p: [f"SMA_{p.get('window', 20)}"],
+        # minimum number of rows the indicator needs for the given merged params
+        "min_rows": lambda p: p["window"],
+        # DAG nodes read by the indicator, as (node kind, params); see NODES / resolve_dag
+        "inputs": lambda p: [],
+        # incremental calculator class, see indicators/streaming.py
+        "stream": StreamingSMA,
+        # max deviation of compact (float32) output from float64, see apply_indicator(compact=...)
+        "compact_tolerance": {"rtol": 2e-7},
+        # (dates x tickers) close matrix + merged params -> {column: matrix}, see apply_panel
+        "panel": lambda close, p: {f"SMA_{p['window']}": sma_panel(close, p["window"])},
         "plot_kind": "overlay",  # overlay on price
     },
     "ema": {
         "func": calculate_ema,
         "default_params": {"interval": 20},
         "columns": lambda p: [f"EMA_{p.get('interval', 20)}"],
+        "min_rows": lambda p: p["interval"],
+        "inputs": lambda p: [_ema_ref(p["interval"], p.get("smoothing", 2.0))],
+        "stream": StreamingEMA,
+        "compact_tolerance": {"rtol": 2e-7},
+        "panel": lambda close, p: {f"EMA_{p['interval']}": ema_panel(close, p["interval"])},
         "plot_kind": "overlay",
     },
     "rsi": {
         "func": calculate_rsi,
         "default_params": {"interval": 14},
         "columns": lambda p: [f"RSI_{p.get('interval', 14)}"],
+        "min_rows": lambda p: p["interval"],
+        "inputs": lambda p: [("differences", {})],
+        "stream": StreamingRSI,
+        "compact_tolerance": {"atol": 1e-3},  # RSI points
+        "panel": lambda close, p: {f"RSI_{p['interval']}": rsi_panel(close, p["interval"])},
         "plot_kind": "separate_rsi",  # draw in its own subplot with range 0-100
     },
     "macd": {
         "func": calculate_macd,
         "default_params": {"fast_period": 12, "slow_period": 26, "signal_period": 9},
         "columns": lambda p: ["MACD", "MACD_signal", "MACD_hist"],
+        "min_rows": lambda p: p["slow_period"] + p["signal_period"],
+        "inputs": lambda p: [_ema_ref(p["fast_period"]), _ema_ref(p["slow_period"])],
+        "stream": StreamingMACD,
+        # EMA differences cancel most digits, so the bound scales with the price level
+        "compact_tolerance": {"atol_price": 1e-7},
+        "panel": lambda close, p: dict(zip(
+            ["MACD", "MACD_signal", "MACD_hist"],
+            macd_panel(close, int(p["fast_period"]), int(p["slow_period"]), int(p["signal_period"])),
+        )),
         "plot_kind": "separate_macd",  # macd histogram + signal in second subplot
     },
     "dailyr": {
         "func": calculate_dailyr,
-        "default_params": {"tolerance": 0, "threshold": 0.00},  # no parameters needed
+        # transactions caps the max-profit trades (0 = unlimited)
+        "default_params": {"tolerance": 0, "threshold": 0.00, "transactions": 1},
         "columns": lambda p: ["DailyR"],
+        "min_rows": lambda p: 2,
+        "inputs": lambda p: [
+            ("returns", {}),
+            ("updown", {"tolerance": p["tolerance"], "threshold": p["threshold"]}),
+            ("max_profit", {"transactions": int(p.get("transactions", 1))}),
+        ],
+        "stream": StreamingDailyR,
+        # percentage points; streaks are decided on float64 returns of the float32 closes
+        "compact_tolerance": {"atol": 1e-4},
+        "panel": lambda close, p: {"DailyR": daily_returns_panel(close)},
         "plot_kind": "separate_dailyr",  # show on its own subplot
     },
+    "bollinger": {
+        "func": calculate_bollinger,
+        "default_params": {"window": 20, "num_std": 2.0},
+        "columns": lambda p: [f"BB_{band}_{int(p['window'])}" for band in ("mid", "upper", "lower")],
+        "min_rows": lambda p: p["window"],
+        "inputs": lambda p: [_moments_ref(p["window"])],
+        "stream": StreamingBollinger,
+        # mean +/- num_std deviations of float32 closes, bound for the default num_std
+        "compact_tolerance": {"atol_price": 5e-7},
+        "panel": lambda close, p: dict(zip(
+            [f"BB_{band}_{int(p['window'])}" for band in ("mid", "upper", "lower")],
+            bollinger_panel(close, int(p["window"]), p["num_std"]),
+        )),
+        "plot_kind": "overlay_bands",  # middle band plus shaded upper/lower band on price
+    },
+    "volatility": {
+        "func": calculate_volatility,
+        "default_params": {"window": 20, "periods_per_year": 252},
+        "columns": lambda p: [f"VOL_{int(p['window'])}"],
+        "min_rows": lambda p: p["window"] + 1,
+        "inputs": lambda p: [("returns", {})],
+        "stream": StreamingVolatility,
+        "compact_tolerance": {"atol": 1e-3},  # annualised percentage points
+        "panel": lambda close, p: {
+            f"VOL_{int(p['window'])}": volatility_panel(close, int(p["window"]), p["periods_per_year"]),
+        },
+        "plot_kind": "separate_volatility",  # own subplot, in percent
+    },
+    "zscore": {
+        "func": calculate_zscore,
+        "default_params": {"window": 20},
+        "columns": lambda p: [f"ZSCORE_{int(p['window'])}"],
+        "min_rows": lambda p: p["window"],
+        "inputs": lambda p: [_moments_ref(p["window"])],
+        "stream": StreamingZScore,
+        # float32 rounding of the close divided by the (small) rolling deviation
+        "compact_tolerance": {"atol": 1e-3},
+        "panel": lambda close, p: {f"ZSCORE_{int(p['window'])}": zscore_panel(close, int(p["window"]))},
+        "plot_kind": "separate_zscore",  # own subplot with +/-2 guide lines
+    },
+    "best_trade": {
+        "func": calculate_best_trade,
+        "default_params": {"window": 20},
+        "columns": lambda p: [f"BestTrade_{int(p['window'])}"],
+        "min_rows": lambda p: p["window"],
+        "inputs": lambda p: [],
+        "stream": StreamingBestTrade,
+        "compact_tolerance": {"atol": 1e-3},  # percentage points
+        "panel": lambda close, p: {f"BestTrade_{int(p['window'])}": best_trade_panel(close, int(p["window"]))},
+        "plot_kind": "separate_best_trade",  # own subplot, in percent
+    },
 }
 
 
@@ -85,13 +195,104 @@ def get_indicator_spec(key: str):
             - `"func"`: Calculation function
             - `"default_params"`: Default parameters
             - `"columns"`: Function that returns expected output column names
+            - `"min_rows"`: Function that returns the minimum number of rows needed
+            - `"inputs"`: Function returning the shared DAG nodes the indicator reads (see `resolve_dag`)
+            - `"stream"`: Incremental calculator class (see `create_stream`)
+            - `"compact_tolerance"`: Max deviation of float32 output from float64 as
+              `rtol` (relative), `atol` (absolute) or `atol_price` (times max |Close|)
+            - `"panel"`: Function computing every ticker of a close matrix at once (see `apply_panel`)
             - `"plot_kind"`: Visualization type for plotting
         Returns `None` if the key is not found.
     """
     return INDICATORS.get(key)
 
 
-def apply_indicator(df, key: str, params: dict | None = None):
+def _validate_params(key: str, merged_params: dict):
+    """
+    Raise ``ValueError`` if any numeric parameter is out of range for indicator `key`.
+    """
+    ALLOW_ZERO = {"dailyr"}
+
+    for k, v in merged_params.items():
+        if isinstance(v, (int, float)):
+            # Allow 0 for DailyR only
+            if key in ALLOW_ZERO:
+                if v < 0:
+                    raise ValueError(
+                        f"Invalid parameter '{k}'={v} for indicator '{key}'. Must be >= 0."
+                    )
+            else:
+                if v <= 0:
+                    # Special rule for MACD fast_period
+                    if key == "macd" and k == "fast_period":
+                        raise ValueError(
+                            f"Invalid parameter '{k}'={v} for indicator '{key}'. Must be > 0 and less than 'slow_period'."
+                        )
+                    else:
+                        raise ValueError(
+                            f"Invalid parameter '{k}'={v} for indicator '{key}'. Must be > 0."
+                        )
+
+    # === Extra MACD-specific validation ===
+    if key == "macd":
+        fast = merged_params.get("fast_period")
+        slow = merged_params.get("slow_period")
+        if fast is not None and slow is not None and fast >= slow:
+            raise ValueError(
+                f"Invalid parameter 'fast_period'={fast} for indicator 'macd'. Must be > 0 and less than 'slow_period'."
+            )
+
+    # === Extra DailyR-specific validation ===
+    if key == "dailyr":
+        transactions = merged_params.get("transactions", 1)
+        if transactions != int(transactions):
+            raise ValueError(
+                f"Invalid parameter 'transactions'={transactions} for indicator 'dailyr'. Must be an integer (0 = unlimited)."
+            )
+
+
+def merge_params(key: str, params: dict | None = None) -> dict:
+    """
+    Merge `params` over the defaults of indicator `key`.
+
+    Whole floats given for integer parameters (``{"window": 20.0}``, as parsed from
+    form values) become ints, so the output columns are named ``SMA_20`` whatever
+    the input type, as the indicator functions name them.
+    """
+    defaults = INDICATORS[key]["default_params"]
+    merged_params = {**defaults, **(params or {})}
+    for k, v in merged_params.items():
+        default = defaults.get(k)
+        if (isinstance(default, int) and not isinstance(default, bool)
+                and isinstance(v, float) and v.is_integer()):
+            merged_params[k] = int(v)
+    return merged_params
+
+
+def _apply_copy_free(df, key: str, merged_params: dict):
+    """
+    Run one indicator as a DAG node on a read-only view of `'Close'` and attach
+    the outputs to `df` without copying it. Returns what `spec["func"]` would.
+    """
+    needed = INDICATORS[key]["min_rows"](merged_params)
+    if len(df) < needed:
+        raise IndexError(f"Insufficient data, only {len(df)} points for {needed} required")
+
+    dates = datetime_dates(df["Date"]) if "Date" in df.columns else df.index.to_series()
+    value = SharedInputs(close_view(df), dates).evaluate([(key, merged_params)])[0]
+    if isinstance(value, Exception):
+        raise value
+    columns, extras = value
+    res = attach_columns(df, columns)
+    return (res, *extras) if extras else res
+
+
+# process-wide memo of indicator outputs, shared across requests/tabs (see indicators/cache.py)
+RESULT_CACHE = ResultCache()
+
+
+def apply_indicator(df, key: str, params: dict | None = None, use_cache: bool = True, copy: bool = True,
+                    compact: bool | None = None):
     """
     Apply the specified indicator to a DataFrame.
 
@@ -109,6 +310,20 @@ def apply_indicator(df, key: str, params: dict | None = None):
     params : dict, optional
         Dictionary of custom parameters for the indicator.
         Any provided parameters will override the defaults.
+    use_cache : bool, optional
+        Serve / store results through `RESULT_CACHE`, keyed by the content of the
+        `'Date'`/`'Close'` columns plus the key and merged params. Defaults to True.
+    copy : bool, optional
+        With False (copy-free mode) the indicator runs through the DAG kernels on a
+        read-only view of `'Close'`, and the result frame shares the base columns
+        with `df` instead of copying them; only the output arrays are allocated.
+        Writing into the result's existing columns in place then also changes `df`.
+        Defaults to True.
+    compact : bool, optional
+        Store the indicator columns as float32 (computation still runs in float64).
+        Defaults to following the input: compact when `'Close'` is float32, as in frames
+        from ``preprocess_stock_data(..., compact=True)``. Expected deviation from the
+        float64 results is listed per indicator under `"compact_tolerance"`.
 
     Returns
     -------
@@ -125,6 +340,7 @@ def apply_indicator(df, key: str, params: dict | None = None):
     -----
     - Automatically merges user parameters with defaults.
     - Skips recalculation if expected columns already exist.
+    - Identical inputs (same prices, key and params) are served from the result cache.
     - Logs a warning on failure but does not stop execution.
 
     Example
@@ -153,55 +369,492 @@ def apply_indicator(df, key: str, params: dict | None = None):
         return df
 
     # === Merge default + user parameters ===
-    params = params or {}
-    merged_params = {**spec["default_params"], **params}
+    merged_params = merge_params(key, params)
     expected_cols = spec["columns"](merged_params)
 
     # === Skip recalculation if already exists ===
     if all(col in df.columns for col in expected_cols):
-        return df.copy()
+        return df.copy(deep=copy)
 
-    # === Validate numeric parameters ===
-    ALLOW_ZERO = {"dailyr"}
+    _validate_params(key, merged_params)
+    if compact is None:
+        compact = df["Close"].dtype == np.float32
 
-    for k, v in merged_params.items():
-        if isinstance(v, (int, float)):
-            # Allow 0 for DailyR only
-            if key in ALLOW_ZERO:
-                if v < 0:
-                    raise ValueError(
-                        f"Invalid parameter '{k}'={v} for indicator '{key}'. Must be >= 0."
-                    )
-            else:
-                if v <= 0:
-                    # Special rule for MACD fast_period
-                    if key == "macd" and k == "fast_period":
-                        raise ValueError(
-                            f"Invalid parameter '{k}'={v} for indicator '{key}'. Must be > 0 and less than 'slow_period'."
-                        )
-                    else:
-                        raise ValueError(
-                            f"Invalid parameter '{k}'={v} for indicator '{key}'. Must be > 0."
-                        )
+    # === Serve from the result cache ===
+    if use_cache:
+        cache_key = (*make_key(df, key, merged_params), bool(compact))
+        cached = RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            columns, extras = cached
+            res = attach_columns(df.copy() if copy else df, {col: values.copy() for col, values in columns.items()})
+            print(f"[INFO] {key.upper()} served from cache with parameters: {merged_params}")
+            return (res, *extras) if extras else res
 
-    # === Extra MACD-specific validation ===
-    if key == "macd":
-        fast = merged_params.get("fast_period")
-        slow = merged_params.get("slow_period")
-        if fast is not None and slow is not None and fast >= slow:
-            raise ValueError(
-                f"Invalid parameter 'fast_period'={fast} for indicator 'macd'. Must be > 0 and less than 'slow_period'."
-            )
     try:
-        # Call indicator function dynamically
-        res = spec["func"](df.copy(), **merged_params)
+        if copy:
+            # Call indicator function dynamically
+            res = spec["func"](df.copy(), **merged_params)
+        else:
+            res = _apply_copy_free(df, key, merged_params)
+        if compact:
+            frame = res[0] if isinstance(res, tuple) else res
+            for col in expected_cols:
+                frame[col] = frame[col].astype(np.float32)
         if res is None:
             raise ValueError(f"{key} function returned None or invalid output.")
         print(f"[INFO] {key.upper()} applied successfully with parameters: {merged_params}")
+        if use_cache:
+            # dailyr returns (df, streak_info, max_profit), the others just the frame
+            frame, extras = (res[0], res[1:]) if isinstance(res, tuple) else (res, ())
+            RESULT_CACHE.put(cache_key, {col: frame[col].to_numpy() for col in expected_cols}, extras)
     except Exception as e:
         print(f"[ERROR] {key} function failure: {e}")
         # Return dataframe with error info embedded (for safe rendering)
-        df = df.copy()
-        df[f"{key.upper()}_ERROR"] = str(e)
-        return df
+        return attach_columns(df.copy() if copy else df, {f"{key.upper()}_ERROR": np.full(len(df), str(e), dtype=object)})
     return res
+
+
+def create_stream(df, key: str, params: dict | None = None):
+    """
+    Create an incremental calculator for an indicator, seeded from the history in `df`.
+
+    The returned object takes one new close at a time through ``update(close, date)``
+    in O(1) and can be cached with ``to_dict()`` / ``streaming.stream_from_dict``.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        History containing `'Close'` (and `'Date'`, used for dailyr's trade/streak dates).
+    key : str
+        Indicator name, such as `'sma'`, `'ema'`, `'rsi'`, `'macd'`, or `'dailyr'`.
+    params : dict, optional
+        Parameter overrides, merged with the defaults and validated like `apply_indicator`.
+
+    Example
+    -------
+    >>> stream = create_stream(df, "rsi", {"interval": 14})
+    >>> stream.update(101.5)
+    {'RSI_14': 57.3...}
+    """
+    spec = get_indicator_spec(key)
+    if spec is None:
+        raise ValueError(f"Unknown indicator: {key}")
+    merged_params = merge_params(key, params)
+    _validate_params(key, merged_params)
+
+    dates = df["Date"] if "Date" in df.columns else None
+    return spec["stream"].from_history(df["Close"].to_numpy(dtype=np.float64), dates=dates, **merged_params)
+
+
+def apply_panel(close, key: str, params: dict | None = None):
+    """
+    Compute an indicator for every ticker of an aligned close matrix at once.
+
+    Parameters
+    ----------
+    close : pandas.DataFrame
+        ``dates × tickers`` close prices, e.g. from `data.preprocess.close_matrix`.
+        Leading NaNs (tickers listed later than others) are skipped per ticker.
+    key : str
+        Indicator name, such as `'sma'`, `'ema'`, `'rsi'`, `'macd'`, or `'dailyr'`.
+    params : dict, optional
+        Parameter overrides, merged with the defaults and validated like `apply_indicator`.
+
+    Returns
+    -------
+    (dict, dict or None)
+        Output column name -> ``dates × tickers`` DataFrame with the same index and
+        columns as `close`, and for dailyr a ``{ticker: (streak_info, max_profit)}``
+        dict (``None`` for the other indicators).
+
+    Raises
+    ------
+    ValueError
+        If the key is unknown or a parameter is invalid.
+    IndexError
+        If there are fewer dates than the indicator needs.
+
+    Example
+    -------
+    >>> close = close_matrix(dfs, labels)
+    >>> panels, _ = apply_panel(close, "sma", {"window": 20})
+    >>> panels["SMA_20"].iloc[-1].nlargest(5)
+    """
+    import pandas as pd
+
+    spec = get_indicator_spec(key)
+    if spec is None:
+        raise ValueError(f"Unknown indicator: {key}")
+    merged_params = merge_params(key, params)
+    _validate_params(key, merged_params)
+
+    needed = spec["min_rows"](merged_params)
+    if len(close) < needed:
+        raise IndexError(f"Insufficient data, only {len(close)} points for {needed} required")
+
+    values = close.to_numpy(dtype=np.float64)
+    panels = {
+        col: pd.DataFrame(matrix, index=close.index, columns=close.columns)
+        for col, matrix in spec["panel"](values, merged_params).items()
+    }
+
+    extras = None
+    if key == "dailyr":
+        # streaks and the best trade are per-ticker searches over the shared returns matrix
+        dates = pd.Index(close.index)
+        extras = {}
+        for col, ticker in enumerate(close.columns):
+            valid = ~np.isnan(values[:, col])
+            streak_info = calculate_updown(
+                pd.Series(panels["DailyR"].to_numpy()[valid, col], index=dates[valid]),
+                tolerance=merged_params["tolerance"], threshold=merged_params["threshold"],
+            )
+            extras[ticker] = (streak_info, calculate_max_profit(
+                values[valid, col], dates[valid], int(merged_params["transactions"])
+            ))
+
+    print(f"[INFO] {key.upper()} applied to {close.shape[1]} tickers with parameters: {merged_params}")
+    return panels, extras
+
+
+def _ema_ref(interval, smoothing=2.0):
+    return ("ema_line", {"interval": int(interval), "smoothing": float(smoothing)})
+
+
+def _moments_ref(window):
+    return ("rolling_moments", {"window": int(window)})
+
+
+def _compute_updown(shared, params, inputs):
+    import pandas as pd
+
+    index = pd.Index(shared.dates)
+    return [
+        calculate_updown(pd.Series(returns, index=index), tolerance=p["tolerance"], threshold=p["threshold"])
+        for p, (returns,) in zip(params, inputs)
+    ]
+
+
+# Intermediate DAG nodes shared between indicators: kind -> spec
+#   "inputs":  merged params -> list of (kind, params) nodes this node reads
+#   "compute": (shared, [params, ...], [[input values], ...]) -> [value, ...]
+#              called once per kind and DAG level with every node of that kind
+NODES = {
+    "differences": {
+        "inputs": lambda p: [],
+        "compute": lambda shared, params, inputs: [np.diff(shared.close) for _ in params],
+    },
+    "returns": {
+        "inputs": lambda p: [],
+        "compute": lambda shared, params, inputs: [daily_returns(shared.close) for _ in params],
+    },
+    "ema_line": {
+        "inputs": lambda p: [],
+        # every EMA of the frame goes through a single ema_kernel call
+        "compute": lambda shared, params, inputs: list(
+            ema_kernel(shared.close, [p["interval"] for p in params], [p["smoothing"] for p in params])
+        ),
+    },
+    "updown": {
+        "inputs": lambda p: [("returns", {})],
+        "compute": _compute_updown,
+    },
+    "rolling_moments": {
+        "inputs": lambda p: [],
+        # (mean, population variance) of the closes, shared by Bollinger Bands and z-score
+        "compute": lambda shared, params, inputs: [rolling_moments(shared.close, p["window"]) for p in params],
+    },
+    "max_profit": {
+        "inputs": lambda p: [],
+        "compute": lambda shared, params, inputs: [
+            calculate_max_profit(shared.close, shared.dates, p["transactions"]) for p in params
+        ],
+    },
+}
+
+
+def _node_spec(kind: str):
+    spec = NODES.get(kind) or INDICATORS.get(kind)
+    if spec is None:
+        raise ValueError(f"Unknown indicator: {kind}")
+    return spec
+
+
+def node_id(kind: str, params: dict) -> tuple:
+    """Hashable identity of a DAG node: its kind plus its (sorted) parameters."""
+    return kind, tuple(sorted(params.items()))
+
+
+def resolve_dag(refs):
+    """
+    Resolve requested nodes and everything they depend on into topological levels.
+
+    Parameters
+    ----------
+    refs : list of (str, dict)
+        Indicator keys (or intermediate node kinds from `NODES`) with merged params.
+
+    Returns
+    -------
+    list of list of (str, dict)
+        Levels in execution order. Every node appears once, however many requests
+        share it, and only depends on nodes of earlier levels.
+
+    Raises
+    ------
+    ValueError
+        If a kind is unknown or the declared inputs form a cycle.
+    """
+    depth, nodes = {}, {}
+
+    def visit(kind, params, path):
+        nid = node_id(kind, params)
+        if nid in depth:
+            return depth[nid]
+        if nid in path:
+            raise ValueError(f"Indicator dependency cycle through '{kind}'")
+        level = 0
+        for input_kind, input_params in _node_spec(kind)["inputs"](params):
+            level = max(level, visit(input_kind, input_params, path | {nid}) + 1)
+        depth[nid], nodes[nid] = level, (kind, params)
+        return level
+
+    for kind, params in refs:
+        visit(kind, params, frozenset())
+
+    levels = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for nid, level in depth.items():
+        levels[level].append(nodes[nid])
+    return levels
+
+
+class SharedInputs:
+    """
+    Per-frame store of computed DAG nodes.
+
+    `evaluate` runs the requested nodes and their inputs level by level, computing
+    each node once per frame: an EMA requested both directly and as a MACD leg is
+    only filtered once, and the daily returns behind DailyR feed both the column and
+    the up/down streaks.
+    """
+
+    def __init__(self, close, dates=None):
+        self.close = np.asarray(close, dtype=np.float64)
+        self.dates = dates
+        self._values = {}
+
+    def evaluate(self, refs):
+        """
+        Compute `refs` (``(kind, params)`` pairs) and return their values in order.
+
+        A node whose computation raised holds the exception instead of a value, as do
+        the nodes depending on it; the other nodes are unaffected.
+        """
+        for level in resolve_dag(refs):
+            groups = {}
+            for kind, params in level:
+                if node_id(kind, params) not in self._values:
+                    groups.setdefault(kind, []).append(params)
+            for kind, params in groups.items():
+                spec = _node_spec(kind)
+                # inputs sit in earlier levels, so they are already computed
+                inputs = [[self._values[node_id(*ref)] for ref in spec["inputs"](p)] for p in params]
+                failed = [next((v for v in values if isinstance(v, Exception)), None) for values in inputs]
+                ready = [i for i, error in enumerate(failed) if error is None]
+                try:
+                    compute = spec["compute"] if kind in NODES else BATCH_HANDLERS[kind]
+                    values = compute(self, [params[i] for i in ready], [inputs[i] for i in ready]) if ready else []
+                except Exception as e:
+                    values = [e] * len(ready)
+                for i, error in enumerate(failed):
+                    if error is not None:
+                        self._values[node_id(kind, params[i])] = error
+                for i, value in zip(ready, values):
+                    self._values[node_id(kind, params[i])] = value
+        return [self._values[node_id(kind, params)] for kind, params in refs]
+
+    def retain(self, refs):
+        """Forget every computed node except `refs` and the nodes they read, releasing their memory."""
+        keep = {node_id(kind, params) for level in resolve_dag(refs) for kind, params in level}
+        self._values = {key: value for key, value in self._values.items() if key in keep}
+
+    def differences(self):
+        """Close-to-close differences (length n - 1), used by RSI."""
+        return self.evaluate([("differences", {})])[0]
+
+    def returns(self):
+        """Daily percent returns (length n, NaN first), used by dailyr and updown."""
+        return self.evaluate([("returns", {})])[0]
+
+    def emas(self, pairs):
+        """Return ``{(interval, smoothing): ema_row}`` for the requested pairs."""
+        pairs = list(dict.fromkeys(pairs))
+        return dict(zip(pairs, self.evaluate([_ema_ref(*pair) for pair in pairs])))
+
+
+# Indicator nodes: (shared, [merged params, ...], [[input values], ...]) -> [(columns, extras), ...]
+# inputs arrive in the order declared by the spec's "inputs"
+
+def _batch_sma(shared, params, inputs):
+    windows = [int(p["window"]) for p in params]
+    return [({f"SMA_{window}": row}, None) for window, row in zip(windows, sma_kernel(shared.close, windows))]
+
+
+def _batch_ema(shared, params, inputs):
+    return [({f"EMA_{int(p['interval'])}": ema}, None) for p, (ema,) in zip(params, inputs)]
+
+
+def _batch_rsi(shared, params, inputs):
+    intervals = [int(p["interval"]) for p in params]
+    # every request shares the same differences node
+    block = rsi_kernel(shared.close, intervals, differences=inputs[0][0])
+    return [({f"RSI_{interval}": row}, None) for interval, row in zip(intervals, block)]
+
+
+def _batch_macd(shared, params, inputs):
+    results = []
+    for p, (ema_fast, ema_slow) in zip(params, inputs):
+        fast, slow, signal = int(p["fast_period"]), int(p["slow_period"]), int(p["signal_period"])
+        block = macd_kernel(shared.close, fast, slow, signal, emas=(ema_fast, ema_slow))
+        results.append(({"MACD": block[2], "MACD_signal": block[3], "MACD_hist": block[4]}, None))
+    return results
+
+
+def _batch_dailyr(shared, params, inputs):
+    return [({"DailyR": returns}, (streak_info, max_profit)) for returns, streak_info, max_profit in inputs]
+
+
+def _batch_bollinger(shared, params, inputs):
+    results = []
+    for p, (moments,) in zip(params, inputs):
+        window = int(p["window"])
+        block = bollinger_kernel(shared.close, window, p["num_std"], moments=moments)
+        results.append(({f"BB_{band}_{window}": row for band, row in zip(("mid", "upper", "lower"), block)}, None))
+    return results
+
+
+def _batch_volatility(shared, params, inputs):
+    return [
+        ({f"VOL_{int(p['window'])}": volatility_kernel(
+            shared.close, int(p["window"]), p["periods_per_year"], returns=returns)}, None)
+        for p, (returns,) in zip(params, inputs)
+    ]
+
+
+def _batch_zscore(shared, params, inputs):
+    return [
+        ({f"ZSCORE_{int(p['window'])}": zscore_kernel(shared.close, int(p["window"]), moments=moments)}, None)
+        for p, (moments,) in zip(params, inputs)
+    ]
+
+
+def _batch_best_trade(shared, params, inputs):
+    return [
+        ({f"BestTrade_{int(p['window'])}": best_trade_kernel(shared.close, int(p["window"]))}, None)
+        for p in params
+    ]
+
+
+# batch handler per indicator key, run as that key's DAG node
+BATCH_HANDLERS = {
+    "sma": _batch_sma,
+    "ema": _batch_ema,
+    "rsi": _batch_rsi,
+    "macd": _batch_macd,
+    "dailyr": _batch_dailyr,
+    "bollinger": _batch_bollinger,
+    "volatility": _batch_volatility,
+    "zscore": _batch_zscore,
+    "best_trade": _batch_best_trade,
+}
+
+
+def apply_indicators(df, requests):
+    """
+    Apply several indicators to a DataFrame in one call.
+
+    All requests are validated up front, the input is copied once, and the requests
+    are resolved into a DAG of the nodes they declare as `"inputs"` (see `resolve_dag`).
+    Nodes run in topological order, each computed once per frame, and nodes of the
+    same kind on one level share a batch kernel call (e.g. every SMA window in one
+    `sma_kernel` call, every EMA used by EMA and MACD requests in one `ema_kernel`
+    call). The daily returns feed both the DailyR column and the up/down streaks.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Input DataFrame containing price data (must include at least `'Close'`).
+    requests : list of (str, dict or None)
+        Indicator keys with their parameter overrides, e.g.
+        ``[("sma", {"window": 20}), ("sma", {"window": 50}), ("macd", None)]``.
+
+    Returns
+    -------
+    (pandas.DataFrame, list)
+        The DataFrame with every requested indicator column, and a list aligned with
+        `requests` holding non-column results: ``(streak_info, max_profit)`` for
+        dailyr, ``None`` for everything else.
+        A request whose indicator fails (e.g. too few rows) gets a `<KEY>_ERROR`
+        column instead, as in `apply_indicator`.
+
+    Raises
+    ------
+    ValueError
+        If a key is unknown or a parameter is invalid.
+
+    Example
+    -------
+    >>> df, extras = apply_indicators(df, [("sma", {"window": 5}), ("sma", {"window": 20}), ("rsi", None)])
+    >>> [c for c in df.columns if c[:3] in ("SMA", "RSI")]
+    ['SMA_5', 'SMA_20', 'RSI_14']
+    """
+    extras = [None] * len(requests)
+
+    # === Resolve and validate every request before computing anything ===
+    resolved = []
+    for key, params in requests:
+        spec = get_indicator_spec(key)
+        if spec is None:
+            raise ValueError(f"Unknown indicator: {key}")
+        merged_params = merge_params(key, params)
+        _validate_params(key, merged_params)
+        resolved.append((key, merged_params))
+
+    if df is None or df.empty:
+        print("[WARN] Empty DataFrame passed to apply_indicators.")
+        return df, extras
+
+    if "Close" not in df.columns:
+        print("[WARN] Missing 'Close' column in data — required for indicators.")
+        return df, extras
+
+    out = df.copy()
+    dates = out["Date"] if "Date" in out.columns else out.index.to_series()
+    shared = SharedInputs(out["Close"].to_numpy(dtype=np.float64), dates)
+
+    # === Drop requests the frame is too short for ===
+    runnable = []
+    for pos, (key, merged_params) in enumerate(resolved):
+        needed = INDICATORS[key]["min_rows"](merged_params)
+        if len(out) < needed:
+            msg = f"Insufficient data, only {len(out)} points for {needed} required"
+            print(f"[ERROR] {key} function failure: {msg}")
+            out[f"{key.upper()}_ERROR"] = msg
+            continue
+        runnable.append(pos)
+
+    # === Run the request DAG; shared nodes are computed once ===
+    values = shared.evaluate([resolved[pos] for pos in runnable])
+    for pos, value in zip(runnable, values):
+        key = resolved[pos][0]
+        if isinstance(value, Exception):
+            print(f"[ERROR] {key} function failure: {value}")
+            out[f"{key.upper()}_ERROR"] = str(value)
+            continue
+        columns, extras[pos] = value
+        for col, row in columns.items():
+            out[col] = row
+
+    applied = dict.fromkeys(resolved[pos][0] for pos in runnable)
+    print(f"[INFO] {', '.join(k.upper() for k in applied)} applied successfully in one batch.")
+    return out, extras
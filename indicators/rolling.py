@@ -0,0 +1,198 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# window updates between exact re-anchors of the running mean / sum of squares
+ANCHOR_SPACING = 1024
+
+def _filled(values):
+    """ Carries the last valid value over NaNs (0 before the first valid one) along the last axis
+
+    Windows containing a NaN are masked afterwards, this only keeps the running updates finite.
+    """
+    valid = ~np.isnan(values)
+    if valid.all():
+        return values
+    positions = np.where(valid, np.arange(values.shape[-1]), 0)
+    np.maximum.accumulate(positions, axis=-1, out=positions)
+    return np.nan_to_num(np.take_along_axis(values, positions, axis=-1), nan=0.0)
+
+def _has_nan(values, window):
+    """ True where the window ending at each position (from window - 1 on) contains a NaN """
+    counts = np.cumsum(np.isnan(values), axis=-1)
+    counts[..., window:] -= counts[..., :-window]
+    return counts[..., window - 1:] > 0
+
+def _anchored_cumsum(increments, anchors, spacing):
+    """ Running sum of `increments` restarted from an exact value every `spacing` steps
+
+    Args:
+        increments (np.ndarray): per-step changes along the last axis, entries at block starts are ignored
+        anchors (np.ndarray): exact values at positions 0, spacing, 2 * spacing, ... (last axis)
+        spacing (int): block length
+
+    Returns:
+        running (np.ndarray): same shape as increments
+    """
+    total = increments.shape[-1]
+    padded = np.zeros((*increments.shape[:-1], anchors.shape[-1] * spacing))
+    padded[..., :total] = increments
+    padded[..., ::spacing] = anchors
+    blocks = padded.reshape(*increments.shape[:-1], anchors.shape[-1], spacing)
+    np.cumsum(blocks, axis=-1, out=blocks)
+    return padded[..., :total]
+
+def rolling_moments(values, window, ddof=0):
+    """ Computes the rolling mean and variance of every `window` consecutive points in O(n)
+
+    Sliding the window by one point is the streaming (Welford) update
+        mean' = mean + (x_in - x_out) / window
+        M2'   = M2 + (x_in - x_out) * (x_in - mean' + x_out - mean)
+    which only involves deviations from the window means, so it does not suffer the
+    cancellation of the sum-of-squares formula. Both recurrences are written as cumulative
+    sums over their per-step increments, restarted from an exact two-pass value every
+    ANCHOR_SPACING steps so rounding cannot build up over long series.
+
+    Args:
+        values (array-like): prices, the windows run along the last axis (e.g. one row per ticker)
+        window (int): number of points per window
+        ddof (int): delta degrees of freedom of the variance, 0 (population) or 1 (sample)
+
+    Returns:
+        mean, var (tuple[np.ndarray]): float arrays shaped like values with NaN for the first
+            window - 1 positions and for every window containing a NaN (all NaN when the
+            window is longer than the data, var all NaN when window <= ddof)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    window = int(window)
+    if window < 1:
+        raise ValueError("Window size must be at least 1")
+
+    mean = np.full(values.shape, np.nan)
+    var = np.full(values.shape, np.nan)
+    n = values.shape[-1]
+    if window > n:
+        return mean, var
+
+    filled = _filled(values)
+    steps = n - window + 1
+    spacing = max(window, ANCHOR_SPACING)
+    anchor_windows = sliding_window_view(filled, window, axis=-1)[..., ::spacing, :]
+    anchor_mean = anchor_windows.mean(axis=-1)
+    anchor_m2 = np.square(anchor_windows - anchor_mean[..., np.newaxis]).sum(axis=-1)
+
+    # x_in enters and x_out leaves the window at steps 1 .. steps - 1
+    change = np.zeros((*values.shape[:-1], steps))
+    np.subtract(filled[..., window:], filled[..., :-window], out=change[..., 1:])
+    means = _anchored_cumsum(change / window, anchor_mean, spacing)
+
+    m2_step = np.zeros_like(change)
+    m2_step[..., 1:] = change[..., 1:] * (
+        filled[..., window:] - means[..., 1:] + filled[..., :-window] - means[..., :-1]
+    )
+    m2 = np.maximum(_anchored_cumsum(m2_step, anchor_m2, spacing), 0.0)
+
+    missing = _has_nan(values, window)
+    mean[..., window - 1:] = np.where(missing, np.nan, means)
+    if window > ddof:
+        var[..., window - 1:] = np.where(missing, np.nan, m2 / (window - ddof))
+    return mean, var
+
+def rolling_std(values, window, ddof=0):
+    """ Rolling standard deviation, see rolling_moments """
+    return np.sqrt(rolling_moments(values, window, ddof)[1])
+
+def _rolling_extreme(values, window, accumulate, fill):
+    """ Rolling max/min in O(n) with block prefix/suffix scans (van Herk / Gil-Werman)
+
+    The series is cut into blocks of `window` points. Any window spans the tail of one block
+    and the head of the next, so its extreme is the better of a suffix scan of the first
+    block and a prefix scan of the second. This gives the same result as a monotonic deque
+    while every step stays a whole-array NumPy call.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    window = int(window)
+    if window < 1:
+        raise ValueError("Window size must be at least 1")
+
+    out = np.full(values.shape, np.nan)
+    n = values.shape[-1]
+    if window > n:
+        return out
+
+    n_blocks = -(-n // window)
+    # the padding never wins, so the scans of the last (partial) block stay valid
+    padded = np.full((*values.shape[:-1], n_blocks * window), fill)
+    padded[..., :n] = values
+    blocks = padded.reshape(*values.shape[:-1], n_blocks, window)
+    prefix = accumulate(blocks, axis=-1).reshape(padded.shape)
+    suffix = accumulate(blocks[..., ::-1], axis=-1)[..., ::-1].reshape(padded.shape)
+
+    # NaNs propagate through both scans, so a window containing one comes out NaN
+    out[..., window - 1:] = accumulate(
+        np.stack([suffix[..., :n - window + 1], prefix[..., window - 1:n]]), axis=0
+    )[-1]
+    return out
+
+def rolling_max(values, window):
+    """ Rolling maximum along the last axis, NaN for the first window - 1 positions and NaN windows """
+    return _rolling_extreme(values, window, np.maximum.accumulate, -np.inf)
+
+def rolling_min(values, window):
+    """ Rolling minimum along the last axis, NaN for the first window - 1 positions and NaN windows """
+    return _rolling_extreme(values, window, np.minimum.accumulate, np.inf)
+
+def rolling_max_gain(values, window):
+    """ Best buy-then-sell price ratio inside every `window` consecutive points in O(n)
+
+    The best trade of a window is max(price[s] / price[b]) over b <= s inside it (1 when
+    prices only fall). As in `_rolling_extreme`, the series is cut into blocks of
+    `window` points, so a window is the tail of one block followed by the head of the
+    next. Its best trade lies in the tail, in the head, or buys at the tail minimum and
+    sells at the head maximum, and all of these are block prefix/suffix scans:
+        head best  = running max of price / running min       (scanning forward)
+        tail best  = running max of running max / price        (scanning backward)
+        cross      = head running max / tail running min
+    Every candidate is a single division of two prices in the window, so the result is
+    the exact best ratio, the same as scanning each window with a monotonic deque.
+
+    Args:
+        values (array-like): prices, the windows run along the last axis (e.g. one row per ticker)
+        window (int): number of points per window
+
+    Returns:
+        ratios (np.ndarray): float array shaped like values, NaN for the first window - 1
+            positions and for every window containing a NaN
+    """
+    values = np.asarray(values, dtype=np.float64)
+    window = int(window)
+    if window < 1:
+        raise ValueError("Window size must be at least 1")
+
+    out = np.full(values.shape, np.nan)
+    n = values.shape[-1]
+    if window > n:
+        return out
+
+    filled = _filled(values)
+    n_blocks = -(-n // window)
+    # repeating the last price adds no trade, so the scans of the last (partial) block stay valid
+    padded = np.empty((*values.shape[:-1], n_blocks * window))
+    padded[..., :n] = filled
+    padded[..., n:] = filled[..., -1:]
+    blocks = padded.reshape(*values.shape[:-1], n_blocks, window)
+    backward = blocks[..., ::-1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        head_best = np.maximum.accumulate(blocks / np.minimum.accumulate(blocks, axis=-1), axis=-1)
+        tail_best = np.maximum.accumulate(np.maximum.accumulate(backward, axis=-1) / backward, axis=-1)
+        head_max = np.maximum.accumulate(blocks, axis=-1).reshape(padded.shape)[..., window - 1:n]
+        tail_min = np.minimum.accumulate(backward, axis=-1)[..., ::-1].reshape(padded.shape)[..., :n - window + 1]
+        cross = head_max / tail_min
+
+    head_best = head_best.reshape(padded.shape)[..., window - 1:n]
+    tail_best = tail_best[..., ::-1].reshape(padded.shape)[..., :n - window + 1]
+    # windows starting on a block boundary are one whole block, covered by the tail scan alone
+    aligned = np.arange(n - window + 1) % window == 0
+    best = np.where(aligned, tail_best, np.fmax(np.fmax(tail_best, head_best), cross))
+    out[..., window - 1:] = np.where(_has_nan(values, window), np.nan, best)
+    return out
@@ -1,6 +1,76 @@
 import pandas as pd
 import numpy as np
 
+from .buffers import output_block
+from .filters import exponential_smooth
+
+def split_gains_losses(differences):
+    """ Splits close differences into (gains, losses), both non-negative """
+    return np.maximum(differences, 0), np.maximum(-differences, 0)
+
+def wilder_averages(gains, losses, interval):
+    """ Wilder-smoothed average gain and loss
+
+    Both averages are seeded with the plain mean of their first `interval` entries and then
+    follow avg = (avg * (interval - 1) + x) / interval. Rows are [avg_gain, avg_loss] so both
+    recursions run in one filter call. Inputs may carry leading axes (e.g. one row per
+    ticker), the averages always run along the last axis.
+
+    Returns:
+        averages (np.ndarray): shape (2, ..., gains.shape[-1] - interval + 1), [..., 0] is the seed
+    """
+    seeds = np.stack([gains[..., :interval].sum(axis=-1), losses[..., :interval].sum(axis=-1)]) / interval
+    averages = np.empty((2, *gains.shape[:-1], gains.shape[-1] - interval + 1))
+    averages[..., 0] = seeds
+    averages[..., 1:] = exponential_smooth(np.stack([gains[..., interval:], losses[..., interval:]]), 1.0 / interval, seeds)
+    return averages
+
+def rsi_from_averages(avg_gain, avg_loss):
+    """ Converts average gains/losses into RSI, using 100 wherever the average loss is 0 """
+    avg_gain = np.asarray(avg_gain, dtype=np.float64)
+    avg_loss = np.asarray(avg_loss, dtype=np.float64)
+    no_loss = avg_loss == 0
+    rs = np.divide(avg_gain, avg_loss, out=np.zeros_like(avg_gain), where=~no_loss)
+    return np.where(no_loss, 100.0, 100 - 100 / (1 + rs))
+
+def rsi_kernel(values, intervals, differences=None, out=None):
+    """ Computes Wilder RSI for one or more intervals in one call
+
+    Gains and losses are split from a single set of close differences, each interval is
+    seeded with the plain average of its first `interval` gains/losses and then Wilder-smoothed
+    (alpha = 1 / interval). Points where the smoothed loss is 0 are set to 100.
+
+    Args:
+        values (array-like): 1-D close prices
+        intervals (int or list[int]): one or more RSI intervals
+        differences (np.ndarray): precomputed np.diff(values) to reuse, computed when omitted
+        out (np.ndarray): preallocated float64 (len(intervals), len(values)) buffer to write into
+
+    Returns:
+        block (np.ndarray): float array of shape (len(intervals), len(values)), row i holds the
+            RSI for intervals[i] with NaN for the first intervals[i] entries
+    """
+    values = np.asarray(values, dtype=np.float64)
+    intervals = [int(i) for i in np.atleast_1d(intervals)]
+    if any(i < 1 for i in intervals):
+        raise ValueError("Window size must be at least 1")
+
+    n = values.size
+    block = output_block(out, (len(intervals), n))
+
+    # calculate close price differences, shared by every interval
+    if differences is None:
+        differences = np.diff(values)   # contains length - 1 elements
+    gains, losses = split_gains_losses(differences)
+
+    for row, interval in enumerate(intervals):
+        if interval >= n:
+            continue
+        avg_gain, avg_loss = wilder_averages(gains, losses, interval)
+        block[row, interval:] = rsi_from_averages(avg_gain, avg_loss)
+
+    return block
+
 
 def calculate_rsi(df, interval = 14):
     """ Measures the speed and magnitude of recent price changes to detect overbought/oversold conditions
@@ -12,7 +82,7 @@ def calculate_rsi(df, interval = 14):
     Returns:
         rsi_values (list[np.nan, np.float]): list of floats signalling a trend upwards or downwards
     """
-    data = df["Close"].copy()
+    data = df["Close"]
 
     # validating invalid inputs    
     if interval < 1:
@@ -23,46 +93,5 @@ def calculate_rsi(df, interval = 14):
     # handles float inputs
     interval = int(interval)
 
-    # calculate close price differences
-    differences = data[1:].values - data.values[:-1]  # contains length - 1 elements
-
-    gains = 0
-    losses = 0
-    for i in differences[:interval]:
-        gains += max(i, 0)     # if i is positive, use i else use 0
-        losses += max(-i, 0)   # if i is negative, use i else use 0
-    
-    avg_gain = gains / interval
-    avg_loss = losses / interval
-    if avg_loss == 0:
-        rsi = 100
-    else:
-        rsi = 100 - 100/(1 + avg_gain / avg_loss)
-
-    rsi_values = [np.nan] * interval + [rsi]
-
-    # we use smoothing as it counters having a period of no losses, which may cause avg_loss to be 0, causing divide by zero error
-    # as long as there is one entry > 0, it will never divide by zero (if there is none, we use rsi = 100)
-    for i in differences[interval:]:
-        # obvious thing to do here is to loop thru differences every time, but we can use sliding window here again
-        # use remainder as index?
-        avg_gain = (avg_gain * (interval - 1) + max(i, 0)) / interval # i-1 because differences has one less entry than truncated
-        avg_loss = (avg_loss * (interval - 1) + max(-i, 0)) / interval
-
-        if avg_loss == 0:
-            rsi = 100
-        else:
-            rsi = 100 - 100/(1 + avg_gain/avg_loss)
-
-        # try:    # shud replace this with proper handling later, currently meant to weed out dividing by zero errors -> no loss = strength is max
-        #     #rs = ( sum(gains) / len(gains) ) / ( sum(losses) / len(losses) )
-        #     rs = sum(gains) / sum(losses)
-        #     rsi = 100 - 100/(1 + rs) 
-        # except:
-        #     rsi = 100
-        rsi_values.append(rsi)
-
-    #to implement smoothing
-
-    df[f'RSI_{interval}'] = rsi_values
-    return df
\ No newline at end of file
+    df[f'RSI_{interval}'] = rsi_kernel(data.to_numpy(dtype=np.float64), interval)[0]
+    return df
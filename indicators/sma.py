@@ -1,17 +1,55 @@
 import pandas as pd
 import numpy as np
 
+from .buffers import output_block
+
+def sma_kernel(values, windows, out = None):
+    """ Computes simple moving averages for several window sizes in one call
+
+    Each row uses the sliding-window recurrence (add the entering price, drop the leaving one),
+    written as a cumulative sum over the per-step deltas so the whole series is handled by NumPy.
+
+    Args:
+        values (array-like): 1-D close prices
+        windows (int or list[int]): one or more window sizes
+        out (np.ndarray): preallocated float64 (len(windows), len(values)) buffer to write into
+
+    Returns:
+        block (np.ndarray): float array of shape (len(windows), len(values)), row i holds the
+            SMA for windows[i] with NaN for the first windows[i] - 1 entries
+            (rows for windows longer than the data are all NaN)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    windows = [int(w) for w in np.atleast_1d(windows)]
+    if any(w < 1 for w in windows):
+        raise ValueError("Window size must be at least 1")
+
+    n = values.size
+    block = output_block(out, (len(windows), n))
+
+    for row, window in enumerate(windows):
+        if window > n:
+            continue
+        # first window sum, followed by (new point - dropped point) for every later step
+        sums = block[row, window - 1:]
+        sums[0] = values[:window].sum()
+        np.subtract(values[window:], values[:-window], out=sums[1:])
+        np.cumsum(sums, out=sums)
+        sums /= window
+
+    return block
+
 def calculate_sma(df, window = 5):
     """ Calculates the average closing price over a user defined period for the specified stock
 
     Args:
         data (pd.Series): stock close prices for specified ticker over user-defined period
         window (int): the amount of data points being calculated, defaults to 5
-    
+
     Returns:
         rolling_sma (list[np.nan, np.float]): list of floats representing average of close prices of last 5 entries (including self)
     """
-    data = df["Close"].copy()
+    data = df["Close"]
     # validating invalid inputs
     if window < 1:
         raise ValueError("Window size must be at least 1")
@@ -20,16 +58,6 @@ def calculate_sma(df, window = 5):
 
     # handles float inputs
     window = int(window)
-    # calculates first window sum, for efficient sliding window calculation
-    window_sum = data.iloc[:window].sum()
-    # starts with NaN values for initial values
-    rolling_sma = [np.nan] * (window - 1) + [window_sum / window]
-
-    # roll across remaining data points
-    for i in range(window, data.size):
-        # removes old data point, adds new data point to sliding window
-        window_sum = window_sum + data.iloc[i] - data.iloc[i - window]
-        rolling_sma.append(window_sum / window)
-
-    df[f'SMA_{window}'] = rolling_sma
-    return df
\ No newline at end of file
+
+    df[f'SMA_{window}'] = sma_kernel(data.to_numpy(dtype=np.float64), window)[0]
+    return df
@@ -0,0 +1,685 @@
+# indicators/streaming.py
+"""
+Incremental (streaming) versions of the registry indicators.
+
+Each calculator is seeded from history with the vectorised kernels and then
+takes one close at a time through `update`, doing O(1) work per bar. After any
+sequence of updates its outputs equal what the batch functions in `indicators/`
+return for the full series.
+
+All state is kept as plain Python values, so `to_dict()` is JSON-safe and can be
+cached next to the ticker data and restored with `stream_from_dict`.
+
+Typical usage example:
+----------------------
+    from indicators.streaming import StreamingRSI
+
+    rsi = StreamingRSI.from_history(df["Close"], interval=14)
+    rsi.update(new_close)   # -> {"RSI_14": ...}
+"""
+import copy
+
+import numpy as np
+import pandas as pd
+
+from .dailyr import best_trade_kernel, calculate_max_profit, daily_returns, forward_fill
+from .ema import ema_kernel, nan_mean
+from .macd import macd_kernel
+from .rolling import _filled
+from .rsi import rsi_from_averages, split_gains_losses, wilder_averages
+from .updown import streak_state, timestamp_to_words
+
+
+def _date_key(date):
+    """Store dates as ISO strings so the state stays JSON-safe."""
+    return None if date is None else pd.Timestamp(date).isoformat()
+
+
+class StreamingIndicator:
+    """
+    Base class for incremental indicators.
+
+    Subclasses set `key` (the registry key), keep every piece of state as plain
+    attributes and implement `update` and `_seed`.
+    """
+
+    key = None
+
+    def update(self, close, date=None) -> dict:
+        """Feed the next close (and optionally its date) and return the latest outputs."""
+        raise NotImplementedError
+
+    def _seed(self, closes, dates):
+        """Set the state as if every close in `closes` had been passed to `update`."""
+        raise NotImplementedError
+
+    @property
+    def value(self) -> dict:
+        """Latest outputs keyed by the same column names as the batch functions."""
+        return dict(self._value)
+
+    @classmethod
+    def from_history(cls, closes, dates=None, **params):
+        """Create a calculator and seed it from a history of closes (oldest first)."""
+        stream = cls(**params)
+        closes = np.asarray(closes, dtype=np.float64)
+        if closes.size:
+            stream._seed(closes, None if dates is None else list(dates))
+        return stream
+
+    def to_dict(self) -> dict:
+        """Serialise the full state into plain (JSON-safe) Python values."""
+        state = {
+            name: value.to_dict() if isinstance(value, StreamingIndicator) else copy.deepcopy(value)
+            for name, value in vars(self).items()
+        }
+        return {"key": self.key, "state": state}
+
+    def _replay(self, closes, dates):
+        for i, close in enumerate(closes):
+            self.update(float(close), None if dates is None else dates[i])
+
+
+class StreamingSMA(StreamingIndicator):
+    """Simple moving average, keeping the last `window` closes in a ring buffer."""
+
+    key = "sma"
+
+    def __init__(self, window=5):
+        self.window = int(window)
+        self.count = 0
+        self.buffer = []
+        self.head = 0
+        self.window_sum = 0.0
+        self._value = {f"SMA_{self.window}": np.nan}
+
+    def update(self, close, date=None):
+        close = float(close)
+        if self.count < self.window:
+            self.buffer.append(close)
+            self.count += 1
+            if self.count == self.window:
+                self.window_sum = float(np.sum(self.buffer))
+        else:
+            # removes old data point, adds new data point to sliding window
+            dropped = self.buffer[self.head]
+            self.buffer[self.head] = close
+            self.head = (self.head + 1) % self.window
+            self.window_sum = self.window_sum + (close - dropped)
+            self.count += 1
+        value = self.window_sum / self.window if self.count >= self.window else np.nan
+        self._value = {f"SMA_{self.window}": value}
+        return self.value
+
+    def _seed(self, closes, dates):
+        if closes.size <= self.window:
+            return self._replay(closes, dates)
+        # same delta recurrence as sma_kernel, so the running sum matches it exactly
+        deltas = np.concatenate(([closes[:self.window].sum()], closes[self.window:] - closes[:-self.window]))
+        self.window_sum = float(np.cumsum(deltas)[-1])
+        self.buffer = closes[-self.window:].tolist()
+        self.head = 0
+        self.count = int(closes.size)
+        self._value = {f"SMA_{self.window}": self.window_sum / self.window}
+
+
+class StreamingEMA(StreamingIndicator):
+    """Exponential moving average seeded with the SMA of its first `interval` closes."""
+
+    key = "ema"
+
+    def __init__(self, interval=20, smoothing=2.0):
+        self.interval = int(interval)
+        self.smoothing = float(smoothing)
+        self.weight = self.smoothing / (self.interval + 1)
+        self.count = 0
+        self.seed_buffer = []
+        self.ema = np.nan
+        self._value = {f"EMA_{self.interval}": np.nan}
+
+    def update(self, close, date=None):
+        close = float(close)
+        self.count += 1
+        if self.count < self.interval:
+            self.seed_buffer.append(close)
+        elif self.count == self.interval:
+            self.seed_buffer.append(close)
+            self.ema = float(nan_mean(self.seed_buffer))
+            self.seed_buffer = []
+        else:
+            self.ema = self.weight * close + (1.0 - self.weight) * self.ema
+        self._value = {f"EMA_{self.interval}": self.ema}
+        return self.value
+
+    def _seed(self, closes, dates):
+        if closes.size < self.interval:
+            return self._replay(closes, dates)
+        self.ema = float(ema_kernel(closes, self.interval, self.smoothing)[0, -1])
+        self.count = int(closes.size)
+        self._value = {f"EMA_{self.interval}": self.ema}
+
+
+class StreamingRSI(StreamingIndicator):
+    """Wilder RSI, keeping the previous close and the smoothed average gain/loss."""
+
+    key = "rsi"
+
+    def __init__(self, interval=14):
+        self.interval = int(interval)
+        self.prev_close = None
+        self.n_diffs = 0
+        self.seed_gains = []
+        self.seed_losses = []
+        self.avg_gain = np.nan
+        self.avg_loss = np.nan
+        self._value = {f"RSI_{self.interval}": np.nan}
+
+    def update(self, close, date=None):
+        close = float(close)
+        if self.prev_close is None:
+            self.prev_close = close
+            return self.value
+
+        difference = close - self.prev_close
+        self.prev_close = close
+        gain, loss = (float(x) for x in split_gains_losses(np.float64(difference)))
+        self.n_diffs += 1
+
+        if self.n_diffs <= self.interval:
+            self.seed_gains.append(gain)
+            self.seed_losses.append(loss)
+            if self.n_diffs < self.interval:
+                return self.value
+            self.avg_gain = float(np.sum(self.seed_gains)) / self.interval
+            self.avg_loss = float(np.sum(self.seed_losses)) / self.interval
+            self.seed_gains, self.seed_losses = [], []
+        else:
+            alpha = 1.0 / self.interval
+            self.avg_gain = alpha * gain + (1.0 - alpha) * self.avg_gain
+            self.avg_loss = alpha * loss + (1.0 - alpha) * self.avg_loss
+
+        self._value = {f"RSI_{self.interval}": float(rsi_from_averages(self.avg_gain, self.avg_loss))}
+        return self.value
+
+    def _seed(self, closes, dates):
+        if closes.size <= self.interval:
+            return self._replay(closes, dates)
+        gains, losses = split_gains_losses(np.diff(closes))
+        averages = wilder_averages(gains, losses, self.interval)
+        self.avg_gain, self.avg_loss = (float(x) for x in averages[:, -1])
+        self.prev_close = float(closes[-1])
+        self.n_diffs = int(closes.size - 1)
+        self._value = {f"RSI_{self.interval}": float(rsi_from_averages(self.avg_gain, self.avg_loss))}
+
+
+class StreamingMACD(StreamingIndicator):
+    """MACD built from two streaming EMAs plus a streaming EMA of the MACD line."""
+
+    key = "macd"
+
+    def __init__(self, fast_period=12, slow_period=26, signal_period=9):
+        self.fast = StreamingEMA(fast_period)
+        self.slow = StreamingEMA(slow_period)
+        self.signal = StreamingEMA(signal_period)
+        self._value = {"MACD": np.nan, "MACD_signal": np.nan, "MACD_hist": np.nan}
+
+    def update(self, close, date=None):
+        fast = self.fast.update(close)[f"EMA_{self.fast.interval}"]
+        slow = self.slow.update(close)[f"EMA_{self.slow.interval}"]
+        macd_line = fast - slow
+        signal_line = np.nan
+        if not np.isnan(macd_line):
+            signal_line = self.signal.update(macd_line)[f"EMA_{self.signal.interval}"]
+        self._value = {"MACD": macd_line, "MACD_signal": signal_line, "MACD_hist": macd_line - signal_line}
+        return self.value
+
+    def _seed(self, closes, dates):
+        if closes.size < self.slow.interval:
+            return self._replay(closes, dates)
+        block = macd_kernel(closes, self.fast.interval, self.slow.interval, self.signal.interval)
+        self.fast = StreamingEMA.from_history(closes, interval=self.fast.interval)
+        self.slow = StreamingEMA.from_history(closes, interval=self.slow.interval)
+        macd_line = block[2]
+        self.signal = StreamingEMA.from_history(macd_line[~np.isnan(macd_line)], interval=self.signal.interval)
+        self._value = {"MACD": block[2, -1], "MACD_signal": block[3, -1], "MACD_hist": block[4, -1]}
+
+
+class StreamingDailyR(StreamingIndicator):
+    """
+    Daily returns with the running max-profit trade and up/down streak state.
+
+    `max_profit` and `streak_info` match `calculate_max_profit` and
+    `calculate_updown` (as returned by `calculate_dailyr`) for the closes seen so far.
+    Only the single best trade is tracked, as the optimal set of k trades can change
+    all the way back with every new close.
+    """
+
+    key = "dailyr"
+
+    def __init__(self, tolerance=0, threshold=0.0, transactions=1):
+        if transactions != 1:
+            raise ValueError("Streaming dailyr only tracks a single trade (transactions=1).")
+        self.tolerance = tolerance
+        self.threshold = threshold
+        self.count = 0
+        self.prev_close = None
+        # running minimum and best single trade
+        self.first = None
+        self.min_point = None
+        self.best_diff = 0.0
+        self.buy = None
+        self.sell = None
+        # streak state per direction, positions are dates of the non-NaN returns
+        self.prev_return_date = None
+        self.streaks = {
+            direction: {"current": 0, "start": None, "tol_left": tolerance,
+                        "best": 0, "best_start": None, "best_end": None}
+            for direction in ("up", "down")
+        }
+        self._value = {"DailyR": np.nan}
+
+    def update(self, close, date=None):
+        close = float(close)
+        date = _date_key(date)
+        index = self.count
+        self.count += 1
+
+        # --- Max profit: profit against the cheapest earlier close ---
+        if self.first is None:
+            self.first = [index, date, close]
+        if np.isnan(close):
+            # a missing close neither buys nor sells, as in `calculate_max_profit`
+            pass
+        elif self.min_point is None:
+            self.min_point = [index, date, close]
+        else:
+            if close - self.min_point[2] > self.best_diff:
+                self.best_diff = close - self.min_point[2]
+                self.buy, self.sell = list(self.min_point), [index, date, close]
+            if close < self.min_point[2]:
+                self.min_point = [index, date, close]
+
+        # --- Daily return ---
+        daily_return = np.nan
+        if self.prev_close is not None:
+            daily_return = float(daily_returns([self.prev_close, close])[1])
+        if self.prev_close is None or not np.isnan(close):
+            # a missing close keeps the last one, like the forward fill of daily_returns
+            self.prev_close = close
+        self._value = {"DailyR": daily_return}
+
+        if not np.isnan(daily_return):
+            for direction, state in self.streaks.items():
+                self._step(state, direction, daily_return, date)
+            self.prev_return_date = date
+        return self.value
+
+    def _step(self, state, direction, v, date):
+        """One move of the day-by-day streak rules from `calculate_updown`."""
+        same_dir = v > 0 if direction == "up" else v < 0
+        opposite_dir = v < 0 if direction == "up" else v > 0
+
+        def extend():
+            if state["current"] == 0:
+                state["start"] = date
+            state["current"] += 1
+
+        def close_streak():
+            if state["current"] > state["best"]:
+                state["best"] = state["current"]
+                state["best_start"] = state["start"]
+                state["best_end"] = self.prev_return_date
+            state["current"] = 0
+            state["start"] = None
+
+        if same_dir:
+            extend()
+            state["tol_left"] = self.tolerance
+        elif abs(v) < 1e-9:
+            extend()
+        elif opposite_dir:
+            if abs(v) > self.threshold:
+                close_streak()
+                state["tol_left"] = self.tolerance
+            elif self.tolerance == 0:
+                close_streak()
+            elif state["tol_left"] > 0:
+                extend()
+                state["tol_left"] -= 1
+            else:
+                close_streak()
+                state["tol_left"] = self.tolerance
+
+    @property
+    def max_profit(self) -> dict:
+        if self.count < 2:
+            return {
+                "buy_index": None, "sell_index": None,
+                "buy_date": pd.NaT, "sell_date": pd.NaT,
+                "buy_price": None, "sell_price": None,
+                "price_diff": 0, "profit_pct": 0,
+                "trades": [], "total_diff": 0.0, "total_pct": 0.0,
+            }
+        buy, sell = (self.buy, self.sell) if self.buy is not None else (self.first, self.first)
+        to_date = lambda d: pd.Timestamp(d) if d is not None else None
+        trade = {
+            "buy_index": buy[0],
+            "sell_index": sell[0],
+            "buy_date": to_date(buy[1]),
+            "sell_date": to_date(sell[1]),
+            "buy_price": buy[2],
+            "sell_price": sell[2],
+            "price_diff": self.best_diff,
+            "profit_pct": (self.best_diff / buy[2] * 100) if buy[2] > 0 else 0,
+        }
+        trades = []
+        if self.best_diff > 0:
+            # compounded the way `max_profit_trades` does it
+            growth_pct = (sell[2] / buy[2] - 1) * 100
+            trades = [{**trade, "cumulative_diff": self.best_diff, "cumulative_pct": growth_pct}]
+        return {
+            **trade,
+            "trades": trades,
+            "total_diff": trades[0]["cumulative_diff"] if trades else 0.0,
+            "total_pct": trades[0]["cumulative_pct"] if trades else 0.0,
+        }
+
+    @property
+    def streak_info(self) -> dict:
+        info = {}
+        for direction, state in self.streaks.items():
+            best, start, end = state["best"], state["best_start"], state["best_end"]
+            # the open streak counts once it is strictly longer, as when the batch run finishes
+            if state["current"] > best:
+                best, start, end = state["current"], state["start"], self.prev_return_date
+            if best == 0:
+                start = end = None
+            info[f"{direction}_streak"] = best
+            info[f"{direction}_start"] = None if start is None else timestamp_to_words(start)
+            info[f"{direction}_end"] = None if end is None else timestamp_to_words(end)
+        return info
+
+    def _seed(self, closes, dates):
+        n = closes.size
+        dates = [_date_key(d) for d in dates] if dates is not None else [None] * n
+
+        self.count = n
+        self.prev_close = float(forward_fill(closes)[-1])
+        self.first = [0, dates[0], float(closes[0])]
+        if not np.isnan(closes).all():
+            min_index = int(np.nanargmin(closes))
+            self.min_point = [min_index, dates[min_index], float(closes[min_index])]
+        if n >= 2:
+            trade = calculate_max_profit(closes)
+            if trade["price_diff"] > 0:
+                self.best_diff = trade["price_diff"]
+                self.buy = [trade["buy_index"], dates[trade["buy_index"]], trade["buy_price"]]
+                self.sell = [trade["sell_index"], dates[trade["sell_index"]], trade["sell_price"]]
+
+        returns = daily_returns(closes)
+        self._value = {"DailyR": float(returns[-1])}
+        valid = np.flatnonzero(~np.isnan(returns))
+        if not valid.size:
+            return
+        return_dates = [dates[i] for i in valid]
+        self.prev_return_date = return_dates[-1]
+        for direction, state in zip(("up", "down"), streak_state(returns[valid], self.tolerance, self.threshold)):
+            for name in ("start", "best_start", "best_end"):
+                if state[name] is not None:
+                    state[name] = return_dates[state[name]]
+            self.streaks[direction] = state
+
+
+class StreamingMoments(StreamingIndicator):
+    """
+    Base class for indicators on the mean / variance of the last `window` inputs.
+
+    The inputs sit in a ring buffer. Each slide applies the Welford update used by
+    `rolling.rolling_moments`, and the exact mean and sum of squared deviations are
+    recomputed from the buffer once per full turn (amortised O(1)), and whenever
+    the last NaN leaves the window.
+    """
+
+    def _init_window(self, window, ddof=0):
+        self.window = int(window)
+        self.ddof = ddof
+        self.count = 0
+        self.buffer = []
+        self.head = 0
+        self.nans = 0
+        self.mean = np.nan
+        self.m2 = np.nan
+
+    def _push(self, value):
+        value = float(value)
+        dropped = None
+        if self.count < self.window:
+            self.buffer.append(value)
+        else:
+            dropped = self.buffer[self.head]
+            self.buffer[self.head] = value
+            self.head = (self.head + 1) % self.window
+        self.count += 1
+        self.nans += int(np.isnan(value)) - int(dropped is not None and np.isnan(dropped))
+
+        if self.count < self.window or self.nans:
+            return
+        if dropped is None or np.isnan(dropped) or np.isnan(self.mean) or self.head == 0:
+            self._reanchor()
+        else:
+            mean = self.mean + (value - dropped) / self.window
+            self.m2 += (value - dropped) * (value - mean + dropped - self.mean)
+            self.mean = mean
+
+    def _reanchor(self):
+        window = np.asarray(self.buffer)
+        self.mean = float(window.mean())
+        self.m2 = float(np.square(window - self.mean).sum())
+
+    def _moments(self):
+        """(mean, variance) of the current window, NaN while warming up or with a NaN inside."""
+        if self.count < self.window or self.nans or self.window <= self.ddof:
+            return np.nan, np.nan
+        return self.mean, max(self.m2, 0.0) / (self.window - self.ddof)
+
+    def _seed_window(self, values):
+        """Set the window state as if every entry of `values` had been pushed."""
+        if values.size < self.window:
+            for value in values:
+                self._push(value)
+            return
+        self.buffer = values[-self.window:].tolist()
+        self.head = 0
+        self.count = int(values.size)
+        self.nans = int(np.isnan(values[-self.window:]).sum())
+        if not self.nans:
+            self._reanchor()
+
+
+class StreamingBollinger(StreamingMoments):
+    """Bollinger Bands over a ring buffer of the last `window` closes."""
+
+    key = "bollinger"
+
+    def __init__(self, window=20, num_std=2.0):
+        self._init_window(window)
+        self.num_std = float(num_std)
+        self._value = self._bands()
+
+    def _bands(self):
+        mean, var = self._moments()
+        width = self.num_std * np.sqrt(var)
+        return {
+            f"BB_mid_{self.window}": mean,
+            f"BB_upper_{self.window}": mean + width,
+            f"BB_lower_{self.window}": mean - width,
+        }
+
+    def update(self, close, date=None):
+        self._push(close)
+        self._value = self._bands()
+        return self.value
+
+    def _seed(self, closes, dates):
+        self._seed_window(closes)
+        self._value = self._bands()
+
+
+class StreamingZScore(StreamingMoments):
+    """Rolling z-score of the latest close against the last `window` closes."""
+
+    key = "zscore"
+
+    def __init__(self, window=20):
+        self._init_window(window)
+        self._value = {f"ZSCORE_{self.window}": np.nan}
+
+    def _zscore(self, close):
+        mean, var = self._moments()
+        std = np.sqrt(var)
+        return {f"ZSCORE_{self.window}": (close - mean) / std if std > 0 else np.nan}
+
+    def update(self, close, date=None):
+        close = float(close)
+        self._push(close)
+        self._value = self._zscore(close)
+        return self.value
+
+    def _seed(self, closes, dates):
+        self._seed_window(closes)
+        self._value = self._zscore(float(closes[-1]))
+
+
+class StreamingVolatility(StreamingMoments):
+    """Annualised rolling volatility, keeping the previous close and a ring buffer of returns."""
+
+    key = "volatility"
+
+    def __init__(self, window=20, periods_per_year=252):
+        self._init_window(window, ddof=1)
+        self.periods_per_year = float(periods_per_year)
+        self.prev_close = None
+        self._value = {f"VOL_{self.window}": np.nan}
+
+    def _volatility(self):
+        _, var = self._moments()
+        return {f"VOL_{self.window}": float(np.sqrt(var) * np.sqrt(self.periods_per_year))}
+
+    def update(self, close, date=None):
+        close = float(close)
+        if self.prev_close is not None:
+            self._push(daily_returns([self.prev_close, close])[1])
+        if self.prev_close is None or not np.isnan(close):
+            self.prev_close = close
+        self._value = self._volatility()
+        return self.value
+
+    def _seed(self, closes, dates):
+        # the first return is always NaN and never enters the window
+        self._seed_window(daily_returns(closes)[1:])
+        self.prev_close = float(forward_fill(closes)[-1])
+        self._value = self._volatility()
+
+
+def _gain(high, low):
+    """Sell / buy price ratio with the batch kernels' division semantics (x / 0 = inf)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(high) / low)
+
+
+class StreamingBestTrade(StreamingIndicator):
+    """
+    Best trade profit inside the last `window` closes, as `best_trade_kernel`.
+
+    The window is a queue made of two stacks whose entries are
+    ``[price, min, max, best ratio]``, the aggregates covering the entry and every
+    entry below it. Closes are pushed on the back stack; when the front stack runs
+    empty the back stack is reversed onto it, so the front top is always the oldest
+    close. Pushing, popping and joining the two stack tops into the window's best
+    trade are amortised O(1). NaN closes enter as the last valid close and keep the
+    output NaN while they are in the window.
+    """
+
+    key = "best_trade"
+
+    def __init__(self, window=20):
+        self.window = int(window)
+        if self.window < 2:
+            raise ValueError("Window size must be at least 2")
+        self.count = 0
+        self.last_valid = 0.0
+        self.last_nan = None
+        self.front = []
+        self.back = []
+        self._value = {f"BestTrade_{self.window}": np.nan}
+
+    @staticmethod
+    def _stack(stack, price, older):
+        """Push `price` on `stack`, whose entries are all older (or all newer) than it."""
+        entry = [price, price, price, 1.0]
+        if stack:
+            _, low, high, best = stack[-1]
+            if older:
+                entry[1:] = min(low, price), max(high, price), max(best, _gain(high, price))
+            else:
+                entry[1:] = min(low, price), max(high, price), max(best, _gain(price, low))
+        stack.append(entry)
+
+    def _push(self, price):
+        self._stack(self.back, price, older=False)
+        if len(self.front) + len(self.back) > self.window:
+            if not self.front:
+                while self.back:
+                    self._stack(self.front, self.back.pop()[0], older=True)
+            self.front.pop()
+
+    def _best_trade(self):
+        if self.count < self.window or (self.last_nan is not None and self.count - self.last_nan <= self.window):
+            return {f"BestTrade_{self.window}": np.nan}
+        best = 1.0
+        if self.front:
+            best = self.front[-1][3]
+        if self.back:
+            best = max(best, self.back[-1][3])
+        if self.front and self.back:
+            best = max(best, _gain(self.back[-1][2], self.front[-1][1]))
+        return {f"BestTrade_{self.window}": (best - 1) * 100}
+
+    def update(self, close, date=None):
+        close = float(close)
+        if np.isnan(close):
+            self.last_nan = self.count
+        else:
+            self.last_valid = close
+        self.count += 1
+        self._push(self.last_valid)
+        self._value = self._best_trade()
+        return self.value
+
+    def _seed(self, closes, dates):
+        tail = _filled(closes)[-self.window:]
+        for price in tail:
+            self._push(float(price))
+        nans = np.flatnonzero(np.isnan(closes))
+        self.count = int(closes.size)
+        self.last_nan = int(nans[-1]) if nans.size else None
+        self.last_valid = float(tail[-1])
+        self._value = {f"BestTrade_{self.window}": float(best_trade_kernel(closes[-self.window:], self.window)[-1])}
+
+
+# registry key -> streaming class
+STREAMS = {
+    cls.key: cls
+    for cls in (StreamingSMA, StreamingEMA, StreamingRSI, StreamingMACD, StreamingDailyR,
+                StreamingBollinger, StreamingZScore, StreamingVolatility, StreamingBestTrade)
+}
+
+
+def stream_from_dict(data: dict) -> StreamingIndicator:
+    """Rebuild a calculator from the output of `StreamingIndicator.to_dict`."""
+    stream = STREAMS[data["key"]].__new__(STREAMS[data["key"]])
+    for name, value in data["state"].items():
+        if isinstance(value, dict) and set(value) == {"key", "state"}:
+            value = stream_from_dict(value)
+        setattr(stream, name, copy.deepcopy(value))
+    return stream
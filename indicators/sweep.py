@@ -0,0 +1,196 @@
+# indicators/sweep.py
+"""
+Parameter sweeps over registry indicators.
+
+Instead of one `apply_indicator` call per grid point, a sweep expands the grid,
+validates each combination with the registry rules and computes the whole grid
+with the batch kernels, chunk by chunk. With a `summary` only one number per
+combination is kept, and shared inputs (e.g. MACD's EMA legs) are only carried
+over to the next chunk when it reads them, so memory stays bounded by
+``chunk_size × n_rows``; a leg read again by a later chunk is recomputed.
+
+Typical usage example:
+----------------------
+    from indicators.sweep import sweep_indicator
+
+    params, matrix = sweep_indicator(df, "sma", {"window": range(5, 201)})
+    params, last = sweep_indicator(df, "rsi", {"interval": range(5, 31)}, summary="last")
+"""
+import itertools
+
+import numpy as np
+
+from .ema import ema_kernel, first_valid_index, nan_mean
+from .filters import exponential_smooth
+from .registry import INDICATORS, SharedInputs, _validate_params
+from .rsi import rsi_kernel
+from .sma import sma_kernel
+
+SUMMARIES = ("last", "crossovers")
+
+
+def expand_grid(key: str, grid: dict) -> list:
+    """
+    Expand a parameter grid into a list of merged parameter dicts.
+
+    Parameters not in `grid` take the indicator defaults. Combinations rejected by
+    the registry validation (e.g. MACD ``fast_period >= slow_period``) are skipped.
+    """
+    spec = INDICATORS.get(key)
+    if spec is None:
+        raise ValueError(f"Unknown indicator: {key}")
+
+    names = list(grid)
+    combos = []
+    for values in itertools.product(*(list(grid[name]) for name in names)):
+        merged_params = {**spec["default_params"], **dict(zip(names, values))}
+        try:
+            _validate_params(key, merged_params)
+        except ValueError:
+            continue
+        combos.append(merged_params)
+    return combos
+
+
+def _sweep_sma(shared, chunk, output):
+    return sma_kernel(shared.close, [int(p["window"]) for p in chunk])
+
+
+def _sweep_ema(shared, chunk, output):
+    return ema_kernel(
+        shared.close, [int(p["interval"]) for p in chunk], [float(p.get("smoothing", 2.0)) for p in chunk]
+    )
+
+
+def _sweep_rsi(shared, chunk, output):
+    return rsi_kernel(shared.close, [int(p["interval"]) for p in chunk], differences=shared.differences())
+
+
+def _sweep_macd(shared, chunk, output):
+    periods = [(int(p["fast_period"]), int(p["slow_period"]), int(p["signal_period"])) for p in chunk]
+    # every distinct fast/slow leg is filtered once per sweep, or once per run of
+    # consecutive chunks reading it in summary mode (see `sweep_indicator`)
+    emas = shared.emas([(period, 2.0) for f, s, _ in periods for period in (f, s)])
+    macd_lines = np.stack([emas[(f, 2.0)] - emas[(s, 2.0)] for f, s, _ in periods])
+    if output == "MACD":
+        return macd_lines
+
+    # signal lines whose MACD line starts at the same row with the same signal period
+    # are seeded and filtered together as one 2-D block
+    signal_lines = np.full_like(macd_lines, np.nan)
+    groups = {}
+    for row, (_, _, signal) in enumerate(periods):
+        groups.setdefault((first_valid_index(macd_lines[row]), signal), []).append(row)
+    for (macd_start, signal), rows in groups.items():
+        seed_end = macd_start + signal
+        if seed_end > shared.close.size:
+            continue
+        seeds = nan_mean(macd_lines[rows, macd_start:seed_end])
+        signal_lines[rows, seed_end - 1] = seeds
+        signal_lines[rows, seed_end:] = exponential_smooth(macd_lines[rows, seed_end:], 2.0 / (signal + 1), seeds)
+
+    if output == "MACD_signal":
+        return signal_lines
+    return macd_lines - signal_lines
+
+
+# key -> (sweep kernel, available outputs (first is the default), default crossover level)
+# a level of None means crossovers are counted against the close price
+SWEEP_KERNELS = {
+    "sma": (_sweep_sma, ("SMA",), None),
+    "ema": (_sweep_ema, ("EMA",), None),
+    "rsi": (_sweep_rsi, ("RSI",), 50.0),
+    "macd": (_sweep_macd, ("MACD_hist", "MACD", "MACD_signal"), 0.0),
+}
+
+
+def count_crossovers(block, reference) -> np.ndarray:
+    """
+    Count sign changes of ``block - reference`` along each row.
+
+    NaNs and exact touches (difference 0) carry the previous sign forward, so a
+    move through the reference counts once and warm-up NaNs never count.
+    """
+    signs = np.sign(block - reference)
+    signs[np.isnan(signs)] = 0
+    positions = np.where(signs != 0, np.arange(signs.shape[-1]), 0)
+    np.maximum.accumulate(positions, axis=-1, out=positions)
+    carried = np.take_along_axis(signs, positions, axis=-1)
+    return np.count_nonzero((carried[..., 1:] * carried[..., :-1]) < 0, axis=-1)
+
+
+def sweep_indicator(df, key: str, grid: dict, output: str | None = None,
+                    summary: str | None = None, level: float | None = None, chunk_size: int = 64):
+    """
+    Evaluate an indicator over a whole parameter grid.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Input DataFrame containing price data (must include at least `'Close'`).
+    key : str
+        Indicator name, one of ``'sma'``, ``'ema'``, ``'rsi'`` or ``'macd'``.
+    grid : dict
+        Parameter name -> iterable of values, e.g. ``{"fast_period": range(5, 15), "slow_period": [26, 30]}``.
+        The cartesian product is evaluated; see `expand_grid`.
+    output : str, optional
+        Which series to return for multi-output indicators (MACD: ``'MACD_hist'`` (default),
+        ``'MACD'`` or ``'MACD_signal'``).
+    summary : str, optional
+        ``None`` returns the full matrix. ``'last'`` keeps only the final value per
+        combination; ``'crossovers'`` counts how often the series crosses `level`.
+    level : float, optional
+        Crossover reference. Defaults to the close price for SMA/EMA, 50 for RSI and 0 for MACD.
+    chunk_size : int
+        Number of combinations computed at once. In summary mode memory is bounded by
+        ``chunk_size × n_rows`` (chunk block plus the inputs it shares with the next
+        chunk); larger chunks recompute fewer MACD legs.
+
+    Returns
+    -------
+    (list of dict, numpy.ndarray)
+        The evaluated parameter combinations and either an ``(n_params, n_rows)``
+        matrix or, with a summary, an ``(n_params,)`` vector aligned with them.
+
+    Raises
+    ------
+    ValueError
+        If the key cannot be swept, or the output / summary name is unknown.
+    """
+    if key not in SWEEP_KERNELS:
+        raise ValueError(f"Sweeps are not supported for indicator: {key}")
+    kernel, outputs, default_level = SWEEP_KERNELS[key]
+    output = output or outputs[0]
+    if output not in outputs:
+        raise ValueError(f"Unknown output '{output}' for indicator '{key}'. Choose from {outputs}.")
+    if summary is not None and summary not in SUMMARIES:
+        raise ValueError(f"Unknown summary '{summary}'. Choose from {SUMMARIES}.")
+
+    combos = expand_grid(key, grid)
+    shared = SharedInputs(df["Close"].to_numpy(dtype=np.float64))
+    n = shared.close.size
+
+    if summary is None:
+        result = np.empty((len(combos), n))
+    else:
+        result = np.empty(len(combos))
+    if level is None:
+        level = default_level
+    reference = shared.close if level is None else level
+    inputs = INDICATORS[key]["inputs"]
+
+    for begin in range(0, len(combos), chunk_size):
+        chunk = combos[begin:begin + chunk_size]
+        block = kernel(shared, chunk, output)
+        if summary is None:
+            result[begin:begin + len(chunk)] = block
+        elif summary == "last":
+            result[begin:begin + len(chunk)] = block[:, -1] if n else np.nan
+        else:
+            result[begin:begin + len(chunk)] = count_crossovers(block, reference)
+        if summary is not None:
+            # keep only the shared nodes the next chunk reads, the rest would outgrow the chunk
+            upcoming = combos[begin + chunk_size:begin + 2 * chunk_size]
+            shared.retain([ref for p in upcoming for ref in inputs(p)])
+
+    return combos, result
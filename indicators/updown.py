@@ -1,4 +1,7 @@
 import pandas as pd
+import numpy as np
+
+from . import backends
 
 def timestamp_to_words(timestamp: str):
     try:
@@ -17,6 +20,120 @@ def timestamp_to_words(timestamp: str):
         return timestamp
 
 
+def streak_breaks(values, tolerance: int = 1, threshold: float = 0.5):
+    """
+    Mark the moves that break an upward/downward streak.
+
+    Both directions are resolved together on (2, n) masks, row 0 being "up" and row 1
+    "down". Every change is classified as same, flat, small-opposite or large-opposite.
+    Tolerance is then resolved per run of small-opposite moves: a run starts after any
+    same-direction or large move (flats do not interrupt it), and inside it every
+    (tolerance + 1)-th small move breaks the streak. The ``"numba"`` kernel backend
+    runs the same rules as a compiled day-by-day loop (see `backends.streak_break_rows`).
+
+    Returns
+    -------
+    breaks : np.ndarray
+        Boolean (2, n) array, True where the move ends the current streak (and is not part of it).
+    small_rank : np.ndarray
+        Integer (2, n) array, number of small opposite moves in the current run up to each point.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if backends.get_backend() == "numba":
+        breaks = np.zeros((2, values.size), dtype=bool)
+        small_rank = np.zeros((2, values.size), dtype=np.int64)
+        backends.streak_break_rows(
+            np.ascontiguousarray(values), int(np.ceil(tolerance)), float(threshold), breaks, small_rank
+        )
+        return breaks, small_rank
+
+    magnitude = np.abs(values)
+    flat = magnitude < 1e-9
+    rising, falling = values > 0, values < 0
+
+    same = np.stack([rising, falling])
+    opposite = np.stack([falling, rising]) & ~flat
+    large = opposite & (magnitude > threshold)
+    small = opposite & ~large
+
+    # rank of each small opposite move within its run (runs reset on same/large moves)
+    small_count = np.cumsum(small, axis=1)
+    run_base = np.maximum.accumulate(np.where(same | large, small_count, 0), axis=1)
+    small_rank = small_count - run_base
+    breaks = large | (small & (small_rank % (int(np.ceil(tolerance)) + 1) == 0))
+    return breaks, small_rank
+
+
+def longest_streaks(values, tolerance: int = 1, threshold: float = 0.5):
+    """
+    Locate the longest upward and downward streaks of a 1-D array of percent changes.
+
+    Streaks are the gaps between the breaking moves found by `streak_breaks`.
+
+    Returns
+    -------
+    lengths, starts, ends : np.ndarray
+        Integer arrays of shape (2,) for [up, down]; starts/ends are -1 when no streak exists.
+        Ties keep the earliest streak.
+    """
+    n = len(values)
+    breaks, _ = streak_breaks(values, tolerance, threshold)
+
+    lengths = np.zeros(2, dtype=int)
+    starts = np.full(2, -1)
+    ends = np.full(2, -1)
+    for row in range(2):
+        bounds = np.concatenate(([-1], np.flatnonzero(breaks[row]), [n]))
+        gaps = np.diff(bounds) - 1
+        best = int(np.argmax(gaps))
+        if gaps[best] > 0:
+            lengths[row] = gaps[best]
+            starts[row] = bounds[best] + 1
+            ends[row] = bounds[best + 1] - 1
+
+    return lengths, starts, ends
+
+
+def streak_state(values, tolerance: int = 1, threshold: float = 0.5):
+    """
+    State of the day-by-day streak rules after the last value, for resuming them one move at a time.
+
+    Returns
+    -------
+    list of dict
+        One dict per direction ([up, down]) with:
+            - current / start     : Length and start position of the open streak (start None if empty)
+            - tol_left            : Tolerance left for small opposite moves in the open streak
+            - best / best_start / best_end : Longest streak closed so far (positions None if none)
+    """
+    n = len(values)
+    breaks, small_rank = streak_breaks(values, tolerance, threshold)
+    allowed = int(np.ceil(tolerance))
+
+    states = []
+    for row in range(2):
+        positions = np.flatnonzero(breaks[row])
+        last_break = int(positions[-1]) if positions.size else -1
+        current = n - 1 - last_break
+
+        # closed streaks are the gaps before each break
+        bounds = np.concatenate(([-1], positions))
+        gaps = np.diff(bounds) - 1
+        best = int(np.argmax(gaps)) if gaps.size else 0
+        closed = gaps.size and gaps[best] > 0
+
+        used = int(small_rank[row, -1]) % (allowed + 1) if n else 0
+        states.append({
+            "current": current,
+            "start": last_break + 1 if current > 0 else None,
+            "tol_left": tolerance - used if tolerance > 0 else tolerance,
+            "best": int(gaps[best]) if closed else 0,
+            "best_start": int(bounds[best]) + 1 if closed else None,
+            "best_end": int(bounds[best + 1]) - 1 if closed else None,
+        })
+    return states
+
+
 def calculate_updown(pct_changes: pd.Series, tolerance: int = 1, threshold: float = 0.5):
     """
     Calculate the longest upward and downward streaks in daily percent changes.
@@ -40,97 +157,18 @@ def calculate_updown(pct_changes: pd.Series, tolerance: int = 1, threshold: floa
         raise ValueError("tolerance must be >= 0")
 
     pct = pct_changes.dropna()
-    n = len(pct)
-    values = pct.values
     idx = pct.index
 
-    def calc(direction: str):
-        current = 0
-        max_streak = 0
-        tol_left = tolerance
-        current_start = None
-        best_start = None
-        best_end = None
-
-        for i, v in enumerate(values):
-            # Determine direction
-            if direction == "up":
-                same_dir = v > 0
-                opposite_dir = v < 0
-            else:  # down
-                same_dir = v < 0
-                opposite_dir = v > 0
-
-            # --- Same direction ---
-            if same_dir:
-                if current == 0:
-                    current_start = i
-                current += 1
-                tol_left = tolerance  # reset tolerance
-                continue
-
-            # --- Flat (0%) ---
-            if abs(v) < 1e-9:
-                if current == 0:
-                    current_start = i
-                current += 1
-                continue
-
-            # --- Opposite direction ---
-            if opposite_dir:
-                if abs(v) > threshold:
-                    # Big opposite move breaks streak
-                    if current > max_streak:
-                        max_streak = current
-                        best_start = current_start
-                        best_end = i - 1
-                    current = 0
-                    tol_left = tolerance
-                    current_start = None
-                    continue
-
-                # Handle small opposite move
-                if tolerance == 0:
-                    # No forgiveness allowed — break immediately
-                    if current > max_streak:
-                        max_streak = current
-                        best_start = current_start
-                        best_end = i - 1
-                    current = 0
-                    current_start = None
-                    continue
-
-                # Consume tolerance if available
-                if tol_left > 0:
-                    if current == 0:
-                        current_start = i
-                    current += 1
-                    tol_left -= 1
-                else:
-                    if current > max_streak:
-                        max_streak = current
-                        best_start = current_start
-                        best_end = i - 1
-                    current = 0
-                    tol_left = tolerance
-                    current_start = None
-
-        # Finalize last streak
-        if current > max_streak:
-            max_streak = current
-            best_start = current_start
-            best_end = n - 1
-
-        if best_start is None:
-            return 0, None, None
+    lengths, starts, ends = longest_streaks(pct.values, tolerance, threshold)
 
-        start_date = timestamp_to_words(idx[best_start])
-        end_date = timestamp_to_words(idx[best_end])
-        return max_streak, start_date, end_date
+    def describe(row: int):
+        if lengths[row] == 0:
+            return 0, None, None
+        return int(lengths[row]), timestamp_to_words(idx[starts[row]]), timestamp_to_words(idx[ends[row]])
 
     # Compute both
-    up_len, up_start, up_end = calc("up")
-    down_len, down_start, down_end = calc("down")
+    up_len, up_start, up_end = describe(0)
+    down_len, down_start, down_end = describe(1)
 
     return {
         "up_streak": up_len,
@@ -139,4 +177,4 @@ def calculate_updown(pct_changes: pd.Series, tolerance: int = 1, threshold: floa
         "down_streak": down_len,
         "down_start": down_start,
         "down_end": down_end,
-    }
\ No newline at end of file
+    }
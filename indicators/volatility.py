@@ -0,0 +1,60 @@
+import pandas as pd
+import numpy as np
+
+from .buffers import output_block
+from .dailyr import daily_returns
+from .rolling import rolling_moments
+
+def volatility_kernel(values, window = 20, periods_per_year = 252, returns = None, out = None):
+    """ Computes the annualised rolling volatility of close-to-close returns
+
+    The sample standard deviation of the daily percent returns over each window, scaled by
+    sqrt(periods_per_year). The first return is NaN, so the first value appears at row `window`.
+
+    Args:
+        values (array-like): 1-D close prices
+        window (int): number of returns per window, defaults to 20
+        periods_per_year (float): bars per year used to annualise, defaults to 252 (trading days)
+        returns (np.ndarray): precomputed daily_returns(values) to reuse, computed when omitted
+        out (np.ndarray): preallocated float64 (len(values),) buffer to write into
+
+    Returns:
+        volatility (np.ndarray): float array of len(values), annualised volatility in percent
+    """
+    if window < 2:
+        raise ValueError("Window size must be at least 2")
+    values = np.asarray(values, dtype=np.float64)
+    volatility = output_block(out, (values.size,))
+    if returns is None:
+        returns = daily_returns(values)
+
+    _, var = rolling_moments(returns, window, ddof=1)
+    np.multiply(np.sqrt(var), np.sqrt(periods_per_year), out=volatility)
+    return volatility
+
+def calculate_volatility(df, window = 20, periods_per_year = 252):
+    """ Measures how much the daily returns have been swinging, expressed per year
+
+    Args:
+        df (pd.DataFrame): stock data containing a 'Close' column
+        window (int): the amount of daily returns per value, defaults to 20
+        periods_per_year (float): bars per year used to annualise, defaults to 252
+
+    Returns:
+        df (pd.DataFrame): input frame with an added VOL_<window> column (annualised, in percent)
+    """
+    data = df["Close"]
+
+    # validating invalid inputs
+    if window < 2:
+        raise ValueError("Window size must be at least 2")
+    if periods_per_year <= 0:
+        raise ValueError("Periods per year must be positive")
+    if data.size <= window:
+        raise IndexError(f'Insufficient data, only {data.size} points selected for window size of {window}')
+
+    # handles float inputs
+    window = int(window)
+
+    df[f'VOL_{window}'] = volatility_kernel(data.to_numpy(dtype=np.float64), window, periods_per_year)
+    return df
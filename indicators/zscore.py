@@ -0,0 +1,53 @@
+import pandas as pd
+import numpy as np
+
+from .buffers import output_block
+from .rolling import rolling_moments
+
+def zscore_kernel(values, window = 20, moments = None, out = None):
+    """ Computes how many rolling (population) standard deviations each close sits from its rolling mean
+
+    Uses the same moments as the Bollinger Bands, so a z-score of +/-2 lies exactly on the
+    default bands. Flat windows (zero deviation) give NaN.
+
+    Args:
+        values (array-like): 1-D close prices
+        window (int): rolling window size, defaults to 20
+        moments (tuple[np.ndarray, np.ndarray]): already computed (mean, var) rows (ddof=0)
+            to reuse instead of recomputing them
+        out (np.ndarray): preallocated float64 (len(values),) buffer to write into
+
+    Returns:
+        zscores (np.ndarray): float array of len(values), NaN for the first window - 1 entries
+    """
+    values = np.asarray(values, dtype=np.float64)
+    zscores = output_block(out, (values.size,))
+
+    mean, var = rolling_moments(values, window) if moments is None else moments
+    std = np.sqrt(var)
+    np.divide(values - mean, std, out=zscores, where=std > 0)
+    return zscores
+
+def calculate_zscore(df, window = 20):
+    """ Measures how stretched the closing price is relative to its recent average
+
+    Args:
+        df (pd.DataFrame): stock data containing a 'Close' column
+        window (int): the amount of data points per rolling mean/deviation, defaults to 20
+
+    Returns:
+        df (pd.DataFrame): input frame with an added ZSCORE_<window> column
+    """
+    data = df["Close"]
+
+    # validating invalid inputs
+    if window < 1:
+        raise ValueError("Window size must be at least 1")
+    if data.size < window:
+        raise IndexError(f'Insufficient data, only {data.size} points selected for window size of {window}')
+
+    # handles float inputs
+    window = int(window)
+
+    df[f'ZSCORE_{window}'] = zscore_kernel(data.to_numpy(dtype=np.float64), window)
+    return df
@@ -33,7 +33,12 @@ def _ensure_date_index(df: pd.DataFrame):
             df = df.reset_index()
         else:
             raise ValueError("DataFrame must contain a 'Date' column")
-    df = df.sort_values("Date").reset_index(drop=True)
+    if df["Date"].is_monotonic_increasing:
+        # already in order: share the column data instead of sorting into a copy
+        df = df.copy(deep=False)
+        df.index = pd.RangeIndex(len(df))
+    else:
+        df = df.sort_values("Date").reset_index(drop=True)
     return df
 #========================================= Presets =========================================#
 
@@ -43,13 +48,16 @@ def plot_close_prices(
     labels: List[str],
     indicator_key: str | None = None,
     indicator_params: dict | None = None,
+    max_profits: List[dict] | None = None,
+    streak_infos: List[dict] | None = None,
 ) -> str:
     """
     Generate an interactive Plotly chart for stock prices and indicators.
 
     This function takes one or more price DataFrames, applies optional technical indicators,
     and returns an HTML string containing an interactive Plotly plot.  
-    The plot supports overlays like SMA, EMA, RSI, MACD, and Daily Returns visualization.
+    The plot supports overlays like SMA, EMA, Bollinger Bands, RSI, MACD, rolling volatility,
+    rolling z-score, rolling best trade and Daily Returns visualization.
 
     Parameters
     ----------
@@ -63,10 +71,20 @@ def plot_close_prices(
         - ``'ema'`` : Exponential Moving Average
         - ``'rsi'`` : Relative Strength Index
         - ``'macd'`` : Moving Average Convergence Divergence
+        - ``'bollinger'`` : Bollinger Bands
+        - ``'volatility'`` : Annualised rolling volatility
+        - ``'zscore'`` : Rolling z-score of the close
+        - ``'best_trade'`` : Best trade profit inside each trailing window
         - ``'dailyr'`` : Daily Returns visualization
         - ``None`` : Plot raw close prices only.
     indicator_params : dict, optional
         Extra parameters passed to indicator computation (e.g., window size, period, etc.).
+    max_profits : list of dict, optional
+        One max-profit result per DataFrame (see ``indicators.dailyr.calculate_max_profit``),
+        drawn as one Buy → Sell window per trade in ``'dailyr'`` mode. ``None`` entries are skipped.
+    streak_infos : list of dict, optional
+        One up/down streak result per DataFrame (see ``indicators.updown.calculate_updown``),
+        already computed alongside DailyR. Missing entries are computed here.
 
     Returns
     -------
@@ -79,7 +97,7 @@ def plot_close_prices(
     - The function dynamically adjusts subplot layout depending on the indicator.
     - For ``'dailyr'`` mode, positive and negative returns are color-coded (green/red),
       and a hover tooltip summarizes each day’s change.
-    - RSI and MACD modes add secondary plots below the price chart.
+    - RSI, MACD, volatility, z-score and best-trade modes add secondary plots below the price chart.
     - A small checkbox control panel is inserted above the plot (for non-dailyr modes)
       to toggle visibility of traces interactively.
     """
@@ -101,7 +119,8 @@ def plot_close_prices(
         clean_dfs : list of pd.DataFrame
             List of preprocessed DataFrames ready for plotting.
         """
-        dfc = _ensure_date_index(df.copy())
+        # new frame sharing df's column data; columns added below never touch df
+        dfc = _ensure_date_index(df)
         # Convert date to string or to datetime is fine for plotly
         if not pd.api.types.is_datetime64_any_dtype(dfc["Date"]):
             dfc["Date"] = pd.to_datetime(dfc["Date"], errors="coerce", utc=True)
@@ -109,11 +128,11 @@ def plot_close_prices(
 
 #========================================= Create Layout Based on Key Type =========================================#
     # Choose layout depending on indicator
-    if indicator_key in ("rsi", "macd"):
+    if indicator_key in ("rsi", "macd", "volatility", "zscore", "best_trade"):
         """
         Decide subplot configuration based on the selected indicator.
 
-        - RSI and MACD require two rows (main price chart + indicator below).
+        - RSI, MACD, volatility, z-score and best trade require two rows (main price chart + indicator below).
         - Other indicators or plain Close plots use a single row.
         """
         fig = make_subplots(
@@ -195,6 +214,106 @@ def plot_close_prices(
                     col=1,
                 )
 
+#========================================= Bollinger Bands =========================================#
+    elif indicator_key == "bollinger":
+        """
+        Plot Bollinger Bands as an overlay on the price chart.
+
+        Expected Columns
+        ----------------
+        - BB_mid_<window>
+        - BB_upper_<window>
+        - BB_lower_<window>
+
+        Behavior
+        --------
+        - Dashed middle band (rolling mean).
+        - Upper and lower bands drawn as thin lines with the area between them shaded.
+        """
+        window = int(indicator_params.get("window", 20))
+        mid_col, upper_col, lower_col = (f"BB_{band}_{window}" for band in ("mid", "upper", "lower"))
+        for df, label in zip(clean_dfs, labels):
+            if all(col in df.columns for col in (mid_col, upper_col, lower_col)):
+                fig.add_trace(
+                    go.Scatter(
+                        x=df["Date"],
+                        y=df[upper_col],
+                        mode="lines",
+                        line=dict(width=1),
+                        name=f"{label} {upper_col}",
+                        hovertemplate="%{x}<br>%{y:.2f}<extra></extra>",
+                    ),
+                    row=1,
+                    col=1,
+                )
+                fig.add_trace(
+                    go.Scatter(
+                        x=df["Date"],
+                        y=df[lower_col],
+                        mode="lines",
+                        line=dict(width=1),
+                        fill="tonexty",
+                        fillcolor="rgba(100,149,237,0.12)",
+                        name=f"{label} {lower_col}",
+                        hovertemplate="%{x}<br>%{y:.2f}<extra></extra>",
+                    ),
+                    row=1,
+                    col=1,
+                )
+                fig.add_trace(
+                    go.Scatter(
+                        x=df["Date"],
+                        y=df[mid_col],
+                        mode="lines",
+                        line=dict(dash="dash", width=1),
+                        name=f"{label} {mid_col}",
+                        hovertemplate="%{x}<br>%{y:.2f}<extra></extra>",
+                    ),
+                    row=1,
+                    col=1,
+                )
+
+#========================================= Volatility, Z-Score & Best Trade =========================================#
+    elif indicator_key in ("volatility", "zscore", "best_trade"):
+        """
+        Plot rolling volatility, rolling z-score or the rolling best trade in the second subplot.
+
+        Expected Columns
+        ----------------
+        - VOL_<window>       (annualised volatility, in percent)
+        - ZSCORE_<window>    (deviations from the rolling mean)
+        - BestTrade_<window> (best buy/sell profit inside the window, in percent)
+
+        Behavior
+        --------
+        - One line per dataset.
+        - Z-score mode adds dashed guide lines at +2 / -2 (the default Bollinger Bands).
+        """
+        window = int(indicator_params.get("window", 20))
+        prefix = {"volatility": "VOL", "zscore": "ZSCORE", "best_trade": "BestTrade"}[indicator_key]
+        colname = f"{prefix}_{window}"
+        for df, label in zip(clean_dfs, labels):
+            if colname in df.columns:
+                fig.add_trace(
+                    go.Scatter(
+                        x=df["Date"],
+                        y=df[colname],
+                        mode="lines",
+                        name=f"{label} {colname}",
+                        hovertemplate="%{x}<br>%{y:.2f}<extra></extra>",
+                    ),
+                    row=2,
+                    col=1,
+                )
+        if indicator_key == "zscore":
+            fig.add_hline(y=2, line_dash="dash", row=2, col=1)
+            fig.add_hline(y=-2, line_dash="dash", row=2, col=1)
+            fig.update_yaxes(title_text="Z-Score", row=2, col=1)
+        elif indicator_key == "best_trade":
+            fig.update_yaxes(title_text=f"Best {window}-day trade (%)", row=2, col=1)
+        else:
+            fig.update_yaxes(title_text="Volatility (%/yr)", row=2, col=1)
+
 #========================================= RSI =========================================#
     elif indicator_key == "rsi":
         """
@@ -298,20 +417,14 @@ def plot_close_prices(
         2. Draw color-changing line segments (visual only).
         3. Add an invisible overlay line for hover info with
         stylized tooltips (white box, black border).
-        4. Optionally highlight Max Profit range (Buy → Sell window).
+        4. Optionally highlight the Max Profit trades (one Buy → Sell window each).
 
         Output
         ------
         - The y-axis title is updated to "Close Price (colored by Daily Return)".
         """
-        for df, label in zip(clean_dfs, labels):
-            # Extract info for calculations from df's Info column
-            try:
-                info = df.pop('Info')   # pop out column for a cleaner df
-            except Exception as e:
-                print('Updown plotting fail:', e)
-                info = False
-
+        profits = max_profits or [None] * len(clean_dfs)
+        for df, label, profit in zip(clean_dfs, labels, profits):
             # --- Color coding ---
             if "DailyR" not in df.columns:
                 print("Daily Returns cannot be found.")
@@ -380,13 +493,20 @@ def plot_close_prices(
                 col=1,
             )
 
-            # --- Max Profit annotation ---
+            # --- Max Profit annotation (one window per trade) ---
             try:
-                buy_date, sell_date, buy_price, sell_price, price_diff, profit_pct = info.head(6).tolist()
-                buy_date = pd.Timestamp(buy_date)
-                sell_date = pd.Timestamp(sell_date)
+                trades = profit.get("trades")
+                if trades is None:
+                    trades = [profit] if profit["price_diff"] > 0 else []
+                many = len(trades) > 1
+
+                for number, trade in enumerate(trades, start=1):
+                    buy_date = pd.Timestamp(trade["buy_date"])
+                    sell_date = pd.Timestamp(trade["sell_date"])
+                    buy_price, sell_price = trade["buy_price"], trade["sell_price"]
+                    if pd.isna(buy_date) or pd.isna(sell_date) or buy_date == sell_date:
+                        continue
 
-                if pd.notna(buy_date) and pd.notna(sell_date) and buy_date != sell_date:
                     fig.add_shape(
                         type="rect",
                         x0=buy_date,
@@ -398,14 +518,56 @@ def plot_close_prices(
                         layer="below",
                     )
 
+                    if many:
+                        # hover card per window, a fixed annotation each would cover the chart
+                        fig.add_trace(
+                            go.Scatter(
+                                meta={'component': 'trades'},
+                                x=[sell_date],
+                                y=[sell_price],
+                                mode="markers",
+                                marker=dict(color="green", size=8, symbol="triangle-down"),
+                                showlegend=False,
+                                hovertemplate=(
+                                    f"💰 <b>Trade {number}/{len(trades)}</b><br>"
+                                    f"Buy: {buy_date.date()} @ ${buy_price:.2f}<br>"
+                                    f"Sell: {sell_date.date()} @ ${sell_price:.2f}<br>"
+                                    f"Gain: <b>{trade['profit_pct']:.2f}% (${trade['price_diff']:.2f})</b><br>"
+                                    f"Cumulative: {trade['cumulative_pct']:.2f}% (${trade['cumulative_diff']:.2f})"
+                                    "<extra></extra>"
+                                ),
+                            ),
+                            row=1,
+                            col=1,
+                        )
+                        continue
+
                     fig.add_annotation(
                         x=sell_date,
                         y=sell_price,
                         text=(
                             f"💰 <b>Max Profit</b><br>"
-                            f"Buy: {pd.to_datetime(buy_date).date()} @ ${buy_price:.2f}<br>"
-                            f"Sell: {pd.to_datetime(sell_date).date()} @ ${sell_price:.2f}<br>"
-                            f"Gain: <b>{profit_pct:.2f}% (${price_diff:.2f})</b>"
+                            f"Buy: {buy_date.date()} @ ${buy_price:.2f}<br>"
+                            f"Sell: {sell_date.date()} @ ${sell_price:.2f}<br>"
+                            f"Gain: <b>{trade['profit_pct']:.2f}% (${trade['price_diff']:.2f})</b>"
+                        ),
+                        showarrow=True,
+                        arrowhead=2,
+                        ax=0,
+                        ay=-60,
+                        bgcolor="rgba(255,255,255,0.9)",
+                        bordercolor="green",
+                        borderwidth=1,
+                        font=dict(color="green", size=12),
+                    )
+
+                if many:
+                    fig.add_annotation(
+                        x=pd.Timestamp(trades[-1]["sell_date"]),
+                        y=trades[-1]["sell_price"],
+                        text=(
+                            f"💰 <b>Max Profit ({len(trades)} trades)</b><br>"
+                            f"Total: <b>{profit['total_pct']:.2f}% (${profit['total_diff']:.2f})</b>"
                         ),
                         showarrow=True,
                         arrowhead=2,
@@ -447,13 +609,14 @@ def plot_close_prices(
             tolerance = indicator_params.get("tolerance", 0)
             threshold = indicator_params.get("threshold", 0)
 
-            for df, label in zip(clean_dfs, labels):
-                # Ensure we have Daily Return computed
-                if "DailyR" not in df.columns:
-                    df["DailyR"] = df["Close"].pct_change() * 100
+            for df, label, streaks in zip(clean_dfs, labels, streak_infos or [None] * len(clean_dfs)):
+                if streaks is None:
+                    # Ensure we have Daily Return computed
+                    if "DailyR" not in df.columns:
+                        df["DailyR"] = df["Close"].pct_change() * 100
 
-                # Calculate streak info
-                streaks = calculate_updown(df.set_index("Date")["DailyR"], tolerance, threshold)
+                    # Calculate streak info
+                    streaks = calculate_updown(df.set_index("Date")["DailyR"], tolerance, threshold)
 
                 # Convert start/end timestamps back to datetime
                 up_start = pd.to_datetime(streaks["up_start"], errors="coerce")
@@ -559,4 +722,138 @@ def plot_close_prices(
 
     # Return HTML fragment; post_script will be injected with the correct plot div id.
     # include_plotlyjs="cdn" keeps the same behaviour as before (loads plotly from CDN)
-    return pio.to_html(fig, full_html=False, include_plotlyjs="cdn", post_script=post_script)
\ No newline at end of file
+    return pio.to_html(fig, full_html=False, include_plotlyjs="cdn", post_script=post_script)
+
+#========================================= Backtest Results =========================================#
+def plot_backtest(df: pd.DataFrame, label: str, results: List[dict]) -> str:
+    """
+    Generate an interactive Plotly chart for backtest results of one price series.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Price data the strategies ran on, with 'Date' and 'Close' columns.
+    label : str
+        Ticker / dataset label for the legend.
+    results : list of dict
+        Output of ``indicators.backtest.run_backtests`` (or ``backtest_grid``), all
+        computed on `df`.
+
+    Returns
+    -------
+    str
+        HTML fragment containing the generated Plotly figure.
+
+    Notes
+    -----
+    - Row 1: close price with ▲ entries and ▼ exits of every strategy.
+    - Row 2: equity curves (growth of 1 unit) plus buy-and-hold for reference.
+    - Row 3: drawdowns in percent below each curve's running peak.
+    """
+    dfc = _ensure_date_index(df)
+    if not pd.api.types.is_datetime64_any_dtype(dfc["Date"]):
+        dfc["Date"] = pd.to_datetime(dfc["Date"], errors="coerce", utc=True)
+    dates = dfc["Date"]
+
+    fig = make_subplots(
+        rows=3,
+        cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.06,
+        row_heights=[0.45, 0.35, 0.2],
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=dates,
+            y=dfc["Close"],
+            mode="lines",
+            name=f"{label} Close",
+            hovertemplate="%{x|%Y-%m-%d}<br>Close: %{y:.2f}<extra></extra>",
+        ),
+        row=1,
+        col=1,
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=dates,
+            y=dfc["Close"] / dfc["Close"].iloc[0],
+            mode="lines",
+            line=dict(color="gray", dash="dot"),
+            name="Buy & hold",
+            hovertemplate="%{x|%Y-%m-%d}<br>%{y:.3f}<extra></extra>",
+        ),
+        row=2,
+        col=1,
+    )
+
+    for result in results:
+        params = ", ".join(f"{k}={v}" for k, v in result["params"].items())
+        name = f"{result['strategy']} ({params})"
+        entries = [trade["entry_index"] for trade in result["trades"]]
+        exits = [trade["exit_index"] for trade in result["trades"] if not trade["open"]]
+
+        fig.add_trace(
+            go.Scatter(
+                x=dates.iloc[entries],
+                y=dfc["Close"].iloc[entries],
+                mode="markers",
+                marker=dict(symbol="triangle-up", color="green", size=9),
+                name=f"{name} entry",
+                legendgroup=name,
+                hovertemplate="%{x|%Y-%m-%d}<br>Buy @ %{y:.2f}<extra></extra>",
+            ),
+            row=1,
+            col=1,
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=dates.iloc[exits],
+                y=dfc["Close"].iloc[exits],
+                mode="markers",
+                marker=dict(symbol="triangle-down", color="red", size=9),
+                name=f"{name} exit",
+                legendgroup=name,
+                hovertemplate="%{x|%Y-%m-%d}<br>Sell @ %{y:.2f}<extra></extra>",
+            ),
+            row=1,
+            col=1,
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=result["equity"],
+                mode="lines",
+                name=name,
+                legendgroup=name,
+                hovertemplate="%{x|%Y-%m-%d}<br>%{y:.3f}<extra></extra>",
+            ),
+            row=2,
+            col=1,
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=result["drawdown"] * 100,
+                mode="lines",
+                fill="tozeroy",
+                name=f"{name} drawdown",
+                legendgroup=name,
+                showlegend=False,
+                hovertemplate="%{x|%Y-%m-%d}<br>%{y:.2f}%<extra></extra>",
+            ),
+            row=3,
+            col=1,
+        )
+
+    fig.update_yaxes(title_text="Close", row=1, col=1)
+    fig.update_yaxes(title_text="Equity", row=2, col=1)
+    fig.update_yaxes(title_text="Drawdown %", row=3, col=1)
+    fig.update_layout(
+        height=850,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+        margin=dict(l=50, r=20, t=50, b=50),
+        template="plotly_white",
+    )
+    fig.update_xaxes(rangeslider_visible=False, showspikes=True, spikemode='across', spikethickness=1)
+    return pio.to_html(fig, full_html=False, include_plotlyjs="cdn")
@@ -0,0 +1,32 @@
+import pytest
+import data.fetch as fetch
+import data.providers as providers
+
+pytest.importorskip("vaderSentiment")
+import app as webapp
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Flask test client on the fixture provider, plots captured instead of rendered."""
+    monkeypatch.setattr(providers, "_active", None)
+    monkeypatch.setattr(fetch, "_store", None)
+    monkeypatch.setattr(fetch, "DEFAULT_ROOT", tmp_path)
+    providers.set_provider("fixture")
+    monkeypatch.setattr(webapp, "ticker_cache", {})
+    plotted = []
+    monkeypatch.setattr(webapp, "plot_close_prices", lambda dfs, labels, **kwargs: plotted.append(dfs) or "")
+    webapp.app.config["TESTING"] = True
+    with webapp.app.test_client() as client:
+        client.plotted = plotted
+        yield client
+
+@pytest.mark.parametrize("indicator, field, value, column", [
+    ("sma", "sma_window", "30", "SMA_30"),
+    ("ema", "ema_interval", "10", "EMA_10"),
+    ("rsi", "rsi_interval", "14", "RSI_14"),
+])
+def test_form_params_name_int_columns(client, indicator, field, value, column):
+    response = client.post("/", data={"ticker1": "AAPL", "indicator": indicator, field: value, "time_range": "1Y"})
+    assert response.status_code == 200
+    (df,), = client.plotted
+    assert column in df.columns and f"{indicator.upper()}_ERROR" not in df.columns
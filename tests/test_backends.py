@@ -0,0 +1,72 @@
+import pandas as pd
+import numpy as np
+import pytest
+from indicators import backends
+from indicators.filters import exponential_smooth
+from indicators.registry import apply_indicator, apply_indicators
+from indicators.updown import streak_breaks
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(5)
+    data = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=150, tz="UTC"),
+        "Close": np.round(50 + np.random.randn(150).cumsum(), 2),
+    })
+    data.loc[60, "Close"] = np.nan
+    return data
+
+@pytest.fixture
+def loop_backend(monkeypatch):
+    """Route the kernels through the loop implementations (compiled when Numba is installed)."""
+    monkeypatch.setattr(backends, "_active", "numba")
+
+def test_smooth_loop_matches_filter():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(3, 200))
+    seeds = rng.normal(size=3)
+    out = np.empty_like(values)
+    backends.smooth_rows(values, 0.2, seeds, out)
+    np.testing.assert_allclose(out, exponential_smooth(values, 0.2, seeds), rtol=1e-12)
+
+@pytest.mark.parametrize("tolerance,threshold", [(0, 0.0), (1, 0.5), (2, 1.0), (1.5, 0.3)])
+def test_streak_loop_matches_scans(tolerance, threshold):
+    rng = np.random.default_rng(1)
+    values = np.round(rng.normal(size=300), 1)
+    values[[10, 50]] = np.nan
+    expected = streak_breaks(values, tolerance, threshold)
+    breaks = np.zeros((2, values.size), dtype=bool)
+    small_rank = np.zeros((2, values.size), dtype=np.int64)
+    backends.streak_break_rows(values, int(np.ceil(tolerance)), threshold, breaks, small_rank)
+    np.testing.assert_array_equal(breaks, expected[0])
+    np.testing.assert_array_equal(small_rank, expected[1])
+
+REQUESTS = [
+    ("ema", {"interval": 10}),
+    ("rsi", {"interval": 14}),
+    ("macd", {"fast_period": 5, "slow_period": 12, "signal_period": 4}),
+    ("dailyr", {"tolerance": 1, "threshold": 0.5}),
+]
+
+def test_indicators_match_across_backends(sample_data, monkeypatch):
+    expected, expected_extras = apply_indicators(sample_data, REQUESTS)
+    monkeypatch.setattr(backends, "_active", "numba")
+    result, extras = apply_indicators(sample_data, REQUESTS)
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-12)
+    assert extras == expected_extras
+
+def test_loop_backend_is_dispatched(sample_data, loop_backend, monkeypatch):
+    calls = []
+    smooth_rows = backends.smooth_rows
+    monkeypatch.setattr(backends, "smooth_rows", lambda *args: calls.append(1) or smooth_rows(*args))
+    apply_indicator(sample_data, "ema", {"interval": 10}, use_cache=False)
+    assert calls
+
+def test_set_backend_validates_and_falls_back(monkeypatch):
+    monkeypatch.setattr(backends, "_active", backends.get_backend())
+    with pytest.raises(ValueError):
+        backends.set_backend("fortran")
+    assert backends.set_backend("numpy") == "numpy"
+    monkeypatch.setattr(backends, "numba", None)
+    assert backends.set_backend("numba") == "numpy"
+    assert backends.set_backend("auto") == "numpy"
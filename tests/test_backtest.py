@@ -0,0 +1,85 @@
+import pandas as pd
+import numpy as np
+import pytest
+from indicators.backtest import (
+    backtest_grid, crossover_positions, extract_trades, run_backtests, simulate, threshold_positions,
+)
+from indicators.registry import apply_indicator
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(9)
+    data = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=300, tz="UTC"),
+        "Close": 100 * np.exp(np.cumsum(np.random.normal(0, 0.02, 300))),
+    })
+    return data
+
+def test_threshold_positions_hold_between_events():
+    values = np.array([50, 25, 40, 60, 75, 50, 20, np.nan, 80])
+    expected = [0, 1, 1, 1, 0, 0, 1, 1, 0]
+    np.testing.assert_array_equal(threshold_positions(values, 30, 70), expected)
+
+def test_simulate_matches_loop(sample_data):
+    close = sample_data["Close"].to_numpy()
+    positions = (np.arange(close.size) // 7 % 2).astype(float)
+    sim = simulate(close, positions, fee_bps=10)
+
+    equity, held = 1.0, 0.0
+    for t in range(close.size):
+        if t:
+            equity *= 1 + held * (close[t] / close[t - 1] - 1)
+        equity *= 1 - abs(positions[t] - held) * 10 / 1e4
+        held = positions[t]
+    assert sim["equity"][0, -1] == pytest.approx(equity, rel=1e-12)
+    assert (sim["drawdown"] <= 0).all()
+
+def test_crossover_uses_registry_columns(sample_data):
+    res = run_backtests(sample_data, [("ma_crossover", {"fast": 5, "slow": 20})])[0]
+    df = apply_indicator(apply_indicator(sample_data, "sma", {"window": 5}), "sma", {"window": 20})
+    np.testing.assert_array_equal(res["positions"], crossover_positions(df["SMA_5"], df["SMA_20"]))
+
+def test_macd_positions_follow_histogram_sign(sample_data):
+    res = run_backtests(sample_data, [("macd_hist", None)])[0]
+    hist = apply_indicator(sample_data, "macd")["MACD_hist"].to_numpy()
+    np.testing.assert_array_equal(res["positions"], np.nan_to_num(hist) > 0)
+
+def test_trades_cover_every_position_change(sample_data):
+    close = sample_data["Close"].to_numpy()
+    positions = np.zeros(close.size)
+    positions[10:20] = 1
+    positions[290:] = 1
+    sim = simulate(close, positions)
+    trades = extract_trades(close, positions, sim["equity"][0], sample_data["Date"])
+    assert [(t["entry_index"], t["exit_index"], t["open"]) for t in trades] == [(10, 20, False), (290, 299, True)]
+    assert trades[0]["return_pct"] == pytest.approx((close[20] / close[10] - 1) * 100)
+    assert trades[0]["entry_date"] == sample_data["Date"].iloc[10]
+
+def test_grid_matches_single_runs(sample_data):
+    grid = backtest_grid(sample_data, "ma_crossover", {"fast": [5, 10, 30], "slow": [20, 50]}, fee_bps=5)
+    # fast=30 >= slow=20 is skipped
+    assert len(grid) == 5
+    for result in grid:
+        single = run_backtests(sample_data, [("ma_crossover", result["params"])], fee_bps=5)[0]
+        np.testing.assert_array_equal(result["equity"], single["equity"])
+        assert result["summary"] == single["summary"]
+
+def test_mixed_strategies_in_one_call(sample_data):
+    results = run_backtests(sample_data, [
+        ("ma_crossover", {"average": "ema", "fast": 12, "slow": 26}),
+        ("rsi_threshold", {"interval": 10, "lower": 35, "upper": 65}),
+        ("macd_hist", None),
+    ])
+    assert [r["strategy"] for r in results] == ["ma_crossover", "rsi_threshold", "macd_hist"]
+    assert all(r["equity"].shape == (300,) for r in results)
+
+@pytest.mark.parametrize("key,params", [
+    ("ma_crossover", {"fast": 50, "slow": 20}),
+    ("ma_crossover", {"average": "wma"}),
+    ("rsi_threshold", {"lower": 70, "upper": 30}),
+    ("macd_hist", {"fast_period": 0}),
+    ("unknown", None),
+])
+def test_invalid_requests_raise(sample_data, key, params):
+    with pytest.raises(ValueError):
+        run_backtests(sample_data, [(key, params)])
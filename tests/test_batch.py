@@ -0,0 +1,76 @@
+import pandas as pd
+import numpy as np
+import pytest
+import indicators.registry as registry
+from indicators.registry import apply_indicator, apply_indicators
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(0)
+    data = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=80),
+        "Close": np.random.rand(80) * 100
+    })
+    return data
+
+def test_batch_matches_single_calls(sample_data):
+    requests = [
+        ("sma", {"window": 5}), ("sma", {"window": 20}),
+        ("ema", {"interval": 12}), ("rsi", {"interval": 14}),
+        ("macd", {"fast_period": 12, "slow_period": 26, "signal_period": 9}),
+    ]
+    batch, extras = apply_indicators(sample_data, requests)
+    assert extras == [None] * len(requests)
+
+    for key, params in requests:
+        single = apply_indicator(sample_data, key, params)
+        for col in single.columns.difference(sample_data.columns):
+            np.testing.assert_allclose(batch[col].values, single[col].values, equal_nan=True)
+
+    # the input frame is left untouched
+    assert list(sample_data.columns) == ["Date", "Close"]
+
+def test_batch_dailyr_extras_match_single_call(sample_data):
+    batch, extras = apply_indicators(sample_data, [("dailyr", {"tolerance": 1, "threshold": 0.5})])
+    single, streak_info, max_profit = apply_indicator(sample_data, "dailyr", {"tolerance": 1, "threshold": 0.5})
+    np.testing.assert_allclose(batch["DailyR"].values, single["DailyR"].values, equal_nan=True)
+    assert extras[0] == (streak_info, max_profit)
+
+def test_batch_shares_ema_between_ema_and_macd(sample_data, monkeypatch):
+    calls = []
+    original = registry.ema_kernel
+    monkeypatch.setattr(registry, "ema_kernel", lambda *args: calls.append(args[1]) or original(*args))
+
+    apply_indicators(sample_data, [("ema", {"interval": 12}), ("ema", {"interval": 26}), ("macd", None)])
+    # both MACD legs are already cached from the EMA requests
+    assert calls == [[12, 26]]
+
+def test_batch_insufficient_data_sets_error_column(sample_data):
+    batch, _ = apply_indicators(sample_data.head(10), [("sma", {"window": 5}), ("sma", {"window": 50})])
+    assert "SMA_5" in batch.columns
+    assert "SMA_ERROR" in batch.columns
+
+def test_batch_invalid_params_raise(sample_data):
+    with pytest.raises(ValueError, match="Invalid parameter 'window'=0 for indicator 'sma'. Must be > 0."):
+        apply_indicators(sample_data, [("sma", {"window": 0})])
+
+def test_resolve_dag_orders_and_dedupes():
+    levels = registry.resolve_dag([
+        ("macd", {"fast_period": 12, "slow_period": 26, "signal_period": 9}),
+        ("ema", {"interval": 12}),
+        ("dailyr", {"tolerance": 1, "threshold": 0.5}),
+    ])
+    kinds = [[kind for kind, _ in level] for level in levels]
+    # both MACD legs and the EMA request share ema_line nodes, returns feeds updown
+    assert sorted(kinds[0]) == ["ema_line", "ema_line", "max_profit", "returns"]
+    assert sorted(kinds[1]) == ["ema", "macd", "updown"]
+    assert kinds[2] == ["dailyr"]
+
+def test_batch_computes_shared_returns_once(sample_data, monkeypatch):
+    calls = []
+    original = registry.daily_returns
+    monkeypatch.setattr(registry, "daily_returns", lambda close: calls.append(1) or original(close))
+
+    _, extras = apply_indicators(sample_data, [("dailyr", {"tolerance": 0}), ("dailyr", {"tolerance": 2})])
+    assert len(calls) == 1
+    assert extras[0][1] == extras[1][1]
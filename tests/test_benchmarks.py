@@ -0,0 +1,47 @@
+import pandas as pd
+from benchmarks.suite import compare, load_baseline, run, save_baseline
+from benchmarks.synthetic import synthetic_prices
+from indicators.registry import INDICATORS
+
+def test_synthetic_prices_reproducible():
+    pd.testing.assert_frame_equal(synthetic_prices(500, seed=3), synthetic_prices(500, seed=3))
+    assert not synthetic_prices(500, seed=3).equals(synthetic_prices(500, seed=4))
+
+def test_synthetic_prices_has_gaps_and_nans():
+    df = synthetic_prices(5_000, seed=1)
+    assert list(df.columns) == ["Date", "Open", "High", "Low", "Close", "Volume"]
+    assert df["Close"].isna().any()
+    assert df["Date"].is_monotonic_increasing
+    # skipped sessions show up as business-day steps longer than a weekend
+    assert (df["Date"].diff().dt.days > 3).any()
+    valid = df.dropna()
+    assert (valid["High"] >= valid[["Open", "Close"]].max(axis=1)).all()
+    assert (valid["Low"] <= valid[["Open", "Close"]].min(axis=1)).all()
+
+def test_run_covers_every_case():
+    results = run(sizes=[200], repeat=1)
+    expected = [*INDICATORS, "calculate_updown", "align_dfs", "preprocess_stock_data"]
+    assert sorted(results) == sorted(f"{name}@200" for name in expected)
+    assert all(r["seconds"] > 0 and r["peak_mb"] > 0 for r in results.values())
+
+def test_compare_flags_regressions_past_threshold():
+    baseline = {"sma@1000": {"seconds": 0.10, "peak_mb": 50.0}, "rsi@1000": {"seconds": 0.10, "peak_mb": 50.0}}
+    results = {
+        "sma@1000": {"seconds": 0.12, "peak_mb": 55.0},     # within 25%
+        "rsi@1000": {"seconds": 0.20, "peak_mb": 80.0},     # both metrics regressed
+        "ema@1000": {"seconds": 9.00, "peak_mb": 900.0},    # not in the baseline
+    }
+    regressions = compare(results, baseline, threshold=0.25)
+    assert len(regressions) == 2
+    assert all(message.startswith("rsi@1000") for message in regressions)
+
+def test_compare_ignores_noise_below_floor():
+    baseline = {"sma@1000": {"seconds": 1e-5, "peak_mb": 0.01}}
+    assert compare({"sma@1000": {"seconds": 5e-4, "peak_mb": 0.5}}, baseline) == []
+
+def test_baseline_round_trip(tmp_path):
+    path = tmp_path / "baseline.json"
+    assert load_baseline(path) == {}
+    results = {"sma@1000": {"seconds": 0.1, "peak_mb": 2.0}}
+    save_baseline(path, results)
+    assert load_baseline(path) == results
@@ -0,0 +1,85 @@
+import pandas as pd
+import numpy as np
+import pytest
+from indicators.cache import ResultCache, fingerprint
+from indicators.registry import RESULT_CACHE, apply_indicator
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(1)
+    data = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=60),
+        "Close": 100 + np.random.randn(60).cumsum()
+    })
+    return data
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    RESULT_CACHE.clear()
+    yield
+    RESULT_CACHE.clear()
+
+def test_fingerprint_follows_content(sample_data):
+    other = sample_data.copy()
+    other["Volume"] = 1
+    other.index = other.index + 10
+    assert fingerprint(other) == fingerprint(sample_data)
+    other.loc[other.index[-1], "Close"] += 0.01
+    assert fingerprint(other) != fingerprint(sample_data)
+
+def test_hit_returns_same_result(sample_data):
+    first = apply_indicator(sample_data, "rsi", {"interval": 14})
+    second = apply_indicator(sample_data.copy(), "rsi", {"interval": 14})
+    stats = RESULT_CACHE.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    pd.testing.assert_frame_equal(first, second)
+    assert second is not first
+
+def test_params_and_key_are_part_of_key(sample_data):
+    apply_indicator(sample_data, "sma", {"window": 5})
+    apply_indicator(sample_data, "sma", {"window": 6})
+    apply_indicator(sample_data, "ema", {"interval": 5})
+    assert RESULT_CACHE.stats()["misses"] == 3
+    assert len(RESULT_CACHE) == 3
+
+def test_dailyr_extras_are_cached(sample_data):
+    first = apply_indicator(sample_data, "dailyr")
+    second = apply_indicator(sample_data, "dailyr")
+    assert RESULT_CACHE.stats()["hits"] == 1
+    assert second[1] == first[1] and second[2] == first[2]
+    # handed-out copies do not leak back into the cache
+    second[2]["buy_index"] = -1
+    assert apply_indicator(sample_data, "dailyr")[2] == first[2]
+
+def test_cached_columns_are_writable(sample_data):
+    apply_indicator(sample_data, "sma", {"window": 5})
+    res = apply_indicator(sample_data, "sma", {"window": 5})
+    res.loc[0, "SMA_5"] = 1.0
+
+def test_lru_eviction_by_bytes():
+    cache = ResultCache(max_bytes=3 * 800)
+    for i in range(4):
+        cache.put(i, {"x": np.zeros(100)})
+    assert cache.get(0) is None
+    cache.get(1)
+    cache.put(4, {"x": np.zeros(100)})
+    assert cache.get(1) is not None and cache.get(2) is None
+    stats = cache.stats()
+    assert stats["evictions"] == 2 and stats["bytes"] <= stats["max_bytes"]
+
+def test_oversized_entry_not_stored():
+    cache = ResultCache(max_bytes=100)
+    cache.put("big", {"x": np.zeros(100)})
+    assert len(cache) == 0
+
+@pytest.mark.parametrize("key, params, column", [
+    ("sma", {"window": 20.0}, "SMA_20"),
+    ("ema", {"interval": 10.0}, "EMA_10"),
+    ("rsi", {"interval": 14.0}, "RSI_14"),
+])
+def test_whole_float_params_name_int_columns(sample_data, key, params, column):
+    # the app parses form values as floats
+    res = apply_indicator(sample_data, key, params)
+    assert column in res.columns and f"{key.upper()}_ERROR" not in res.columns
+    pd.testing.assert_frame_equal(res, apply_indicator(sample_data, key, {k: int(v) for k, v in params.items()}))
+    assert RESULT_CACHE.stats()["hits"] == 1
@@ -0,0 +1,69 @@
+import pandas as pd
+import numpy as np
+import pytest
+from data.preprocess import compact_frame, ensure_datetime_dates, preprocess_stock_data
+from indicators.registry import INDICATORS, RESULT_CACHE, apply_indicator
+
+@pytest.fixture
+def sample_data():
+    rng = np.random.default_rng(6)
+    n = 500
+    data = pd.DataFrame({
+        "Date": pd.date_range("2020-01-01", periods=n, tz="UTC"),
+        "Close": 250 * np.exp(np.cumsum(rng.normal(0, 0.02, n))),
+        "Volume": rng.integers(0, 5_000_000, n),
+    })
+    return data
+
+def test_compact_frame_dtypes(sample_data):
+    compact = compact_frame(sample_data)
+    assert compact["Close"].dtype == np.float32
+    assert compact["Volume"].dtype == np.int32
+    assert compact["Date"].dtype == np.int64
+    assert compact.memory_usage(index=False).sum() < 0.7 * sample_data.memory_usage(index=False).sum()
+    # the input frame is left untouched
+    assert sample_data["Close"].dtype == np.float64
+
+def test_ensure_datetime_dates_round_trip(sample_data):
+    restored = ensure_datetime_dates(compact_frame(sample_data))
+    pd.testing.assert_series_equal(restored["Date"], sample_data["Date"])
+
+def test_preprocess_compact_option(sample_data):
+    compact = preprocess_stock_data(sample_data, compact=True)
+    assert compact["Close"].dtype == np.float32
+    assert preprocess_stock_data(sample_data)["Close"].dtype == np.float64
+
+@pytest.mark.parametrize("key", list(INDICATORS))
+@pytest.mark.parametrize("copy", [True, False])
+def test_compact_results_within_documented_tolerance(sample_data, key, copy):
+    full = apply_indicator(sample_data, key, use_cache=False)
+    compact = apply_indicator(compact_frame(sample_data), key, use_cache=False, copy=copy)
+    if key == "dailyr":
+        full, compact = full[0], compact[0]
+
+    tolerance = INDICATORS[key]["compact_tolerance"]
+    atol = tolerance.get("atol", 0) + tolerance.get("atol_price", 0) * sample_data["Close"].abs().max()
+    for col in INDICATORS[key]["columns"](INDICATORS[key]["default_params"]):
+        assert compact[col].dtype == np.float32
+        np.testing.assert_allclose(compact[col], full[col], rtol=tolerance.get("rtol", 0), atol=atol)
+
+def test_compact_dailyr_reports_datetimes(sample_data):
+    _, _, max_profit = apply_indicator(compact_frame(sample_data), "dailyr", use_cache=False)
+    assert isinstance(max_profit["buy_date"], pd.Timestamp)
+
+def test_compact_and_full_results_cached_separately(sample_data):
+    RESULT_CACHE.clear()
+    apply_indicator(sample_data, "sma")
+    res = apply_indicator(sample_data, "sma", compact=True)
+    assert res["SMA_5"].dtype == np.float32
+    assert RESULT_CACHE.stats()["hits"] == 0
+    RESULT_CACHE.clear()
+
+@pytest.mark.parametrize("key, params, column", [("sma", {"window": 20.0}, "SMA_20"),
+                                                 ("ema", {"interval": 10.0}, "EMA_10"),
+                                                 ("rsi", {"interval": 14.0}, "RSI_14")])
+@pytest.mark.parametrize("copy", [True, False])
+def test_compact_cast_with_whole_float_params(sample_data, key, params, column, copy):
+    res = apply_indicator(compact_frame(sample_data), key, params, use_cache=False, copy=copy)
+    assert f"{key.upper()}_ERROR" not in res.columns
+    assert res[column].dtype == np.float32
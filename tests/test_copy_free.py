@@ -0,0 +1,61 @@
+import pandas as pd
+import numpy as np
+import pytest
+from benchmarks.memory_pipeline import make_frame, peak_bytes
+from indicators.buffers import close_view, output_block
+from indicators.registry import apply_indicator
+from indicators.sma import sma_kernel
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(5)
+    data = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=80, tz="UTC"),
+        "Close": 50 + np.random.randn(80).cumsum(),
+        "Volume": np.arange(80),
+    })
+    return data
+
+CASES = [
+    ("sma", {"window": 5}),
+    ("ema", {"interval": 10}),
+    ("rsi", {"interval": 14}),
+    ("macd", None),
+    ("dailyr", {"tolerance": 1, "threshold": 0.5}),
+]
+
+@pytest.mark.parametrize("key,params", CASES)
+def test_copy_free_matches_default(sample_data, key, params):
+    default = apply_indicator(sample_data, key, params, use_cache=False)
+    copy_free = apply_indicator(sample_data, key, params, use_cache=False, copy=False)
+    if key == "dailyr":
+        assert default[1:] == copy_free[1:]
+        default, copy_free = default[0], copy_free[0]
+    pd.testing.assert_frame_equal(copy_free, default)
+
+def test_copy_free_shares_base_columns(sample_data):
+    res = apply_indicator(sample_data, "sma", {"window": 5}, use_cache=False, copy=False)
+    assert np.shares_memory(res["Close"].to_numpy(), sample_data["Close"].to_numpy())
+    assert list(sample_data.columns) == ["Date", "Close", "Volume"]
+
+def test_copy_free_short_data_sets_error_column(sample_data):
+    res = apply_indicator(sample_data.head(3), "sma", {"window": 5}, use_cache=False, copy=False)
+    assert "SMA_ERROR" in res.columns
+
+def test_close_view_is_read_only(sample_data):
+    close = close_view(sample_data)
+    assert np.shares_memory(close, sample_data["Close"].to_numpy())
+    with pytest.raises(ValueError):
+        close[0] = 1.0
+
+def test_kernel_writes_into_output_buffer(sample_data):
+    out = np.zeros((2, 80))
+    block = sma_kernel(sample_data["Close"], [5, 10], out=out)
+    assert block is out
+    np.testing.assert_array_equal(out, sma_kernel(sample_data["Close"], [5, 10]))
+    with pytest.raises(ValueError):
+        output_block(np.zeros((1, 80)), (2, 80))
+
+def test_copy_free_lowers_peak_memory():
+    df = make_frame(200_000)
+    assert peak_bytes(df, "sma", {"window": 20}, copy=False) < 0.5 * peak_bytes(df, "sma", {"window": 20}, copy=True)
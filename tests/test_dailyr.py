@@ -0,0 +1,75 @@
+import pandas as pd
+import numpy as np
+import pytest
+from indicators.dailyr import calculate_dailyr, calculate_max_profit, max_profit_trades
+
+def make_df(closes):
+    """Creates a small DataFrame with 'Date' and 'Close' columns."""
+    return pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=len(closes)),
+        "Close": closes,
+    })
+
+def test_max_profit_picks_best_pair():
+    result = calculate_max_profit([7, 1, 5, 3, 6, 4])
+    assert (result["buy_index"], result["sell_index"]) == (1, 4)
+    assert result["price_diff"] == 5
+    assert result["profit_pct"] == pytest.approx(500.0)
+
+def test_max_profit_ties_use_earliest_dates():
+    result = calculate_max_profit([3, 1, 4, 1, 4])
+    assert (result["buy_index"], result["sell_index"]) == (1, 2)
+
+def test_max_profit_falling_prices_has_no_trade():
+    result = calculate_max_profit([5, 4, 3, 2])
+    assert result["buy_index"] == result["sell_index"] == 0
+    assert result["price_diff"] == 0
+
+def test_dailyr_returns_float_frame_and_profit():
+    df = make_df([10.0, 12.0, 9.0, 15.0, 14.0])
+    out, streak_info, max_profit = calculate_dailyr(df, tolerance=0, threshold=0)
+    assert "Info" not in out.columns
+    assert out["DailyR"].dtype == np.float64
+    assert max_profit["buy_date"] == df["Date"].iloc[2]
+    assert max_profit["sell_date"] == df["Date"].iloc[3]
+    assert "up_streak" in streak_info
+
+def brute_force_profit(prices, k):
+    """Classic per-day DP over at most k transactions."""
+    buy, sell = [-np.inf] * (k + 1), [0.0] * (k + 1)
+    for price in prices:
+        for j in range(1, k + 1):
+            buy[j] = max(buy[j], sell[j - 1] - price)
+            sell[j] = max(sell[j], buy[j] + price)
+    return sell[k]
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5, 0])
+def test_max_profit_trades_match_brute_force(k):
+    rng = np.random.default_rng(k)
+    for _ in range(50):
+        prices = np.round(20 + rng.normal(0, 1, 40).cumsum(), 1)
+        trades = max_profit_trades(prices, k)
+        total = sum(t["price_diff"] for t in trades)
+        assert total == pytest.approx(brute_force_profit(prices, k or len(prices)))
+        assert k == 0 or len(trades) <= k
+        assert all(a["sell_index"] < b["buy_index"] for a, b in zip(trades, trades[1:]))
+
+def test_max_profit_trades_cumulative_gains():
+    trades = max_profit_trades([10, 12, 11, 15, 9, 18], 2)
+    assert [(t["buy_index"], t["sell_index"]) for t in trades] == [(0, 3), (4, 5)]
+    assert [t["cumulative_diff"] for t in trades] == [5, 14]
+    assert trades[-1]["cumulative_pct"] == pytest.approx((1.5 * 2 - 1) * 100)
+
+def test_max_profit_trades_skip_nans():
+    trades = max_profit_trades([1, np.nan, 3, 2, np.nan, 5], 0)
+    assert [(t["buy_index"], t["sell_index"]) for t in trades] == [(0, 2), (3, 5)]
+
+def test_dailyr_transactions_param():
+    df = make_df([10.0, 12.0, 9.0, 15.0, 14.0, 16.0])
+    _, _, single = calculate_dailyr(df, tolerance=0, threshold=0)
+    _, _, unlimited = calculate_dailyr(df, tolerance=0, threshold=0, transactions=0)
+    assert len(single["trades"]) == 1 and single["total_diff"] == single["price_diff"] == 7
+    assert [t["sell_date"] for t in unlimited["trades"]] == list(df["Date"].iloc[[1, 3, 5]])
+    assert unlimited["total_diff"] == 10
+    # the single best pair is still reported alongside the trades
+    assert unlimited["price_diff"] == 7
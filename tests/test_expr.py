@@ -0,0 +1,87 @@
+import pandas as pd
+import numpy as np
+import pytest
+import indicators.registry as registry
+from indicators.expr import Plan, close, col, collect, indicator, macd, rsi, sma
+from indicators.registry import apply_indicator
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(4)
+    data = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=150),
+        "Close": 50 + np.random.randn(150).cumsum(),
+        "Volume": np.random.randint(1_000, 5_000, 150).astype(float),
+    })
+    return data
+
+def test_cross_matches_manual_columns(sample_data):
+    result = close().sma(10).cross(close().ema(30)).collect(sample_data)
+    df = apply_indicator(apply_indicator(sample_data, "sma", {"window": 10}), "ema", {"interval": 30})
+    fast, slow = df["SMA_10"], df["EMA_30"]
+    expected = (fast > slow) & (fast.shift() <= slow.shift())
+    np.testing.assert_array_equal(result, expected)
+    assert result.dtype == bool
+
+def test_arithmetic_and_conditions(sample_data):
+    out = collect(sample_data, {
+        "stretch": (close() / sma(20) - 1) * 100,
+        "band": (rsi(14) > 30) & (rsi(14) < 70),
+        "volume": col("Volume") * 2 + 1,
+    })
+    df = apply_indicator(apply_indicator(sample_data, "sma", {"window": 20}), "rsi", {"interval": 14})
+    np.testing.assert_allclose(out["stretch"], (df["Close"] / df["SMA_20"] - 1) * 100)
+    np.testing.assert_array_equal(out["band"], (df["RSI_14"] > 30) & (df["RSI_14"] < 70))
+    np.testing.assert_array_equal(out["volume"], sample_data["Volume"] * 2 + 1)
+
+def test_common_subexpressions_are_shared():
+    plan = Plan([rsi(14) > 70, rsi(interval=14) < 30, close().rsi(14).shift() > 50, sma(20), sma(window=20) * 2])
+    assert sorted(plan.requests, key=str) == [("rsi", {"interval": 14}), ("sma", {"window": 20})]
+    assert sum(node.op == "indicator" for node in plan.nodes.values()) == 2
+
+def test_whole_float_params_are_the_int_node(sample_data):
+    assert sma(20.0).key == sma(20).key and rsi(interval=14.0).key == rsi(14).key
+    out = collect(sample_data, {"x": sma(20.0)})
+    np.testing.assert_array_equal(out["x"], apply_indicator(sample_data, "sma", {"window": 20})["SMA_20"])
+
+def test_indicator_kernels_run_once(sample_data, monkeypatch):
+    calls = []
+    original = registry.sma_kernel
+    monkeypatch.setattr(registry, "sma_kernel", lambda *args, **kw: calls.append(1) or original(*args, **kw))
+    collect(sample_data, [sma(5) > sma(20), sma(5).cross(sma(20)), close() > sma(20)])
+    # every SMA window in one batch kernel call
+    assert len(calls) == 1
+
+def test_elementwise_steps_leave_inputs_intact(sample_data):
+    before = sample_data.copy()
+    out = collect(sample_data, {"a": -abs(close() - sma(5)) / 2, "b": sma(5)})
+    pd.testing.assert_frame_equal(sample_data, before)
+    np.testing.assert_array_equal(out["b"], apply_indicator(sample_data, "sma", {"window": 5})["SMA_5"])
+
+def test_multi_output_indicator(sample_data):
+    hist = macd(5, 12, 4, output="MACD_hist").collect(sample_data)
+    expected = apply_indicator(sample_data, "macd", {"fast_period": 5, "slow_period": 12, "signal_period": 4})
+    np.testing.assert_array_equal(hist, expected["MACD_hist"])
+
+@pytest.mark.parametrize("build", [
+    lambda: indicator("nope"),
+    lambda: sma(0),
+    lambda: macd(output="MACD_x"),
+    lambda: sma(20).ema(5),
+])
+def test_invalid_expressions_raise(build):
+    with pytest.raises(ValueError):
+        build()
+
+def test_expressions_have_no_truth_value():
+    with pytest.raises(TypeError):
+        bool(rsi(14) > 70)
+
+@pytest.mark.parametrize("periods", [150, 500, -150, -500])
+def test_shift_beyond_the_frame_is_all_fill(sample_data, periods):
+    shifted = close().shift(periods).collect(sample_data)
+    assert shifted.isna().all() and len(shifted) == len(sample_data)
+    crossed = (close() > 0).shift(periods).collect(sample_data)
+    assert crossed.dtype == bool and not crossed.any()
+    pd.testing.assert_series_equal(close().shift(149).collect(sample_data),
+                                   sample_data["Close"].shift(149), check_names=False)
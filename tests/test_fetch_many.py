@@ -0,0 +1,75 @@
+import time
+import pandas as pd
+import pytest
+import data.fetch as fetch
+
+DELAY = 0.3
+
+def frame(ticker):
+    return pd.DataFrame({"Date": pd.date_range("2024-01-01", periods=3), "Close": [1.0, 2.0, 3.0]})
+
+@pytest.fixture
+def slow_api(monkeypatch):
+    """Every history and summary call sleeps `DELAY` seconds; "BAD" fails, "HANG" never answers in time."""
+    calls = []
+
+    def history(ticker):
+        calls.append(("df", ticker))
+        time.sleep(5 if ticker == "HANG" else DELAY)
+        if ticker == "BAD":
+            raise ValueError(f"No data found for ticker '{ticker}'.")
+        return frame(ticker), ticker.upper()
+
+    def summary(ticker):
+        calls.append(("summary", ticker))
+        time.sleep(DELAY)
+        return {"symbol": ticker.upper(), "price": 3.0}
+
+    monkeypatch.setattr(fetch, "get_stock_data", history)
+    monkeypatch.setattr(fetch, "get_ticker_summary", summary)
+    return calls
+
+def test_calls_run_concurrently(slow_api):
+    start = time.perf_counter()
+    results = fetch.get_many_stock_data(["aapl", "msft"])
+    elapsed = time.perf_counter() - start
+    # four calls of DELAY each, bounded by the slowest one rather than their sum
+    assert elapsed < 2.5 * DELAY
+    assert len(slow_api) == 4
+    assert list(results) == ["aapl", "msft"]
+    for ticker, result in results.items():
+        assert result["error"] is None and result["summary_error"] is None
+        assert result["label"] == ticker.upper()
+        assert result["summary"]["symbol"] == ticker.upper()
+        pd.testing.assert_frame_equal(result["df"], frame(ticker))
+
+def test_partial_results_with_per_ticker_errors(slow_api):
+    results = fetch.get_many_stock_data(["aapl", "BAD"])
+    assert results["aapl"]["error"] is None and results["aapl"]["df"] is not None
+    assert results["BAD"]["df"] is None
+    assert results["BAD"]["error"].startswith("ValueError: No data found")
+    # the summary of a ticker without history still arrives
+    assert results["BAD"]["summary"]["symbol"] == "BAD"
+
+def test_timeout_bounds_the_batch(slow_api):
+    start = time.perf_counter()
+    results = fetch.get_many_stock_data(["aapl", "HANG"], timeout=1.0)
+    assert time.perf_counter() - start < 2.0
+    assert results["HANG"]["df"] is None
+    assert results["HANG"]["error"].startswith("TimeoutError")
+    assert results["aapl"]["error"] is None
+
+def test_cached_histories_are_not_fetched(slow_api):
+    cached = frame("aapl")
+    results = fetch.get_many_stock_data(["aapl", "msft"], cache={"aapl": cached})
+    assert ("df", "aapl") not in slow_api and ("df", "msft") in slow_api
+    assert results["aapl"]["df"] is cached
+
+def test_skips_empty_and_repeated_tickers(slow_api):
+    results = fetch.get_many_stock_data(["aapl", "", None, "aapl"], summaries=False)
+    assert list(results) == ["aapl"]
+    assert slow_api == [("df", "aapl")]
+    assert results["aapl"]["summary"] is None and results["aapl"]["summary_error"] is None
+
+def test_nothing_to_fetch():
+    assert fetch.get_many_stock_data([]) == {}
@@ -0,0 +1,102 @@
+import pandas as pd
+import numpy as np
+import pytest
+from indicators.registry import apply_indicator
+from indicators.sma import sma_kernel
+from indicators.ema import ema_kernel
+from indicators.rsi import rsi_kernel
+from indicators.macd import macd_kernel
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(0)
+    data = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=50),
+        "Close": np.random.rand(50) * 100
+    })
+    return data
+
+def reference_sma(data, window):
+    return pd.Series(data, dtype=float).rolling(window).mean().to_numpy()
+
+def reference_ema(data, interval, smoothing=2.0):
+    """The original loop: mean of the first `interval` closes as seed, then the recursion."""
+    data = pd.Series(data, dtype=float).reset_index(drop=True)
+    weight = smoothing / (interval + 1)
+    rolling_ema = [np.nan] * (interval - 1) + [data.iloc[:interval].mean()]
+    for i in range(interval, data.size):
+        rolling_ema.append(data.iloc[i] * weight + rolling_ema[-1] * (1 - weight))
+    return np.array(rolling_ema)
+
+def reference_macd(data, fast, slow, signal):
+    """The original list-based MACD: signal EMA from the first valid MACD value on."""
+    macd_line = pd.Series(reference_ema(data, fast)) - pd.Series(reference_ema(data, slow))
+    first = macd_line.first_valid_index()
+    signal_line = np.concatenate([np.full(first, np.nan), reference_ema(macd_line[first:], signal)])
+    return macd_line.to_numpy(), signal_line
+
+def reference_rsi(data, interval):
+    """The original loop: Wilder averages of gains and losses, 100 without losses."""
+    differences = np.diff(np.asarray(data, dtype=float))
+    avg_gain = np.maximum(differences[:interval], 0).sum() / interval
+    avg_loss = np.maximum(-differences[:interval], 0).sum() / interval
+    rsi_values = [np.nan] * interval
+    for i, diff in enumerate(differences[interval - 1:]):
+        if i:
+            avg_gain = (avg_gain * (interval - 1) + max(diff, 0)) / interval
+            avg_loss = (avg_loss * (interval - 1) + max(-diff, 0)) / interval
+        rsi_values.append(100 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss))
+    return np.array(rsi_values)
+
+def test_sma_kernel_batch_matches_reference(sample_data):
+    windows = [5, 10, 20]
+    block = sma_kernel(sample_data["Close"].values, windows)
+    assert block.shape == (len(windows), len(sample_data))
+    for row, window in zip(block, windows):
+        expected = reference_sma(sample_data["Close"], window)
+        np.testing.assert_allclose(row, expected, rtol=1e-12, equal_nan=True)
+        my_sma = apply_indicator(sample_data, "sma", {"window": window})[f'SMA_{window}']
+        np.testing.assert_allclose(my_sma.values, expected, rtol=1e-12, equal_nan=True)
+
+def test_ema_kernel_batch_matches_reference(sample_data):
+    pairs = [(5, 2.0), (10, 2.0), (10, 3.0)]
+    block = ema_kernel(sample_data["Close"].values, [p[0] for p in pairs], [p[1] for p in pairs])
+    assert block.shape == (len(pairs), len(sample_data))
+    for row, (interval, smoothing) in zip(block, pairs):
+        expected = reference_ema(sample_data["Close"], interval, smoothing)
+        np.testing.assert_allclose(row, expected, rtol=1e-12, equal_nan=True)
+        my_ema = apply_indicator(sample_data, "ema", {"interval": interval, "smoothing": smoothing})[f'EMA_{interval}']
+        np.testing.assert_allclose(my_ema.values, expected, rtol=1e-12, equal_nan=True)
+
+def test_macd_kernel_block_matches_reference(sample_data):
+    close = sample_data["Close"].values
+    ema_fast, ema_slow, macd_line, signal_line, histogram = macd_kernel(close, 5, 13, 4)
+    expected_macd, expected_signal = reference_macd(close, 5, 13, 4)
+
+    np.testing.assert_allclose(ema_fast, reference_ema(close, 5), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(ema_slow, reference_ema(close, 13), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(macd_line, expected_macd, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(signal_line, expected_signal, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(histogram, expected_macd - expected_signal, rtol=1e-12, atol=1e-12, equal_nan=True)
+    # signal starts signal_period - 1 points after the first MACD value
+    assert np.isnan(signal_line[:12 + 3]).all() and not np.isnan(signal_line[12 + 3])
+
+    my_macd_df = apply_indicator(sample_data, "macd", {"fast_period": 5, "slow_period": 13, "signal_period": 4})
+    for col, expected in zip(("MACD", "MACD_signal"), (expected_macd, expected_signal)):
+        np.testing.assert_allclose(my_macd_df[col].values, expected, rtol=1e-12, equal_nan=True)
+
+def test_rsi_kernel_batch_matches_reference(sample_data):
+    intervals = [5, 14, 21]
+    block = rsi_kernel(sample_data["Close"].values, intervals)
+    for row, interval in zip(block, intervals):
+        expected = reference_rsi(sample_data["Close"], interval)
+        np.testing.assert_allclose(row, expected, rtol=1e-12, equal_nan=True)
+        my_rsi = apply_indicator(sample_data, "rsi", {"interval": interval})[f'RSI_{interval}']
+        np.testing.assert_allclose(my_rsi.values, expected, rtol=1e-12, equal_nan=True)
+
+def test_rsi_no_losses_is_100():
+    rising = np.arange(1.0, 31.0)
+    rsi = rsi_kernel(rising, 14)[0]
+    assert np.isnan(rsi[:14]).all()
+    assert (rsi[14:] == 100).all()
+    np.testing.assert_array_equal(rsi, reference_rsi(rising, 14))
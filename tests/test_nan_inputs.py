@@ -0,0 +1,98 @@
+import pandas as pd
+import numpy as np
+import pytest
+from indicators.ema import ema_kernel
+from indicators.macd import macd_kernel
+from indicators.registry import apply_indicator
+from indicators.streaming import StreamingEMA
+
+def reference_ema(data, interval, smoothing=2.0):
+    """The original iloc loop: pandas-mean seed at interval - 1, then the recursion."""
+    data = pd.Series(data, dtype=float).reset_index(drop=True)
+    weight = smoothing / (interval + 1)
+    rolling_ema = [np.nan] * (interval - 1) + [data.iloc[:interval].mean()]
+    for i in range(interval, data.size):
+        rolling_ema.append(data.iloc[i] * weight + rolling_ema[-1] * (1 - weight))
+    return np.array(rolling_ema)
+
+def reference_macd(data, fast, slow, signal):
+    macd_line = pd.Series(reference_ema(data, fast)) - pd.Series(reference_ema(data, slow))
+    first = macd_line.first_valid_index()
+    signal_line = np.concatenate([np.full(first, np.nan), reference_ema(macd_line[first:], signal)])
+    return macd_line.to_numpy(), signal_line
+
+@pytest.fixture
+def closes():
+    np.random.seed(5)
+    values = 100 + np.random.randn(80).cumsum()
+    values[:4] = np.nan
+    return values
+
+@pytest.mark.parametrize("interval", [3, 5, 10])
+def test_ema_keeps_the_original_seeding_with_leading_nans(closes, interval):
+    np.testing.assert_allclose(ema_kernel(closes, interval)[0], reference_ema(closes, interval), rtol=1e-12)
+    res = apply_indicator(pd.DataFrame({"Close": closes}), "ema", {"interval": interval}, use_cache=False)
+    np.testing.assert_allclose(res[f"EMA_{interval}"], reference_ema(closes, interval), rtol=1e-12)
+
+@pytest.mark.parametrize("interval", [2, 4])
+def test_ema_of_an_all_nan_seed_window_is_nan(closes, interval):
+    assert np.isnan(reference_ema(closes, interval)).all()
+    assert np.isnan(ema_kernel(closes, interval)[0]).all()
+
+def test_macd_keeps_the_original_seeding_with_leading_nans(closes):
+    block = macd_kernel(closes, 5, 12, 4)
+    macd_line, signal_line = reference_macd(closes, 5, 12, 4)
+    np.testing.assert_allclose(block[2], macd_line, rtol=1e-12)
+    np.testing.assert_allclose(block[3], signal_line, rtol=1e-12)
+
+def test_macd_sweep_matches_the_kernel_with_leading_nans(closes):
+    from indicators.sweep import sweep_indicator
+    params, signals = sweep_indicator(pd.DataFrame({"Close": closes}), "macd",
+                                      {"fast_period": [3, 5], "slow_period": [8, 12]}, output="MACD_signal")
+    for p, row in zip(params, signals):
+        expected = macd_kernel(closes, p["fast_period"], p["slow_period"], p["signal_period"])[3]
+        np.testing.assert_allclose(row, expected, rtol=1e-12)
+
+def test_streaming_ema_seeds_like_the_batch(closes):
+    stream = StreamingEMA(interval=10)
+    values = [stream.update(close)["EMA_10"] for close in closes]
+    np.testing.assert_allclose(values, ema_kernel(closes, 10)[0], rtol=1e-12)
+
+@pytest.fixture
+def gappy():
+    np.random.seed(6)
+    values = 100 + np.random.randn(60).cumsum()
+    values[[0, 7, 8, 20, 41]] = np.nan
+    return pd.DataFrame({"Date": pd.date_range("2024-01-01", periods=60), "Close": values})
+
+def reference_returns(close):
+    """The original pct_change() (forward-filling missing closes) in percent."""
+    return (pd.Series(close).ffill().pct_change(fill_method=None) * 100).replace([np.inf, -np.inf], np.nan).to_numpy()
+
+def test_daily_returns_forward_fill_gaps_like_pct_change(gappy):
+    from indicators.dailyr import daily_returns
+    expected = reference_returns(gappy["Close"])
+    np.testing.assert_allclose(daily_returns(gappy["Close"]), expected, rtol=1e-12)
+    assert daily_returns(gappy["Close"])[8] == 0.0
+
+def test_dailyr_streaks_use_the_filled_returns(gappy):
+    from indicators.updown import calculate_updown
+    df, streak_info, _ = apply_indicator(gappy, "dailyr", {"tolerance": 1, "threshold": 0.5}, use_cache=False)
+    np.testing.assert_allclose(df["DailyR"], reference_returns(gappy["Close"]), rtol=1e-12)
+    expected = calculate_updown(pd.Series(reference_returns(gappy["Close"]), index=gappy["Date"]), tolerance=1, threshold=0.5)
+    assert streak_info == expected
+
+def test_panel_and_streaming_returns_fill_gaps_too(gappy):
+    from indicators.panel import daily_returns_panel
+    from indicators.streaming import StreamingDailyR
+    expected = reference_returns(gappy["Close"])
+    panel = daily_returns_panel(np.column_stack([gappy["Close"], gappy["Close"]]))
+    np.testing.assert_allclose(panel[:, 1], expected, rtol=1e-12)
+    stream = StreamingDailyR(tolerance=1, threshold=0.5)
+    streamed = [stream.update(close, date)["DailyR"] for close, date in zip(gappy["Close"], gappy["Date"])]
+    np.testing.assert_allclose(streamed, expected, rtol=1e-12)
+    _, streak_info, _ = apply_indicator(gappy, "dailyr", {"tolerance": 1, "threshold": 0.5}, use_cache=False)
+    assert stream.streak_info == streak_info
+    # history ending on a missing close
+    seeded = StreamingDailyR.from_history(gappy["Close"].to_numpy()[:42], gappy["Date"][:42], tolerance=1, threshold=0.5)
+    np.testing.assert_allclose(seeded.update(gappy["Close"].iloc[42])["DailyR"], expected[42], rtol=1e-12)
@@ -0,0 +1,58 @@
+import pandas as pd
+import numpy as np
+import pytest
+from data.preprocess import close_matrix
+from indicators.panel import sma_panel
+from indicators.registry import apply_indicator, apply_panel
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(3)
+    dates = pd.date_range("2023-01-01", periods=70)
+    close = pd.DataFrame(
+        50 + np.random.randn(70, 4).cumsum(axis=0), index=dates, columns=["AAA", "BBB", "CCC", "DDD"]
+    )
+    # a ticker listed later than the others
+    close.iloc[:12, 2] = np.nan
+    return close
+
+CASES = [
+    ("sma", {"window": 5}),
+    ("ema", {"interval": 10}),
+    ("rsi", {"interval": 14}),
+    ("macd", {"fast_period": 5, "slow_period": 12, "signal_period": 4}),
+    ("dailyr", {"tolerance": 1, "threshold": 0.5}),
+    ("bollinger", {"window": 10, "num_std": 1.5}),
+    ("volatility", {"window": 10}),
+    ("zscore", {"window": 10}),
+    ("best_trade", {"window": 10}),
+]
+
+@pytest.mark.parametrize("key,params", CASES)
+def test_panel_matches_per_ticker(sample_data, key, params):
+    panels, extras = apply_panel(sample_data, key, params)
+    for ticker in sample_data.columns:
+        series = sample_data[ticker].dropna()
+        df = pd.DataFrame({"Date": series.index, "Close": series.to_numpy()})
+        res = apply_indicator(df, key, params, use_cache=False)
+        if key == "dailyr":
+            res, streak_info, max_profit = res
+            assert extras[ticker] == (streak_info, max_profit)
+        for col, panel in panels.items():
+            np.testing.assert_allclose(panel[ticker].dropna().to_numpy(), res[col].dropna().to_numpy(), rtol=1e-12)
+
+def test_axis_argument(sample_data):
+    values = sample_data.to_numpy()
+    np.testing.assert_array_equal(sma_panel(values.T, 5, axis=1), sma_panel(values, 5).T)
+
+def test_insufficient_rows(sample_data):
+    with pytest.raises(IndexError):
+        apply_panel(sample_data.head(10), "sma", {"window": 20})
+
+def test_close_matrix_aligns_dates():
+    a = pd.DataFrame({"Date": pd.date_range("2023-01-01", periods=5), "Close": np.arange(5.0)})
+    b = pd.DataFrame({"Date": pd.date_range("2023-01-03", periods=5), "Close": np.arange(5.0) + 10})
+    close = close_matrix([a, b], ["A", "B"])
+    assert list(close.columns) == ["A", "B"]
+    assert len(close) == 7
+    assert close.notna().all().all()
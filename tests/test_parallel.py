@@ -0,0 +1,97 @@
+import pandas as pd
+import numpy as np
+import multiprocessing
+import time
+import pytest
+import indicators.parallel as parallel
+from indicators.parallel import run_indicator_jobs
+from indicators.registry import apply_indicator
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(4)
+    frames = {}
+    for i, ticker in enumerate(["AAA", "BBB", "CCC"]):
+        frames[ticker] = pd.DataFrame({
+            "Date": pd.date_range("2023-01-01", periods=60 + i, tz="America/New_York"),
+            "Close": 50 + np.random.randn(60 + i).cumsum(),
+            "Volume": 1000,
+        })
+    return frames
+
+def make_jobs(frames):
+    jobs = []
+    for ticker, df in frames.items():
+        jobs += [(ticker, df, "sma", {"window": 5}), (ticker, df, "macd", None), (ticker, df, "dailyr", None)]
+    return jobs
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_results_match_apply_indicator_in_order(sample_data, max_workers):
+    jobs = make_jobs(sample_data)
+    results = run_indicator_jobs(jobs, max_workers=max_workers)
+    assert [(r["label"], r["key"]) for r in results] == [(label, key) for label, _, key, _ in jobs]
+    for (label, df, key, params), result in zip(jobs, results):
+        assert result["error"] is None
+        expected = apply_indicator(df, key, params, use_cache=False)
+        if key == "dailyr":
+            expected, streak_info, max_profit = expected
+            assert result["extras"] == (streak_info, max_profit)
+        pd.testing.assert_frame_equal(result["df"], expected)
+
+def test_invalid_params_reported_per_job(sample_data):
+    jobs = [("AAA", sample_data["AAA"], "sma", {"window": -1}), ("BBB", sample_data["BBB"], "rsi", None)]
+    results = run_indicator_jobs(jobs, max_workers=2)
+    assert results[0]["df"] is None and "ValueError" in results[0]["error"]
+    assert results[1]["error"] is None and "RSI_14" in results[1]["df"].columns
+
+def test_timeout_reported(sample_data):
+    big = pd.DataFrame({"Close": 100 + np.random.randn(2_000_000).cumsum()})
+    jobs = [("BIG", big, "macd", None), ("BIG2", big, "rsi", None)]
+    results = run_indicator_jobs(jobs, max_workers=2, timeout=0.001)
+    assert "TimeoutError" in results[0]["error"]
+
+def sleepy_apply(df, key, params=None, use_cache=True):
+    time.sleep(params["sleep"])
+    out = df.copy()
+    out["Slept"] = params["sleep"]
+    return out
+
+@pytest.fixture
+def sleepy(monkeypatch):
+    # forked workers inherit the patched module global
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("needs fork-started workers")
+    monkeypatch.setattr(parallel, "apply_indicator", sleepy_apply)
+
+def test_timeout_counts_from_job_start_not_queue(sample_data, sleepy):
+    df = sample_data["AAA"]
+    # 6 jobs of 0.4 s on 2 workers: the last ones finish ~1.2 s after submission, past the timeout
+    jobs = [(f"J{i}", df, "sleep", {"sleep": 0.4}) for i in range(6)]
+    results = run_indicator_jobs(jobs, max_workers=2, timeout=1.0)
+    assert [r["error"] for r in results] == [None] * 6
+
+def test_stuck_job_does_not_delay_the_others(sample_data, sleepy):
+    df = sample_data["AAA"]
+    jobs = [("STUCK", df, "sleep", {"sleep": 30})] + [(f"J{i}", df, "sleep", {"sleep": 0.1}) for i in range(4)]
+    start = time.perf_counter()
+    results = run_indicator_jobs(jobs, max_workers=2, timeout=0.5)
+    assert time.perf_counter() - start < 5
+    assert "TimeoutError" in results[0]["error"]
+    assert [r["error"] for r in results[1:]] == [None] * 4
+    assert all((r["df"]["Slept"] == 0.1).all() for r in results[1:])
+
+def test_jobs_that_cannot_start_are_reported(sample_data, sleepy):
+    df = sample_data["AAA"]
+    jobs = [("STUCK", df, "sleep", {"sleep": 30}), ("NEXT", df, "sleep", {"sleep": 0.1})]
+    start = time.perf_counter()
+    results = run_indicator_jobs(jobs[:1] * 2 + jobs[1:], max_workers=2, timeout=0.3)
+    assert time.perf_counter() - start < 5
+    assert all("TimeoutError" in r["error"] for r in results)
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_no_result_cache_on_either_path(sample_data, max_workers):
+    from indicators.registry import RESULT_CACHE
+    RESULT_CACHE.clear()
+    results = run_indicator_jobs(make_jobs(sample_data), max_workers=max_workers)
+    assert all(r["error"] is None for r in results)
+    assert len(RESULT_CACHE) == 0
@@ -0,0 +1,114 @@
+import time
+import pandas as pd
+import pytest
+import data.fetch as fetch
+import data.providers as providers
+from data.providers import DelayedProvider, FixtureProvider, MarketDataProvider, get_provider, set_provider
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """Fixture provider active, with the store under a temporary directory."""
+    monkeypatch.setattr(providers, "_active", None)
+    monkeypatch.setattr(fetch, "_store", None)
+    monkeypatch.setattr(fetch, "DEFAULT_ROOT", tmp_path)
+    return set_provider("fixture")
+
+def test_synthetic_history_is_deterministic():
+    a, b = FixtureProvider().history("aapl"), FixtureProvider().history("AAPL")
+    pd.testing.assert_frame_equal(a, b)
+    assert len(a) == 756 and a["Date"].is_monotonic_increasing
+    assert str(a["Date"].dt.tz) == "America/New_York"
+    assert (a["High"] >= a[["Open", "Close"]].max(axis=1)).all()
+    assert (a["Low"] <= a[["Open", "Close"]].min(axis=1)).all()
+    assert not a["Close"].equals(FixtureProvider().history("MSFT")["Close"])
+
+def test_history_from_start():
+    provider = FixtureProvider()
+    full = provider.history("AAPL")
+    start = full["Date"].iloc[-10]
+    pd.testing.assert_frame_equal(provider.history("AAPL", start=start), full.iloc[-10:].reset_index(drop=True))
+
+def test_csv_fixtures(tmp_path):
+    pd.DataFrame({"Date": ["2024-01-03", "2024-01-02"], "Close": [11.0, 10.0]}).to_csv(tmp_path / "XYZ.csv", index=False)
+    provider = FixtureProvider(tmp_path)
+    assert provider.history("xyz")["Close"].tolist() == [10.0, 11.0]
+    assert provider.quote("xyz") == (11.0, 10.0)
+    summary = provider.summary("xyz")
+    assert summary["symbol"] == "XYZ" and summary["change"] == 1.0 and summary["pct"] == 10.0
+
+def test_delayed_provider_adds_latency_and_forwards():
+    inner = FixtureProvider()
+    provider = DelayedProvider(inner, latency=0.05, jitter=0.05, seed=1)
+    assert provider.name == "fixture"
+    start = time.perf_counter()
+    assert provider.quote("AAPL") == inner.quote("AAPL")
+    assert 0.05 <= time.perf_counter() - start
+
+def test_delays_replay_with_the_seed(monkeypatch):
+    delays = []
+    monkeypatch.setattr(providers.time, "sleep", delays.append)
+    for _ in range(2):
+        provider = DelayedProvider(FixtureProvider(), latency=0.1, jitter=0.5, seed=7)
+        for _ in range(3):
+            provider.summary("AAPL")
+    assert delays[:3] == delays[3:]
+    assert all(0.1 <= delay <= 0.6 for delay in delays) and len(set(delays)) == 3
+
+def test_set_provider(monkeypatch):
+    monkeypatch.setattr(providers, "_active", None)
+    assert isinstance(set_provider("fixture"), FixtureProvider)
+    delayed = set_provider("fixture", latency=0.01)
+    assert isinstance(delayed, DelayedProvider) and get_provider() is delayed
+    with pytest.raises(ValueError, match="Unknown market-data provider"):
+        set_provider("bloomberg")
+
+def test_provider_from_environment(monkeypatch):
+    monkeypatch.setattr(providers, "_active", None)
+    monkeypatch.setenv("MARKET_DATA_PROVIDER", "fixture")
+    monkeypatch.setenv("MARKET_DATA_LATENCY", "0.2")
+    provider = get_provider()
+    assert isinstance(provider, DelayedProvider) and provider.latency == 0.2
+    assert isinstance(provider.provider, FixtureProvider)
+
+def test_fetch_paths_use_the_provider(offline, tmp_path):
+    df, label = fetch.get_stock_data("aapl")
+    assert label == "AAPL"
+    pd.testing.assert_frame_equal(df, offline.history("AAPL"))
+    assert (tmp_path / "fixture" / "AAPL.json").exists()
+    assert fetch.get_ticker_summary("aapl") == offline.summary("aapl")
+
+    results = fetch.get_many_stock_data(["aapl", "msft"])
+    assert all(result["error"] is None and result["summary_error"] is None for result in results.values())
+
+def test_store_follows_provider_switch(offline, tmp_path):
+    fetch.get_stock_data("aapl")
+    other = set_provider(FixtureProvider(end="2023-12-29"))
+    other.name = "fixture-2023"
+    df, _ = fetch.get_stock_data("aapl")
+    assert df["Date"].iloc[-1].date() == pd.Timestamp("2023-12-29").date()
+    assert (tmp_path / "fixture-2023" / "AAPL.json").exists()
+
+def test_base_provider_requires_history():
+    with pytest.raises(NotImplementedError):
+        MarketDataProvider().quote("AAPL")
+
+def test_first_use_from_many_threads_builds_one_provider_and_store(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    monkeypatch.setattr(providers, "_active", None)
+    monkeypatch.setattr(fetch, "_store", None)
+    monkeypatch.setattr(fetch, "DEFAULT_ROOT", tmp_path)
+    monkeypatch.setenv("MARKET_DATA_PROVIDER", "fixture")
+    built = []
+    monkeypatch.setitem(providers.PROVIDERS, "fixture", lambda: built.append(FixtureProvider()) or built[-1])
+    with ThreadPoolExecutor(16) as pool:
+        stores = list(pool.map(lambda _: fetch.default_store(), range(64)))
+    assert len(built) == 1
+    assert all(store is stores[0] for store in stores) and stores[0].fetch is built[0]
+
+def test_fixture_rejects_path_symbols(tmp_path):
+    (tmp_path / "SECRET.csv").write_text("Date,Close\n2024-01-02,1.0\n")
+    provider = FixtureProvider(tmp_path / "fixtures")
+    with pytest.raises(ValueError, match="Invalid ticker symbol"):
+        provider.history("../SECRET")
+    with pytest.raises(ValueError, match="Invalid ticker symbol"):
+        provider.summary("../SECRET")
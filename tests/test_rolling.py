@@ -0,0 +1,109 @@
+import pandas as pd
+import numpy as np
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+from indicators.registry import apply_indicator, apply_indicators
+from indicators.rolling import rolling_max, rolling_max_gain, rolling_min, rolling_moments
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(8)
+    data = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=120, tz="UTC"),
+        "Close": 100 + np.random.randn(120).cumsum(),
+    })
+    return data
+
+@pytest.mark.parametrize("window", [1, 2, 7, 30])
+def test_moments_match_pandas(sample_data, window):
+    close = sample_data["Close"]
+    mean, var = rolling_moments(close, window, ddof=1)
+    np.testing.assert_allclose(mean, close.rolling(window).mean(), rtol=1e-12)
+    np.testing.assert_allclose(var, close.rolling(window).var(), rtol=1e-9, atol=1e-12)
+
+def test_moments_stable_for_large_offset():
+    rng = np.random.default_rng(1)
+    values = 1e9 + rng.normal(0, 1e-3, 5_000)
+    _, var = rolling_moments(values, 50)
+    exact = sliding_window_view(values, 50).var(axis=1)
+    np.testing.assert_allclose(var[49:], exact, rtol=1e-2)
+
+def test_moments_long_series_reanchor():
+    rng = np.random.default_rng(2)
+    values = np.cumsum(rng.standard_normal(10_000))
+    mean, var = rolling_moments(values, 20)
+    windows = sliding_window_view(values, 20)
+    np.testing.assert_allclose(mean[19:], windows.mean(axis=1), rtol=1e-10, atol=1e-10)
+    np.testing.assert_allclose(var[19:], windows.var(axis=1), rtol=1e-8)
+
+def test_nan_only_masks_windows_containing_it(sample_data):
+    values = sample_data["Close"].to_numpy().copy()
+    values[50] = np.nan
+    mean, var = rolling_moments(values, 5)
+    series = pd.Series(values)
+    np.testing.assert_allclose(mean, series.rolling(5).mean(), rtol=1e-12)
+    assert np.isnan(var[50:55]).all() and not np.isnan(var[55:]).any()
+
+@pytest.mark.parametrize("window", [1, 3, 16, 120])
+def test_min_max_match_pandas(sample_data, window):
+    values = sample_data["Close"].to_numpy().copy()
+    values[40] = np.nan
+    series = pd.Series(values)
+    np.testing.assert_array_equal(rolling_max(values, window), series.rolling(window).max())
+    np.testing.assert_array_equal(rolling_min(values, window), series.rolling(window).min())
+
+@pytest.mark.parametrize("window", [1, 2, 7, 30])
+def test_max_gain_matches_window_scan(sample_data, window):
+    values = sample_data["Close"].to_numpy().copy()
+    values[60] = np.nan
+    expected = np.full(values.size, np.nan)
+    for end in range(window - 1, values.size):
+        prices = values[end - window + 1:end + 1]
+        expected[end] = np.max(prices / np.minimum.accumulate(prices))
+    np.testing.assert_array_equal(rolling_max_gain(values, window), expected)
+
+def test_best_trade_is_windowed_max_profit(sample_data):
+    from indicators.dailyr import calculate_max_profit
+    res = apply_indicator(sample_data, "best_trade", {"window": 30}, use_cache=False)
+    for end in (29, 64, 119):
+        trade = calculate_max_profit(sample_data["Close"].iloc[end - 29:end + 1])
+        assert res["BestTrade_30"].iloc[end] == pytest.approx(trade["profit_pct"], abs=1e-9)
+
+def test_kernels_operate_along_last_axis(sample_data):
+    values = sample_data["Close"].to_numpy()
+    rows = np.stack([values, values[::-1]])
+    np.testing.assert_array_equal(rolling_moments(rows, 10)[1][1], rolling_moments(values[::-1], 10)[1])
+    np.testing.assert_array_equal(rolling_max(rows, 10)[0], rolling_max(values, 10))
+
+def test_window_longer_than_data():
+    mean, var = rolling_moments(np.arange(3.0), 5)
+    assert np.isnan(mean).all() and np.isnan(var).all()
+    with pytest.raises(ValueError):
+        rolling_moments(np.arange(3.0), 0)
+
+def test_bollinger_matches_pandas(sample_data):
+    res = apply_indicator(sample_data, "bollinger", {"window": 20, "num_std": 2}, use_cache=False)
+    close = sample_data["Close"]
+    mid, std = close.rolling(20).mean(), close.rolling(20).std(ddof=0)
+    np.testing.assert_allclose(res["BB_mid_20"], mid, rtol=1e-12)
+    np.testing.assert_allclose(res["BB_upper_20"], mid + 2 * std, rtol=1e-10)
+    np.testing.assert_allclose(res["BB_lower_20"], mid - 2 * std, rtol=1e-10)
+
+def test_volatility_matches_pandas(sample_data):
+    res = apply_indicator(sample_data, "volatility", {"window": 10}, use_cache=False)
+    expected = (sample_data["Close"].pct_change() * 100).rolling(10).std() * np.sqrt(252)
+    np.testing.assert_allclose(res["VOL_10"], expected, rtol=1e-9)
+
+def test_zscore_on_band_edges(sample_data):
+    res, _ = apply_indicators(sample_data, [("bollinger", None), ("zscore", None)])
+    close, mid = res["Close"], res["BB_mid_20"]
+    half_width = (res["BB_upper_20"] - mid) / 2
+    np.testing.assert_allclose(res["ZSCORE_20"], (close - mid) / half_width, rtol=1e-9)
+
+def test_bollinger_and_zscore_share_moments(sample_data, monkeypatch):
+    import indicators.registry as registry
+    calls = []
+    original = registry.rolling_moments
+    monkeypatch.setattr(registry, "rolling_moments", lambda *a, **k: calls.append(a[1]) or original(*a, **k))
+    apply_indicators(sample_data, [("bollinger", {"window": 20}), ("zscore", {"window": 20}), ("zscore", {"window": 10})])
+    assert sorted(calls) == [10, 20]
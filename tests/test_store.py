@@ -0,0 +1,124 @@
+import pandas as pd
+import numpy as np
+import pytest
+from data.store import OHLCVStore
+
+def bars(start, periods, tz="America/New_York", base=100.0):
+    dates = pd.date_range(start, periods=periods, freq="B", tz=tz)
+    close = base + np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        "Date": dates, "Open": close - 0.5, "High": close + 1, "Low": close - 1,
+        "Close": close, "Volume": np.full(periods, 1_000, dtype=np.int64),
+    })
+
+class FakeProvider:
+    """Serves a fixed history, recording the `start` of every request."""
+
+    name = "fake"
+
+    def __init__(self, history):
+        self.history = history
+        self.calls = []
+
+    def __call__(self, symbol, start=None):
+        self.calls.append((symbol, start))
+        if start is None:
+            return self.history.copy()
+        return self.history[self.history["Date"] >= start].reset_index(drop=True)
+
+@pytest.fixture(params=["npz", "parquet"])
+def fmt(request):
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    return request.param
+
+def test_cold_start_fetches_and_persists(tmp_path, fmt):
+    provider = FakeProvider(bars("2024-01-01", 30))
+    df = OHLCVStore(tmp_path, fetch=provider, fmt=fmt).get("aapl")
+    assert provider.calls == [("aapl", None)]
+    pd.testing.assert_frame_equal(df, provider.history)
+
+    meta = OHLCVStore(tmp_path).metadata("AAPL")
+    assert meta["rows"] == 30 and meta["format"] == fmt and meta["source"] == "fake"
+    assert meta["last_date"] == provider.history["Date"].iloc[-1].isoformat()
+
+def test_restart_reads_from_disk(tmp_path, fmt):
+    provider = FakeProvider(bars("2024-01-01", 30))
+    OHLCVStore(tmp_path, fetch=provider, fmt=fmt).get("MSFT")
+
+    restarted = FakeProvider(bars("2024-01-01", 40))
+    df = OHLCVStore(tmp_path, fetch=restarted, max_age=3600).get("MSFT")
+    assert restarted.calls == []
+    assert len(df) == 30
+
+def test_refresh_requests_only_new_bars(tmp_path, fmt):
+    store = OHLCVStore(tmp_path, fetch=FakeProvider(bars("2024-01-01", 30)), fmt=fmt)
+    store.get("SPY")
+    stored_last = store.load("SPY")["Date"].iloc[-1]
+
+    # the provider has 10 more bars, and revised the last stored one
+    history = bars("2024-01-01", 40)
+    history.loc[29, "Close"] = 999.0
+    store.fetch = provider = FakeProvider(history)
+    df = store.get("SPY", max_age=0)
+
+    assert provider.calls == [("SPY", stored_last)]
+    pd.testing.assert_frame_equal(df, history)
+    assert store.metadata("SPY")["rows"] == 40
+
+def test_refresh_without_new_bars_keeps_file(tmp_path):
+    store = OHLCVStore(tmp_path, fetch=FakeProvider(bars("2024-01-01", 30)), fmt="npz")
+    store.get("QQQ")
+    before = store.metadata("QQQ")["updated_at"]
+    store.fetch = FakeProvider(bars("2024-01-01", 29))
+    df = store.get("QQQ", max_age=0)
+    assert len(df) == 30
+    assert store.metadata("QQQ")["updated_at"] >= before
+
+def test_failing_provider_falls_back_to_disk(tmp_path):
+    store = OHLCVStore(tmp_path, fetch=FakeProvider(bars("2024-01-01", 30)), fmt="npz")
+    store.get("IBM")
+
+    def offline(symbol, start=None):
+        raise ConnectionError("no network")
+
+    store.fetch = offline
+    assert len(store.get("IBM", max_age=0)) == 30
+    with pytest.raises(ConnectionError):
+        store.get("NEW", max_age=0)
+
+def test_naive_dates_round_trip(tmp_path):
+    history = bars("2024-01-01", 5, tz=None)
+    store = OHLCVStore(tmp_path, fmt="npz")
+    store.save("X", history)
+    pd.testing.assert_frame_equal(store.load("X"), history)
+    assert store.symbols() == ["X"]
+
+@pytest.mark.parametrize("symbol", ["../../x", "a/b", "..", "AAPL\\x", ""])
+def test_rejects_symbols_that_are_not_tickers(tmp_path, symbol):
+    provider = FakeProvider(bars("2024-01-01", 5))
+    store = OHLCVStore(tmp_path / "root", fetch=provider, fmt="npz")
+    with pytest.raises(ValueError, match="Invalid ticker symbol"):
+        store.get(symbol)
+    with pytest.raises(ValueError, match="Invalid ticker symbol"):
+        store.save(symbol, provider.history)
+    assert provider.calls == []
+    assert list(tmp_path.rglob("*")) == []
+
+@pytest.mark.parametrize("symbol", ["BRK-B", "^GSPC", "EURUSD=X", "rds.a"])
+def test_accepts_ticker_symbols(tmp_path, symbol):
+    store = OHLCVStore(tmp_path, fmt="npz")
+    store.save(symbol, bars("2024-01-01", 5))
+    assert store.load(symbol)["Close"].tolist() == bars("2024-01-01", 5)["Close"].tolist()
+
+def test_concurrent_saves_of_one_symbol(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    store = OHLCVStore(tmp_path, fmt="npz")
+    frames = [bars("2024-01-01", 20 + i, base=100.0 + i) for i in range(16)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda df: store.save("AAPL", df), frames))
+    # the last writer wins as a whole, no temp files are left behind
+    stored, meta = store.load("AAPL"), store.metadata("AAPL")
+    assert len(stored) == meta["rows"]
+    assert any(stored["Close"].tolist() == df["Close"].tolist() for df in frames)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["AAPL.json", "AAPL.npz"]
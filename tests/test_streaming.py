@@ -0,0 +1,96 @@
+import json
+import pandas as pd
+import numpy as np
+import pytest
+from indicators.dailyr import calculate_max_profit
+from indicators.registry import apply_indicator, create_stream
+from indicators.streaming import stream_from_dict
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(0)
+    data = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=80, tz="UTC"),
+        "Close": np.round(50 + np.random.randn(80).cumsum(), 2)
+    })
+    return data
+
+CASES = [
+    ("sma", {"window": 5}),
+    ("ema", {"interval": 10}),
+    ("rsi", {"interval": 14}),
+    ("macd", {"fast_period": 5, "slow_period": 12, "signal_period": 4}),
+    ("dailyr", {"tolerance": 1, "threshold": 0.5}),
+    ("best_trade", {"window": 10}),
+]
+
+@pytest.mark.parametrize("key,params", CASES)
+@pytest.mark.parametrize("seed_rows", [0, 3, 30, 79])
+def test_updates_match_batch(sample_data, key, params, seed_rows):
+    stream = create_stream(sample_data.head(seed_rows), key, params)
+    for _, row in sample_data.iloc[seed_rows:].iterrows():
+        # round-trip through JSON on every bar, as a cache would
+        stream = stream_from_dict(json.loads(json.dumps(stream.to_dict())))
+        latest = stream.update(row["Close"], row["Date"])
+
+    batch = apply_indicator(sample_data, key, params)
+    if key == "dailyr":
+        batch, streak_info, max_profit = batch
+        assert stream.streak_info == streak_info
+        assert stream.max_profit == max_profit
+    for column, value in latest.items():
+        assert value == batch[column].iloc[-1] or (np.isnan(value) and np.isnan(batch[column].iloc[-1]))
+
+@pytest.mark.parametrize("key,params", [
+    ("bollinger", {"window": 10, "num_std": 1.5}),
+    ("volatility", {"window": 10}),
+    ("zscore", {"window": 10}),
+])
+@pytest.mark.parametrize("seed_rows", [0, 3, 30, 79])
+def test_rolling_updates_match_batch(sample_data, key, params, seed_rows):
+    stream = create_stream(sample_data.head(seed_rows), key, params)
+    for _, row in sample_data.iloc[seed_rows:].iterrows():
+        stream = stream_from_dict(json.loads(json.dumps(stream.to_dict())))
+        latest = stream.update(row["Close"], row["Date"])
+
+    # sliding updates round differently from the batch cumulative sums
+    batch = apply_indicator(sample_data, key, params)
+    for column, value in latest.items():
+        np.testing.assert_allclose(value, batch[column].iloc[-1], rtol=1e-10)
+
+def test_warm_up_outputs_nan(sample_data):
+    stream = create_stream(sample_data.head(3), "sma", {"window": 5})
+    assert np.isnan(stream.update(50.0)["SMA_5"])
+    assert not np.isnan(stream.update(51.0)["SMA_5"])
+
+def test_best_trade_masks_nan_windows(sample_data):
+    closes = sample_data["Close"].to_numpy().copy()
+    closes[40] = np.nan
+    df = sample_data.assign(Close=closes)
+    stream = create_stream(df.head(35), "best_trade", {"window": 10})
+    outputs = [stream.update(close)["BestTrade_10"] for close in closes[35:]]
+    batch = apply_indicator(df, "best_trade", {"window": 10}, use_cache=False)["BestTrade_10"]
+    np.testing.assert_array_equal(outputs, batch.iloc[35:])
+
+def _nan_histories():
+    yield np.array([np.nan, 10, 12, 9, 15, 14])
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        closes = np.round(50 + rng.normal(0, 1, 30).cumsum(), 2)
+        closes[rng.random(30) < 0.2] = np.nan
+        closes[:rng.integers(0, 4)] = np.nan
+        yield closes
+
+@pytest.mark.parametrize("seed_rows", [0, 1, 3])
+def test_max_profit_skips_nan_closes(seed_rows):
+    for closes in _nan_histories():
+        df = pd.DataFrame({"Date": pd.date_range("2023-01-01", periods=len(closes), tz="UTC"), "Close": closes})
+        stream = create_stream(df.head(seed_rows), "dailyr")
+        for close, date in zip(closes[seed_rows:], df["Date"].iloc[seed_rows:]):
+            stream = stream_from_dict(json.loads(json.dumps(stream.to_dict())))
+            stream.update(close, date)
+
+        expected = calculate_max_profit(closes)
+        for field in ("buy_index", "sell_index", "price_diff"):
+            assert stream.max_profit[field] == expected[field]
+        assert stream.max_profit == apply_indicator(df, "dailyr", use_cache=False)[2]
@@ -0,0 +1,70 @@
+import pandas as pd
+import numpy as np
+import pytest
+from indicators.registry import apply_indicator
+from indicators.sweep import count_crossovers, expand_grid, sweep_indicator
+
+@pytest.fixture
+def sample_data():
+    np.random.seed(0)
+    data = pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=120),
+        "Close": np.random.rand(120) * 100
+    })
+    return data
+
+def test_expand_grid_skips_invalid_macd_pairs():
+    combos = expand_grid("macd", {"fast_period": [5, 12, 26], "slow_period": [12, 26]})
+    assert [(p["fast_period"], p["slow_period"]) for p in combos] == [(5, 12), (5, 26), (12, 26)]
+    assert all(p["signal_period"] == 9 for p in combos)
+
+@pytest.mark.parametrize("key,grid,column", [
+    ("sma", {"window": [5, 20, 50]}, lambda p: f"SMA_{p['window']}"),
+    ("ema", {"interval": [5, 20]}, lambda p: f"EMA_{p['interval']}"),
+    ("rsi", {"interval": [5, 14, 30]}, lambda p: f"RSI_{p['interval']}"),
+])
+def test_sweep_rows_match_single_calls(sample_data, key, grid, column):
+    params, matrix = sweep_indicator(sample_data, key, grid)
+    assert matrix.shape == (len(params), len(sample_data))
+    for p, row in zip(params, matrix):
+        expected = apply_indicator(sample_data, key, p)[column(p)]
+        np.testing.assert_allclose(row, expected.values, rtol=1e-12, equal_nan=True)
+
+@pytest.mark.parametrize("output", ["MACD", "MACD_signal", "MACD_hist"])
+def test_macd_sweep_matches_single_calls(sample_data, output):
+    grid = {"fast_period": [5, 12], "slow_period": [26, 30], "signal_period": [4, 9]}
+    params, matrix = sweep_indicator(sample_data, "macd", grid, output=output)
+    assert len(params) == 8
+    for p, row in zip(params, matrix):
+        expected = apply_indicator(sample_data, "macd", p)[output]
+        np.testing.assert_allclose(row, expected.values, rtol=1e-9, equal_nan=True)
+
+def test_summary_modes(sample_data):
+    params, matrix = sweep_indicator(sample_data, "rsi", {"interval": range(5, 31)})
+    _, last = sweep_indicator(sample_data, "rsi", {"interval": range(5, 31)}, summary="last", chunk_size=7)
+    _, crosses = sweep_indicator(sample_data, "rsi", {"interval": range(5, 31)}, summary="crossovers", chunk_size=7)
+    np.testing.assert_allclose(last, matrix[:, -1])
+    np.testing.assert_array_equal(crosses, count_crossovers(matrix, 50.0))
+
+def test_count_crossovers_ignores_nan_and_touches():
+    block = np.array([[np.nan, 1.0, 0.0, -1.0, -2.0, 3.0]])
+    assert count_crossovers(block, 0.0).tolist() == [2]
+
+def test_unsupported_key_raises(sample_data):
+    with pytest.raises(ValueError):
+        sweep_indicator(sample_data, "dailyr", {"tolerance": [0, 1]})
+
+def test_macd_summary_memory_is_bounded_by_the_chunk():
+    import tracemalloc
+    n = 5_000
+    df = pd.DataFrame({"Close": 100 + np.random.default_rng(3).standard_normal(n).cumsum()})
+    grid = {"fast_period": range(2, 42), "slow_period": range(50, 130)}
+    _, expected = sweep_indicator(df, "macd", grid, summary="last", chunk_size=4096)
+    tracemalloc.start()
+    _, last = sweep_indicator(df, "macd", grid, summary="last", chunk_size=8)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    np.testing.assert_array_equal(last, expected)
+    # caching all 120 distinct legs alone would take 120 rows; the chunk's block, its
+    # temporaries and the legs of two chunks stay well below
+    assert peak < 80 * n * 8
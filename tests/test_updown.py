@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import pytest
 from indicators.updown import calculate_updown
 
@@ -61,4 +62,36 @@ def test_all_zero_changes():
     s = make_df([0, 0, 0, 0])
     result = calculate_updown(s, tolerance=1, threshold=1)
     assert result["up_streak"] == 4
-    assert result["down_streak"] == 4
\ No newline at end of file
+    assert result["down_streak"] == 4
+
+# --- Parity with the original day-by-day state machine ---
+def reference_streak(values, direction, tolerance, threshold):
+    """Day-by-day version of the streak rules, used to check the vectorised engine."""
+    current = max_streak = 0
+    tol_left = tolerance
+    for v in values:
+        same_dir = v > 0 if direction == "up" else v < 0
+        opposite_dir = v < 0 if direction == "up" else v > 0
+        if same_dir:
+            current += 1
+            tol_left = tolerance
+        elif abs(v) < 1e-9:
+            current += 1
+        elif opposite_dir:
+            if abs(v) <= threshold and tolerance > 0 and tol_left > 0:
+                current += 1
+                tol_left -= 1
+            else:
+                max_streak = max(max_streak, current)
+                current = 0
+                tol_left = tolerance
+    return max(max_streak, current)
+
+@pytest.mark.parametrize("tolerance,threshold", [(0, 1), (1, 1), (2, 1), (1, 0.5)])
+def test_matches_reference_state_machine(tolerance, threshold):
+    rng = np.random.default_rng(tolerance * 10 + int(threshold * 10))
+    for _ in range(200):
+        changes = rng.choice([-2.5, -1, -0.5, -0.3, 0, 0.3, 0.5, 1, 2.5], size=rng.integers(1, 40))
+        result = calculate_updown(make_df(changes), tolerance=tolerance, threshold=threshold)
+        assert result["up_streak"] == reference_streak(changes, "up", tolerance, threshold)
+        assert result["down_streak"] == reference_streak(changes, "down", tolerance, threshold)